@@ -0,0 +1,59 @@
+'''
+Bulk Load Benchmark for Grade Calculator
+Compares per-call add_assignment, bulk add_assignments and the streaming CSV loader
+Usage: python benchmarks/bench_bulk_load.py [number of assignments]
+'''
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator
+from gradebook_loader import load_gradebook
+
+CATEGORIES = ('Homework', 'Quizzes', 'Labs', 'Tests')
+
+def make_rows(assignment_count: int) -> list:
+    '''Returns (category name, assignment name, score) rows spread over every category'''
+    return [(CATEGORIES[i % len(CATEGORIES)], f'Assignment #{i}', f'{i % 20}/20') for i in range(assignment_count)]
+
+def new_calculator() -> GradeCalculator:
+    calculator = GradeCalculator()
+    for category_name in CATEGORIES:
+        calculator.add_category(category_name, '25')
+    return calculator
+
+def per_call(rows: list, path: str) -> None:
+    calculator = new_calculator()
+    for row in rows:
+        calculator.add_assignment(*row)
+
+def bulk(rows: list, path: str) -> None:
+    new_calculator().add_assignments(rows)
+
+def streaming_csv(rows: list, path: str) -> None:
+    load_gradebook(path)
+
+def write_csv(rows: list, path: str) -> None:
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['category', 'percentage', 'assignment', 'score'])
+        for category_name in CATEGORIES:
+            writer.writerow([category_name, '25', '', ''])
+        writer.writerows([category_name, '', assignment_name, score] for category_name, assignment_name, score in rows)
+
+if __name__ == '__main__':
+    assignment_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rows = make_rows(assignment_count)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'gradebook.csv')
+        write_csv(rows, path)
+        print(f'assignments: {assignment_count}')
+        for name, load in (('add_assignment', per_call), ('add_assignments', bulk), ('load_gradebook csv', streaming_csv)):
+            start = time.perf_counter()
+            load(rows, path)
+            elapsed = time.perf_counter() - start
+            print(f'{name}: {elapsed:.3f}s ({assignment_count / elapsed:,.0f} rows/sec)')
@@ -0,0 +1,69 @@
+'''
+Scenario Benchmark for Grade Calculator
+Evaluates what-if scenarios for one large gradebook, each changing a couple of assignments,
+with copy-on-write forks against deep-copying the categories per scenario
+Usage: python benchmarks/bench_fork.py [assignments per category] [scenarios]
+'''
+
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator
+
+CATEGORIES = {'Homework': '20', 'Quizzes': '15', 'Labs': '15', 'Midterms': '25', 'Final': '25'}
+
+def make_calculator(assignment_count: int, seed: int = 0) -> GradeCalculator:
+    rng = random.Random(seed)
+    calculator = GradeCalculator()
+    for category_name, percentage in CATEGORIES.items():
+        calculator.add_category(category_name, percentage)
+        calculator.add_assignments([(category_name, f'{category_name} #{i}', (rng.randint(0, 20), 20)) for i in range(assignment_count)])
+    calculator.calculate_total_grade()
+    return calculator
+
+def make_scenarios(scenario_count: int, assignment_count: int, seed: int = 1) -> list:
+    '''Returns one list of (method name, arguments) changes per scenario: a new test score and a dropped homework'''
+    rng = random.Random(seed)
+    return [
+        [('add_assignment', ('Midterms', 'Midterm what-if', f'{rng.randint(50, 100)}/100')),
+         ('remove_assignment', ('Homework', f'Homework #{rng.randrange(assignment_count)}'))]
+        for _ in range(scenario_count)
+    ]
+
+def forked(base: GradeCalculator):
+    return base.fork()
+
+def deep_copied(base: GradeCalculator):
+    calculator = GradeCalculator()
+    calculator._categories = copy.deepcopy(base._categories)
+    calculator._total_percentage = base._total_percentage
+    return calculator
+
+def run(make_scenario, base: GradeCalculator, scenarios: list) -> list:
+    differences = []
+    for changes in scenarios:
+        scenario = make_scenario(base)
+        for method_name, args in changes:
+            getattr(scenario, method_name)(*args)
+        differences.append(scenario.calculate_total_grade() - base.calculate_total_grade())
+    return differences
+
+if __name__ == '__main__':
+    assignment_count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    scenario_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    base = make_calculator(assignment_count)
+    scenarios = make_scenarios(scenario_count, assignment_count)
+    print(f'categories: {len(CATEGORIES)}, assignments per category: {assignment_count}, scenarios: {scenario_count}')
+
+    results = {}
+    for name, make_scenario in (('fork (copy-on-write)', forked), ('deepcopy categories', deep_copied)):
+        start = time.perf_counter()
+        results[name] = run(make_scenario, base, scenarios)
+        elapsed = time.perf_counter() - start
+        print(f'{name:<22} {scenario_count / elapsed:>10,.0f} scenarios/sec')
+
+    assert all(abs(a - b) < 1e-12 for a, b in zip(*results.values())), 'Forked and deep-copied scenarios disagree'
@@ -0,0 +1,69 @@
+'''
+Instrumentation Benchmark for Grade Calculator
+Times the same workload on a plain calculator and on an instrumented one with each sink,
+the plain calculator is what every calculator runs while instrumentation is off
+Usage: python benchmarks/bench_instrumentation.py [categories] [assignments per category]
+'''
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator
+from instrumentation import instrument, MemorySink, JsonLinesSink
+
+def workload(calculator: GradeCalculator, category_count: int, assignment_count: int) -> int:
+    '''Adds every category and assignment, calculating the total grade after each assignment, and returns the number of operations'''
+    percentage = str(100 / category_count)
+    for c in range(category_count):
+        calculator.add_category(f'Category #{c}', percentage)
+    for i in range(assignment_count):
+        for c in range(category_count):
+            calculator.add_assignment(f'Category #{c}', f'Assignment #{i}', f'{i % 20}/20')
+            if i > 0:
+                calculator.calculate_total_grade()
+    str(calculator)
+    for c in range(category_count):
+        calculator.remove_category(f'Category #{c}')
+    return category_count * (2 + assignment_count * 2) + 1
+
+def best_of(runs: int, make_calculator, category_count: int, assignment_count: int) -> tuple:
+    best = None
+    for _ in range(runs):
+        calculator = make_calculator()
+        start = time.perf_counter()
+        operations = workload(calculator, category_count, assignment_count)
+        elapsed = time.perf_counter() - start
+        if hasattr(calculator, 'instrumentation'):
+            calculator.instrumentation.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return operations, best
+
+if __name__ == '__main__':
+    category_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    assignment_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'calls.jsonl')
+
+        def instrumented(*sinks):
+            def make_calculator():
+                calculator = GradeCalculator()
+                instrument(calculator, *[make_sink() for make_sink in sinks])
+                return calculator
+            return make_calculator
+
+        setups = {
+            'off (plain GradeCalculator)': GradeCalculator,
+            'on, no sinks': instrumented(),
+            'on, memory sink': instrumented(MemorySink),
+            'on, JSON lines sink': instrumented(lambda: JsonLinesSink(path)),
+        }
+        print(f'categories: {category_count}, assignments per category: {assignment_count}')
+        baseline = None
+        for name, make_calculator in setups.items():
+            operations, elapsed = best_of(3, make_calculator, category_count, assignment_count)
+            baseline = baseline or elapsed
+            print(f'{name:<28} {operations / elapsed:>12,.0f} ops/sec {elapsed / baseline:>6.2f}x')
@@ -0,0 +1,59 @@
+'''
+Memory Benchmark for Grade Calculator
+Compares the bytes used per assignment by the original dict-of-tuples layout and the Category array layout,
+for a batch of students who share the same assignment names
+Usage: python benchmarks/bench_memory.py [number of students] [assignments per student]
+'''
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator
+
+CATEGORIES = ('Homework', 'Quizzes', 'Labs', 'Tests')
+
+def assignment_names(assignment_count: int) -> list:
+    '''Returns (category name, assignment name) pairs, with names built per call as a parser would'''
+    return [(CATEGORIES[i % len(CATEGORIES)], f'{CATEGORIES[i % len(CATEGORIES)]} #{i}') for i in range(assignment_count)]
+
+def build_dict_of_tuples(student_count: int, assignment_count: int) -> list:
+    '''Builds the original (percentage, {assignment name: (earned, possible)}) layout for every student'''
+    roster = []
+    for student in range(student_count):
+        categories = {k: (25.0, {}) for k in CATEGORIES}
+        for i, (category_name, assignment_name) in enumerate(assignment_names(assignment_count)):
+            categories[category_name][GradeCalculator.ASSIGNMENTS][assignment_name] = (float((i + student) % 20), 20.0)
+        roster.append(categories)
+    return roster
+
+def build_calculators(student_count: int, assignment_count: int) -> list:
+    '''Builds a GradeCalculator holding the same assignments for every student'''
+    roster = []
+    for student in range(student_count):
+        calculator = GradeCalculator()
+        for category_name in CATEGORIES:
+            calculator.add_category(category_name, '25')
+        for i, (category_name, assignment_name) in enumerate(assignment_names(assignment_count)):
+            calculator.add_assignment(category_name, assignment_name, f'{(i + student) % 20}/20')
+        roster.append(calculator)
+    return roster
+
+def measure(build, student_count: int, assignment_count: int) -> float:
+    '''Returns the bytes still allocated per assignment once build has finished'''
+    tracemalloc.start()
+    result = build(student_count, assignment_count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / (student_count * assignment_count)
+
+if __name__ == '__main__':
+    student_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    assignment_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    before = measure(build_dict_of_tuples, student_count, assignment_count)
+    after = measure(build_calculators, student_count, assignment_count)
+    print(f'students: {student_count}, assignments per student: {assignment_count}')
+    print(f'dict of tuples: {before:.1f} bytes/assignment')
+    print(f'Category arrays: {after:.1f} bytes/assignment')
@@ -0,0 +1,95 @@
+'''
+Numeric Mode Benchmark for Grade Calculator
+Compares the throughput of the float, fixed and fraction numeric modes on the hot paths, relative to float
+Usage: python benchmarks/bench_numeric.py [number of assignments]
+Exits with status 1 if fixed point is more than 2x slower than float on any path.
+'''
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator, NUMERIC_MODES
+
+CATEGORIES = ('Homework', 'Quizzes', 'Labs', 'Tests')
+
+# Slowest fixed point may be relative to float
+FIXED_LIMIT = 2
+
+def make_rows(assignment_count: int) -> list:
+    '''Returns (category name, assignment name, score) rows spread over every category, with decimal scores'''
+    return [(CATEGORIES[i % len(CATEGORIES)], f'Assignment #{i}', f'{i % 20 + .5 * (i % 3)}/20') for i in range(assignment_count)]
+
+def new_calculator(numeric: str) -> GradeCalculator:
+    calculator = GradeCalculator(numeric=numeric)
+    for category_name in CATEGORIES:
+        calculator.add_category(category_name, '25')
+    return calculator
+
+def filled(numeric: str, rows: list) -> GradeCalculator:
+    calculator = new_calculator(numeric)
+    calculator.add_assignments(rows)
+    return calculator
+
+def per_call(numeric: str, rows: list) -> tuple:
+    calculator = new_calculator(numeric)
+    def run():
+        for row in rows:
+            calculator.add_assignment(*row)
+    return run, len(rows)
+
+def bulk(numeric: str, rows: list) -> tuple:
+    calculator = new_calculator(numeric)
+    return (lambda: calculator.add_assignments(rows)), len(rows)
+
+def update_and_grade(numeric: str, rows: list) -> tuple:
+    '''Changes one score at a time and recalculates the total after each change'''
+    calculator = filled(numeric, rows)
+    edited = rows[:10000]
+    def run():
+        for category_name, assignment_name, _ in edited:
+            calculator.update_assignment(category_name, assignment_name, '7.5/20')
+            calculator.calculate_total_grade()
+    return run, len(edited)
+
+# Each benchmark prepares a fresh calculator and returns (function to time, number of operations it performs)
+BENCHMARKS = {
+    'add_assignment': per_call,
+    'add_assignments': bulk,
+    'update + calculate_total_grade': update_and_grade,
+}
+
+def ops_per_second(rows: list, repeat: int = 5) -> dict:
+    '''
+    Returns the best throughput of each benchmark in each numeric mode over repeat fresh runs.
+    The modes take turns within each repeat, so a slow stretch of the machine does not land on one mode only.
+    '''
+    results = {numeric: dict.fromkeys(BENCHMARKS, 0) for numeric in NUMERIC_MODES}
+    for name, prepare in BENCHMARKS.items():
+        for _ in range(repeat):
+            for numeric in NUMERIC_MODES:
+                run, operations = prepare(numeric, rows)
+                start = time.perf_counter()
+                run()
+                results[numeric][name] = max(results[numeric][name], operations / (time.perf_counter() - start))
+    return results
+
+if __name__ == '__main__':
+    assignment_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = make_rows(assignment_count)
+    print(f'assignments: {assignment_count}')
+
+    results = ops_per_second(rows)
+    too_slow = []
+    for name in BENCHMARKS:
+        print(name)
+        for numeric in NUMERIC_MODES:
+            relative = results['float'][name] / results[numeric][name]
+            print(f'  {numeric:<9} {results[numeric][name]:>12,.0f} ops/sec  ({relative:.2f}x the time of float)')
+            if numeric == 'fixed' and relative > FIXED_LIMIT:
+                too_slow.append(name)
+
+    for name in too_slow:
+        print(f'FAIL: fixed point {name} is more than {FIXED_LIMIT}x slower than float', file=sys.stderr)
+    sys.exit(1 if too_slow else 0)
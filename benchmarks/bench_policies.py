@@ -0,0 +1,76 @@
+'''
+Aggregation Policy Benchmark for Grade Calculator
+Grades a roster of students under each aggregation policy, entering assignments one at a time and recalculating after each,
+and compares DropLowest's heap against re-sorting every assignment on each change
+Usage: python benchmarks/bench_policies.py [students] [assignments per category]
+'''
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator
+from grade_policies import AggregationPolicy, PointsBased, DropLowest, Capped
+
+CATEGORIES = ('Homework', 'Quizzes', 'Labs', 'Tests')
+
+class SortingDropLowest(DropLowest):
+    '''DropLowest that rebuilds its state, sorting every ratio, whenever an assignment is added'''
+    added = AggregationPolicy.added
+
+POLICIES = {
+    'mean (no policy)': lambda: None,
+    'points': PointsBased,
+    'drop lowest 3 (heap)': lambda: DropLowest(3),
+    'drop lowest 3 (re-sort)': lambda: SortingDropLowest(3),
+    'capped': Capped,
+    'capped drop lowest 3': lambda: Capped(1.0, DropLowest(3)),
+}
+
+def make_gradebooks(student_count: int, assignment_count: int, seed: int = 0) -> list:
+    '''Returns one list of (category name, assignment name, score) rows per student, in the order they are entered'''
+    rng = random.Random(seed)
+    return [
+        [(category_name, f'{category_name} #{i}', f'{rng.randint(0, 20)}/20') for i in range(assignment_count) for category_name in CATEGORIES]
+        for _ in range(student_count)
+    ]
+
+def grade_roster(make_policy, gradebooks: list) -> None:
+    '''Enters every assignment of every student one at a time, recalculating the total grade after each once no category is empty'''
+    for rows in gradebooks:
+        calculator = GradeCalculator()
+        for category_name in CATEGORIES:
+            calculator.add_category(category_name, '25', make_policy())
+        for row in rows[:len(CATEGORIES) - 1]:
+            calculator.add_assignment(*row)
+        for row in rows[len(CATEGORIES) - 1:]:
+            calculator.add_assignment(*row)
+            calculator.calculate_total_grade()
+
+def bulk_roster(make_policy, gradebooks: list) -> None:
+    '''Imports every student's assignments at once and calculates the total grade once'''
+    for rows in gradebooks:
+        calculator = GradeCalculator()
+        for category_name in CATEGORIES:
+            calculator.add_category(category_name, '25', make_policy())
+        calculator.add_assignments(rows)
+        calculator.calculate_total_grade()
+
+if __name__ == '__main__':
+    student_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    assignment_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    gradebooks = make_gradebooks(student_count, assignment_count)
+    rows = student_count * assignment_count * len(CATEGORIES)
+    print(f'students: {student_count}, assignments per category: {assignment_count}')
+    print(f'{"policy":<26} {"entered one at a time":>24} {"bulk import":>18}')
+
+    for name, make_policy in POLICIES.items():
+        start = time.perf_counter()
+        grade_roster(make_policy, gradebooks)
+        incremental = time.perf_counter() - start
+        start = time.perf_counter()
+        bulk_roster(make_policy, gradebooks)
+        bulk = time.perf_counter() - start
+        print(f'{name:<26} {rows / incremental:>16,.0f} rows/sec {rows / bulk:>10,.0f} rows/sec')
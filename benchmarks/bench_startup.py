@@ -0,0 +1,87 @@
+'''
+Startup Benchmark for Grade Calculator
+Measures the import time of each module with python -X importtime, and checks that the headless modules never import tkinter
+Usage: python benchmarks/bench_startup.py [--repeat N] [--budget MODULE=MS ...] [--gui]
+Exits with status 1 if a headless module imports tkinter or goes over its budget, so it can guard against regressions.
+'''
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must import without tkinter
+HEADLESS_MODULES = ('grade_calculator', 'ui', 'gradebook_loader', 'snapshot', 'journal', 'grade_cli', 'grade_server')
+
+# Modules that are expected to import tkinter
+TK_MODULES = ('ui_tk',)
+
+def import_times(module: str) -> dict:
+    '''
+    Imports module in a fresh interpreter and returns the cumulative import time of every module it imported, in microseconds.
+    Bytecode is written on the first run, so later runs measure the cached import as users see it.
+    '''
+    environment = dict(os.environ)
+    environment.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT, env=environment, capture_output=True, text=True, check=True)
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def startup_seconds(code: str) -> float:
+    '''Returns the wall time of a fresh interpreter running code'''
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+def bench_module(module: str, repeat: int) -> dict:
+    '''Returns the median import time of module in milliseconds, and whether importing it imported tkinter'''
+    import_times(module)
+    runs = [import_times(module) for _ in range(repeat)]
+    return {
+        'import_ms': statistics.median(k[module] for k in runs) / 1000,
+        'imports_tkinter': any('tkinter' in k or '_tkinter' in k for k in runs),
+    }
+
+def parse_budget(text: str) -> tuple:
+    module, _, milliseconds = text.partition('=')
+    return module, float(milliseconds)
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the import time of the grade calculator modules.')
+    parser.add_argument('--repeat', type=int, default=7, help='fresh interpreters per module, the median is reported (default: 7)')
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[], metavar='MODULE=MS', help='fail if MODULE takes longer than MS milliseconds to import')
+    parser.add_argument('--gui', action='store_true', help='also time creating the main window, which needs a display')
+    args = parser.parse_args(argv)
+
+    failures = []
+    print(f'{"module":<20} {"import ms":>10}  tkinter')
+    for module in HEADLESS_MODULES + TK_MODULES:
+        result = bench_module(module, args.repeat)
+        print(f'{module:<20} {result["import_ms"]:>10.2f}  {"yes" if result["imports_tkinter"] else "no"}')
+        if module in HEADLESS_MODULES and result['imports_tkinter']:
+            failures.append(f'{module} imports tkinter')
+
+        for budget_module, milliseconds in args.budget:
+            if budget_module == module and result['import_ms'] > milliseconds:
+                failures.append(f'{module} took {result["import_ms"]:.2f} ms to import, over its budget of {milliseconds} ms')
+
+    print(f'interpreter startup: {startup_seconds("pass") * 1000:.1f} ms, with ui: {startup_seconds("import ui") * 1000:.1f} ms')
+    if args.gui:
+        print(f'until the main window is drawn: {startup_seconds("import ui; app = ui.AppGUI(); app.update(); app.destroy()") * 1000:.1f} ms')
+
+    for failure in failures:
+        print(f'FAIL: {failure}', file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
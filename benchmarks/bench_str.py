@@ -0,0 +1,53 @@
+'''
+String Rendering Benchmark for Grade Calculator
+Times str() against the original += concatenation, and a single category line, at 1k and 10k assignments
+Usage: python benchmarks/bench_str.py [number of assignments ...]
+'''
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator
+
+CATEGORIES = ('Homework', 'Quizzes', 'Labs', 'Tests')
+
+def build_calculator(assignment_count: int) -> GradeCalculator:
+    calculator = GradeCalculator()
+    for category_name in CATEGORIES:
+        calculator.add_category(category_name, '25')
+    calculator.add_assignments((CATEGORIES[i % len(CATEGORIES)], f'Assignment #{i}', f'{i % 20}/20') for i in range(assignment_count))
+    return calculator
+
+def concatenated_str(calculator: GradeCalculator) -> str:
+    '''The original __str__, which builds the string with repeated += and slicing'''
+    return_str = ''
+    for k,v in calculator.categories.items():
+        if len(v[GradeCalculator.ASSIGNMENTS]) == 0:
+            return_str += f'{k}({v[GradeCalculator.PERCENTAGE_OF_GRADE]}%):\n'
+        elif len(v[GradeCalculator.ASSIGNMENTS]) == 1:
+            return_str += f'{k}({v[GradeCalculator.PERCENTAGE_OF_GRADE]}%): '
+            for k,v in v[GradeCalculator.ASSIGNMENTS].items():
+                return_str += f'{k}: {v[0]}/{v[1]}\n'
+        else:
+            return_str += f'{k}({v[GradeCalculator.PERCENTAGE_OF_GRADE]}%): '
+            for k,v in v[GradeCalculator.ASSIGNMENTS].items():
+                return_str += f'{k}: {v[0]}/{v[1]}, '
+            return_str = return_str[:-2]
+            return_str += '\n'
+    return return_str
+
+def best_of(function, repeat: int = 5) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+if __name__ == '__main__':
+    sizes = [int(k) for k in sys.argv[1:]] or [1000, 10000]
+    for assignment_count in sizes:
+        calculator = build_calculator(assignment_count)
+        assert concatenated_str(calculator) == str(calculator)
+        print(f'assignments: {assignment_count}')
+        print(f'  += concatenation: {best_of(lambda: concatenated_str(calculator)) * 1000:.3f} ms')
+        print(f'  str(): {best_of(lambda: str(calculator)) * 1000:.3f} ms')
+        print(f'  one category line: {best_of(lambda: calculator.category_str(CATEGORIES[0])) * 1000:.3f} ms')
+        print(f'  one assignment: {best_of(lambda: calculator.assignment_str(CATEGORIES[0], "Assignment #0")) * 1000:.3f} ms')
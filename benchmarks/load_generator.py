@@ -0,0 +1,96 @@
+'''
+Load Generator for the Grade Calculator Server
+Opens a pool of connections, pipelines add_assignment and calculate_total_grade requests, and reports latency and throughput
+Usage: python benchmarks/load_generator.py [--connect HOST:PORT] [--connections N] [--requests N] [--depth N] [--calculators N]
+Without --connect, a server is started in this process on a free port.
+'''
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_server import GradeServer
+
+async def run_connection(host: str, port: int, connection: int, requests: int, depth: int, calculators: int, latencies: list) -> None:
+    '''
+    Sends requests over one connection, keeping up to depth requests in flight, and records the latency of each response.
+    Every fifth request reads the total grade, the rest add assignments.
+    '''
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at = {}
+    in_flight = asyncio.Semaphore(depth)
+
+    async def read_responses():
+        for _ in range(requests):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent_at.pop(response['id']))
+            in_flight.release()
+
+    responses = asyncio.create_task(read_responses())
+    for i in range(requests):
+        await in_flight.acquire()
+        name = f'student{(connection + i) % calculators}'
+        if i % 5 == 4:
+            request = {'id': i, 'calculator': name, 'op': 'calculate_total_grade'}
+        else:
+            request = {'id': i, 'calculator': name, 'op': 'add_assignment', 'args': ['Homework', f'Homework {connection}.{i}', f'{i % 20}/20']}
+        sent_at[i] = time.perf_counter()
+        writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        if in_flight.locked():
+            await writer.drain()
+    await writer.drain()
+    await responses
+    writer.close()
+    await writer.wait_closed()
+
+async def setup_calculators(host: str, port: int, calculators: int) -> None:
+    '''Adds the Homework category to every calculator used by the load'''
+    reader, writer = await asyncio.open_connection(host, port)
+    for i in range(calculators):
+        writer.write(json.dumps({'id': i, 'calculator': f'student{i}', 'op': 'add_category', 'args': ['Homework', '100']}).encode('utf-8') + b'\n')
+    await writer.drain()
+    for _ in range(calculators):
+        await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def main(args) -> None:
+    server = None
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        port = int(port)
+    else:
+        server = GradeServer()
+        await server.start()
+        host, port = server.host, server.port
+
+    await setup_calculators(host, port, args.calculators)
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[run_connection(host, port, i, args.requests, args.depth, args.calculators, latencies) for i in range(args.connections)])
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+
+    latencies.sort()
+    print(f'connections: {args.connections}, requests: {len(latencies)}, pipeline depth: {args.depth}')
+    print(f'throughput: {len(latencies) / elapsed:,.0f} requests/sec')
+    print(f'latency p50: {percentile(latencies, .5) * 1000:.3f} ms, p99: {percentile(latencies, .99) * 1000:.3f} ms')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate load against the grade calculator server.')
+    parser.add_argument('--connect', help='HOST:PORT of a running server (default: start one in this process)')
+    parser.add_argument('--connections', type=int, default=16, help='number of pooled connections (default: 16)')
+    parser.add_argument('--requests', type=int, default=2000, help='requests per connection (default: 2000)')
+    parser.add_argument('--depth', type=int, default=32, help='requests in flight per connection (default: 32)')
+    parser.add_argument('--calculators', type=int, default=100, help='number of calculators to spread the load over (default: 100)')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,202 @@
+'''
+Benchmark Suite for Grade Calculator
+Times every public GradeCalculator operation on synthetic gradebooks, records peak memory, and writes the results as JSON
+Usage:
+    python benchmarks/run_benchmarks.py [--preset quick|full] [--output results.json] [--seed N]
+    python benchmarks/run_benchmarks.py --compare before.json after.json
+'''
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from grade_calculator import GradeCalculator
+
+# (categories, assignments) for single gradebook scenarios
+GRADEBOOK_SIZES = {
+    'quick': [(1, 10), (10, 1000), (100, 10000)],
+    'full': [(1, 10), (10, 1000), (100, 10000), (1000, 100000), (10000, 1000000)],
+}
+
+# (students, categories, assignments per student) for roster scenarios
+ROSTER_SIZES = {
+    'quick': [(1000, 4, 40)],
+    'full': [(1000, 4, 40), (10000, 4, 40), (100000, 4, 40)],
+}
+
+def synthetic_gradebook(category_count: int, assignment_count: int, rng: random.Random) -> tuple:
+    '''
+    Returns (categories, assignments) for a synthetic gradebook.
+    categories is a list of (category name, percentage string), adding up to 90% so float rounding never exceeds 100%.
+    assignments is a list of (category name, assignment name, score string), spread evenly over the categories.
+    '''
+    categories = [(f'Category {i}', repr(90 / category_count)) for i in range(category_count)]
+    assignments = []
+    for i in range(assignment_count):
+        category_name = categories[i % category_count][0]
+        possible = rng.choice((10, 20, 50, 100))
+        assignments.append((category_name, f'Assignment {i}', f'{rng.randint(0, possible)}/{possible}'))
+    return categories, assignments
+
+def timed(function, calls: int = 1) -> dict:
+    '''Runs function once and returns its timing, counting it as the given number of calls'''
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    return {'calls': calls, 'seconds': seconds, 'per_call_us': seconds / calls * 1e6 if calls else 0}
+
+def repeated(function, repeat: int) -> dict:
+    '''Runs function repeat times and returns the timing'''
+    def run():
+        for _ in range(repeat):
+            function()
+    return timed(run, repeat)
+
+def peak_memory_of(build) -> int:
+    '''Returns the peak bytes allocated while build runs, measured separately from the timings since tracing slows allocation'''
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak_memory
+
+def bench_gradebook(category_count: int, assignment_count: int, seed: int) -> dict:
+    '''Times each public operation on one synthetic gradebook'''
+    rng = random.Random(seed)
+    categories, assignments = synthetic_gradebook(category_count, assignment_count, rng)
+    results = {}
+
+    calculator = GradeCalculator()
+    results['add_category'] = timed(lambda: [calculator.add_category(*k) for k in categories], len(categories))
+    results['add_assignment'] = timed(lambda: [calculator.add_assignment(*k) for k in assignments], len(assignments))
+
+    def build():
+        memory_calculator = GradeCalculator()
+        for k in categories:
+            memory_calculator.add_category(*k)
+        memory_calculator.add_assignments(assignments)
+        return memory_calculator
+    peak_memory = peak_memory_of(build)
+
+    bulk_calculator = GradeCalculator()
+    for k in categories:
+        bulk_calculator.add_category(*k)
+    results['add_assignments'] = timed(lambda: bulk_calculator.add_assignments(assignments), len(assignments))
+
+    results['calculate_total_grade (cold)'] = timed(calculator.calculate_total_grade)
+    results['calculate_total_grade (cached)'] = repeated(calculator.calculate_total_grade, 1000)
+    results['category_grade'] = timed(lambda: [calculator.category_grade(k) for k, _ in categories], len(categories))
+    results['__str__'] = timed(lambda: str(calculator))
+
+    edited = assignments[:min(len(assignments), 1000)]
+    results['update_assignment'] = timed(lambda: [calculator.update_assignment(c, a, '1/2') for c, a, _ in edited], len(edited))
+    results['calculate_total_grade (after edit)'] = timed(lambda: [(calculator.update_assignment(c, a, '1/3'), calculator.calculate_total_grade()) for c, a, _ in edited], len(edited))
+    results['remove_assignment'] = timed(lambda: [calculator.remove_assignment(c, a) for c, a, _ in edited], len(edited))
+    results['remove_category'] = timed(lambda: [calculator.remove_category(k) for k, _ in categories], len(categories))
+
+    return {'scenario': 'gradebook', 'categories': category_count, 'assignments': assignment_count, 'peak_memory_bytes': peak_memory, 'operations': results}
+
+def bench_roster(student_count: int, category_count: int, assignment_count: int, seed: int) -> dict:
+    '''Times building and grading many GradeCalculator objects, and the NumPy RosterGrader when available'''
+    rng = random.Random(seed)
+    categories, _ = synthetic_gradebook(category_count, 0, rng)
+    gradebooks = [synthetic_gradebook(category_count, assignment_count, rng)[1] for _ in range(student_count)]
+    results = {}
+
+    def build():
+        calculators = {}
+        for student, assignments in enumerate(gradebooks):
+            calculator = GradeCalculator()
+            for k in categories:
+                calculator.add_category(*k)
+            calculator.add_assignments(assignments)
+            calculators[student] = calculator
+        return calculators
+    built = []
+    results['build calculators'] = timed(lambda: built.append(build()), student_count)
+    calculators = built[0]
+    peak_memory = peak_memory_of(build)
+
+    results['calculate_total_grade'] = timed(lambda: [k.calculate_total_grade() for k in calculators.values()], student_count)
+
+    try:
+        from roster import RosterGrader
+    except ImportError:
+        pass
+    else:
+        roster = []
+        results['RosterGrader.from_calculators'] = timed(lambda: roster.append(RosterGrader.from_calculators(calculators)), student_count)
+        results['RosterGrader.total_grades'] = timed(roster[0].total_grades, student_count)
+
+    return {'scenario': 'roster', 'students': student_count, 'categories': category_count, 'assignments': assignment_count, 'peak_memory_bytes': peak_memory, 'operations': results}
+
+def run(preset: str, seed: int) -> dict:
+    scenarios = []
+    for category_count, assignment_count in GRADEBOOK_SIZES[preset]:
+        print(f'gradebook: {category_count} categories, {assignment_count} assignments', file=sys.stderr)
+        scenarios.append(bench_gradebook(category_count, assignment_count, seed))
+    for student_count, category_count, assignment_count in ROSTER_SIZES[preset]:
+        print(f'roster: {student_count} students, {category_count} categories, {assignment_count} assignments each', file=sys.stderr)
+        scenarios.append(bench_roster(student_count, category_count, assignment_count, seed))
+    return {
+        'preset': preset,
+        'seed': seed,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scenarios': scenarios,
+    }
+
+def scenario_key(scenario: dict) -> tuple:
+    return (scenario['scenario'], scenario.get('students'), scenario['categories'], scenario['assignments'])
+
+def compare(before: dict, after: dict) -> None:
+    '''Prints the per-call time and peak memory of every scenario in both result files, with the after/before ratio'''
+    before_scenarios = {scenario_key(k): k for k in before['scenarios']}
+    for scenario in after['scenarios']:
+        key = scenario_key(scenario)
+        if key not in before_scenarios:
+            continue
+        old = before_scenarios[key]
+        print(f'{key[0]} {", ".join(f"{k}={v}" for k, v in scenario.items() if k in ("students", "categories", "assignments"))}')
+        print(f'  peak memory: {old["peak_memory_bytes"]:,} -> {scenario["peak_memory_bytes"]:,} bytes')
+        for operation, result in scenario['operations'].items():
+            if operation in old['operations']:
+                old_time = old['operations'][operation]['per_call_us']
+                new_time = result['per_call_us']
+                ratio = new_time / old_time if old_time else float('inf')
+                print(f'  {operation}: {old_time:.3f} -> {new_time:.3f} us/call ({ratio:.2f}x)')
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the GradeCalculator hot paths on synthetic gradebooks.')
+    parser.add_argument('--preset', choices=sorted(GRADEBOOK_SIZES), default='quick', help='scenario sizes to run (default: quick)')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the synthetic gradebooks (default: 0)')
+    parser.add_argument('--output', help='JSON file to write the results to (default: standard output)')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two result files instead of running')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as before, open(args.compare[1]) as after:
+            compare(json.load(before), json.load(after))
+        return 0
+
+    results = run(args.preset, args.seed)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
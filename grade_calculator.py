@@ -4,45 +4,436 @@ Author: Joshua Costa
 Created: 3/15/19
 '''
 
+import copy
+import math
+import sys
+from array import array
+from collections import namedtuple
+from fractions import Fraction
+from itertools import count, islice
+
+# An invalid row reported by GradeCalculator.add_assignments
+RowError = namedtuple('RowError', ['row_number', 'message'])
+
+# Hit and miss counters of the grade cache, as returned by GradeCalculator.cache_info
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'size'])
+
+# The result of GradeCalculator.required_scores
+RequiredScores = namedtuple('RequiredScores', ['ratio', 'scores', 'feasible'])
+
+# The result of GradeCalculator.diff: the change in total grade, and the (base grade, new grade) of each category that changed
+GradeDiff = namedtuple('GradeDiff', ['total', 'categories'])
+
+class Category:
+    '''
+    Compact storage for a single category of a GradeCalculator.
+    Scores are kept in parallel array('d') buffers, with each interned assignment name mapped to its index.
+    Removed assignments leave an unused slot behind, which is reclaimed once unused slots outnumber assignments.
+    The running sum of earned/possible ratios is updated as assignments are added, changed and removed.
+    An optional grade_policies.AggregationPolicy replaces the mean of the ratios as the way the grade is calculated.
+    '''
+
+    __slots__ = ('percentage', 'indices', 'earned', 'possible', 'ratio_sum', 'exact', 'policy')
+
+    def __init__(self, percentage: float):
+        self.percentage = percentage
+        self.policy = None
+        self.indices = {}
+        self.earned = array('d')
+        self.possible = array('d')
+        self.ratio_sum = 0
+
+        # True while the ratio sum has only been added to, so it is bit-for-bit equal to re-summing the assignments in order
+        self.exact = True
+
+    def __len__(self):
+        return len(self.indices)
+
+    def add(self, assignment_name: str, earned_score: float, possible_score: float) -> None:
+        '''Appends an assignment to the category and updates the running ratio sum'''
+        self.indices[sys.intern(assignment_name)] = len(self.earned)
+        self.earned.append(earned_score)
+        self.possible.append(possible_score)
+        self.ratio_sum += earned_score/possible_score
+
+    def extend(self, assignment_names: list, earned_scores: list, possible_scores: list) -> None:
+        '''Appends many assignments to the category in order, updating the running ratio sum exactly as repeated add calls would'''
+        # Build the new indices first, so a bad name raises before the category changes
+        start = len(self.earned)
+        indices = dict(zip(map(sys.intern, assignment_names), range(start, start + len(assignment_names))))
+        self.indices.update(indices)
+        self.earned.extend(earned_scores)
+        self.possible.extend(possible_scores)
+        ratio_sum = self.ratio_sum
+        for earned_score, possible_score in zip(earned_scores, possible_scores):
+            ratio_sum += earned_score/possible_score
+        self.ratio_sum = ratio_sum
+
+    def update(self, assignment_name: str, earned_score: float, possible_score: float) -> None:
+        '''Replaces the scores of an assignment in place and updates the running ratio sum'''
+        i = self.indices[assignment_name]
+        self.ratio_sum += earned_score/possible_score - self.earned[i]/self.possible[i]
+        self.earned[i] = earned_score
+        self.possible[i] = possible_score
+        self.exact = False
+
+    def remove(self, assignment_name: str) -> None:
+        '''Removes an assignment and updates the running ratio sum'''
+        i = self.indices.pop(assignment_name)
+        self.ratio_sum -= self.earned[i]/self.possible[i]
+        self.exact = False
+        self._reclaim()
+
+    def _reclaim(self) -> None:
+        '''Resets the category once it is empty, or compacts the score buffers once unused slots outnumber assignments'''
+        if len(self.indices) == 0:
+            self.earned = array('d')
+            self.possible = array('d')
+            self.ratio_sum = 0
+            self.exact = True
+        elif len(self.earned) > 2 * len(self.indices):
+            self.earned, self.possible = self.scores()
+            self.indices = dict(zip(self.indices, range(len(self.indices))))
+
+    def scores(self) -> tuple:
+        '''Returns the (earned, possible) score arrays without unused slots, in insertion order'''
+        if len(self.earned) == len(self.indices):
+            return self.earned, self.possible
+        earned, possible = self.earned, self.possible
+        return array('d', [earned[i] for i in self.indices.values()]), array('d', [possible[i] for i in self.indices.values()])
+
+    def assignments(self) -> dict:
+        '''Returns the assignments of the category as a dict of assignment names to (earned, possible) tuples'''
+        earned, possible = self.earned, self.possible
+        return {k: (earned[i], possible[i]) for k, i in self.indices.items()}
+
+    def items(self):
+        '''Yields (assignment name, earned score, possible score) for every assignment, in insertion order'''
+        earned, possible = self.earned, self.possible
+        for k, i in self.indices.items():
+            yield k, earned[i], possible[i]
+
+    def clone(self) -> 'Category':
+        '''Returns a copy of the category with its own score buffers, assignment names and policy state'''
+        category = copy.copy(self)
+        category.indices = dict(self.indices)
+        category.earned = array('d', self.earned)
+        category.possible = array('d', self.possible)
+        if self.policy is not None:
+            category.policy = copy.deepcopy(self.policy)
+        return category
+
+    @property
+    def weight(self) -> float:
+        '''The percentage of the category in the number type its grades are calculated in'''
+        return self.percentage
+
+    @staticmethod
+    def weight_of(percentage: float) -> float:
+        '''Converts a percentage to the number type grades are calculated in'''
+        return percentage
+
+    @staticmethod
+    def weight_value(weight: float) -> float:
+        '''Converts a weight back to a percentage'''
+        return weight
+
+    @staticmethod
+    def score_of(score: float) -> float:
+        '''Converts a score to the number type that policies add up scores in'''
+        return score
+
+    @staticmethod
+    def ratio(earned_score: float, possible_score: float) -> float:
+        '''The earned/possible ratio of one assignment, as added to the running ratio sum'''
+        return earned_score/possible_score
+
+    @staticmethod
+    def ratio_of_totals(earned_total: float, possible_total: float) -> float:
+        '''The ratio of two totals of scores converted with score_of, in the number type of ratio'''
+        return earned_total/possible_total
+
+    def ratio_total(self) -> float:
+        '''Returns the running ratio sum as a plain number'''
+        return self.ratio_sum
+
+    def totals(self) -> tuple:
+        '''Returns the (ratio sum, assignment count) the grade is calculated from, as given by the policy if there is one'''
+        if self.policy is None:
+            return self.ratio_sum, len(self)
+        return self.policy.totals(self)
+
+    def grade(self) -> float:
+        '''Returns the grade of the category as a share of its percentage, in the number type grades are calculated in'''
+        ratio_sum, assignment_count = self.totals()
+        return (ratio_sum / assignment_count) * self.percentage
+
+    @staticmethod
+    def grade_value(grade: float) -> float:
+        '''Converts a grade returned by grade to the number returned by GradeCalculator.category_grade'''
+        return grade
+
+    @staticmethod
+    def total_grade(total_grade_points: float, total_weight: float) -> float:
+        '''Returns the total grade given the sum of the category grades and the sum of the category weights'''
+        return total_grade_points/total_weight
+
+
+class ExactCategory(Category):
+    '''
+    A category whose ratios are exact numbers, so its running ratio sum is exact however assignments are added, changed or removed.
+    Subclasses define ratio and the conversions between percentages, weights and grades.
+    '''
+
+    __slots__ = ('weight',)
+
+    def __init__(self, percentage: float):
+        super().__init__(percentage)
+        self.weight = self.weight_of(percentage)
+
+    # Converting a score can raise, so every ratio is calculated before the category changes
+
+    def add(self, assignment_name: str, earned_score: float, possible_score: float) -> None:
+        ratio = self.ratio(earned_score, possible_score)
+        self.indices[sys.intern(assignment_name)] = len(self.earned)
+        self.earned.append(earned_score)
+        self.possible.append(possible_score)
+        self.ratio_sum += ratio
+
+    def extend(self, assignment_names: list, earned_scores: list, possible_scores: list) -> None:
+        ratio_sum = sum(map(self.ratio, earned_scores, possible_scores))
+        start = len(self.earned)
+        indices = dict(zip(map(sys.intern, assignment_names), range(start, start + len(assignment_names))))
+        self.indices.update(indices)
+        self.earned.extend(earned_scores)
+        self.possible.extend(possible_scores)
+        self.ratio_sum += ratio_sum
+
+    def update(self, assignment_name: str, earned_score: float, possible_score: float) -> None:
+        i = self.indices[assignment_name]
+        self.ratio_sum += self.ratio(earned_score, possible_score) - self.ratio(self.earned[i], self.possible[i])
+        self.earned[i] = earned_score
+        self.possible[i] = possible_score
+
+    def remove(self, assignment_name: str) -> None:
+        i = self.indices.pop(assignment_name)
+        self.ratio_sum -= self.ratio(self.earned[i], self.possible[i])
+        self._reclaim()
+
+    def grade(self):
+        ratio_sum, assignment_count = self.totals()
+        return ratio_sum * self.weight / assignment_count
+
+
+def exact_number(number: float) -> Fraction:
+    '''Converts a float to the Fraction of its shortest decimal form, so a score entered as 0.1 is exactly 1/10'''
+    if number.is_integer():
+        return Fraction(int(number))
+    return Fraction(repr(number))
+
+
+class FractionCategory(ExactCategory):
+    '''A category calculated with fractions.Fraction, so every grade is exact'''
+
+    __slots__ = ()
+
+    weight_of = staticmethod(exact_number)
+    score_of = staticmethod(exact_number)
+
+    @staticmethod
+    def ratio(earned_score: float, possible_score: float) -> Fraction:
+        return exact_number(earned_score) / exact_number(possible_score)
+
+
+class FixedCategory(ExactCategory):
+    '''
+    A category calculated in scaled integers: each ratio is rounded to RATIO_SCALE and each percentage to WEIGHT_SCALE.
+    The sums are exact integers, so grades do not depend on the order of changes, and only the total grade is rounded to a float.
+    '''
+
+    __slots__ = ()
+
+    RATIO_SCALE = 10**9
+    WEIGHT_SCALE = 10**6
+
+    @staticmethod
+    def weight_of(percentage: float) -> int:
+        return round(percentage * FixedCategory.WEIGHT_SCALE)
+
+    @staticmethod
+    def weight_value(weight: int) -> float:
+        return weight / FixedCategory.WEIGHT_SCALE
+
+    # Scores are totalled exactly, since a score can be far smaller than one unit of any fixed scale
+    score_of = staticmethod(exact_number)
+
+    @staticmethod
+    def ratio(earned_score: float, possible_score: float) -> int:
+        return round(earned_score * FixedCategory.RATIO_SCALE / possible_score)
+
+    # add, extend, update and grade inline ratio and totals, since these are the paths where fixed point has to keep up with float
+
+    def add(self, assignment_name: str, earned_score: float, possible_score: float) -> None:
+        ratio = round(earned_score * self.RATIO_SCALE / possible_score)
+        self.indices[sys.intern(assignment_name)] = len(self.earned)
+        self.earned.append(earned_score)
+        self.possible.append(possible_score)
+        self.ratio_sum += ratio
+
+    def extend(self, assignment_names: list, earned_scores: list, possible_scores: list) -> None:
+        scale = self.RATIO_SCALE
+        ratio_sum = sum([round(earned_score * scale / possible_score) for earned_score, possible_score in zip(earned_scores, possible_scores)])
+
+        start = len(self.earned)
+        indices = dict(zip(map(sys.intern, assignment_names), range(start, start + len(assignment_names))))
+        self.indices.update(indices)
+        self.earned.extend(earned_scores)
+        self.possible.extend(possible_scores)
+        self.ratio_sum += ratio_sum
+
+    def update(self, assignment_name: str, earned_score: float, possible_score: float) -> None:
+        i = self.indices[assignment_name]
+        scale = self.RATIO_SCALE
+        self.ratio_sum += round(earned_score * scale / possible_score) - round(self.earned[i] * scale / self.possible[i])
+        self.earned[i] = earned_score
+        self.possible[i] = possible_score
+
+    @staticmethod
+    def ratio_of_totals(earned_total: Fraction, possible_total: Fraction) -> int:
+        return (2 * earned_total * FixedCategory.RATIO_SCALE + possible_total) // (2 * possible_total)
+
+    def ratio_total(self) -> float:
+        return self.ratio_sum / self.RATIO_SCALE
+
+    def grade(self) -> int:
+        # Rounded to the nearest unit of 1 / (RATIO_SCALE * WEIGHT_SCALE) percent
+        if self.policy is None:
+            ratio_sum, assignment_count = self.ratio_sum, len(self.indices)
+        else:
+            ratio_sum, assignment_count = self.policy.totals(self)
+        return (2 * ratio_sum * self.weight + assignment_count) // (2 * assignment_count)
+
+    @staticmethod
+    def grade_value(grade: int) -> float:
+        return grade / (FixedCategory.RATIO_SCALE * FixedCategory.WEIGHT_SCALE)
+
+    @staticmethod
+    def total_grade(total_grade_points: int, total_weight: int) -> float:
+        return total_grade_points / (total_weight * FixedCategory.RATIO_SCALE)
+
+
+# Largest score and earned/possible ratio accepted, so every numeric mode can convert them without overflowing
+MAX_SCORE = sys.float_info.max / FixedCategory.RATIO_SCALE
+MAX_RATIO = sys.float_info.max / FixedCategory.RATIO_SCALE
+
+# Category types for each numeric mode of GradeCalculator
+NUMERIC_MODES = {
+    'float': Category,
+    'fraction': FractionCategory,
+    'fixed': FixedCategory,
+}
+
+
 class GradeCalculator:
 
     # Constants for accessing 
     PERCENTAGE_OF_GRADE = 0
     ASSIGNMENTS = 1
 
-    def __init__(self):
+    def __init__(self, check_consistency: bool = False, journal=None, numeric: str = 'float'):
+        '''
+        numeric selects how grades are calculated:
+            'float'     floats, the fastest
+            'fraction'  exact fractions.Fraction, so calculate_total_grade and category_grade return a Fraction
+            'fixed'     scaled integers, deterministic and exact to 9 decimal places of each ratio, returning floats
+        Scores are stored as floats in every mode, and each is converted from its shortest decimal form.
+        journal is an optional journal.Journal, opened with recover, that every successful mutation is logged to.
+        If numeric is not one of these modes, or journal has not been opened, raises ValueError.
+        '''
+        if numeric not in NUMERIC_MODES:
+            raise ValueError(f'GradeCalculator: Numeric mode {numeric} must be one of {", ".join(NUMERIC_MODES)}')
+        self.numeric = numeric
+        self._category_type = NUMERIC_MODES[numeric]
+
+        # Initialize the categories dict, mapping category names to Category objects
+        self._categories = {}
+
+        # Names of the categories whose Category objects are shared with a fork, each is cloned before it is first changed
+        self._shared = set()
+
+        # Running total of the category weights (the percentages, in the numeric mode), so it never has to be re-summed
+        self._total_percentage = 0
+        self._max_percentage = self._category_type.weight_of(100.0)
+
+        # Cached category grades and total grade, invalidated only for the categories a mutation touches
+        self._grade_cache = {}
+        self._total_grade_cache = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # When True, every mutation and calculation compares the running totals against a full recompute
+        self.check_consistency = check_consistency
+
+        # Optional journal.Journal that every successful mutation is logged to, set by Journal.attach
+        self.journal = None
+        if journal is not None:
+            journal.attach(self)
+
+    @property
+    def categories(self) -> dict:
+        '''
+        Read-only view of the categories, as a dict of category names to
+        (percentage of grade, {assignment name: (earned score, possible score)}) tuples.
+        '''
+        return {k: (v.percentage, v.assignments()) for k, v in self._categories.items()}
 
-        # Initialize the categories dict
-        self.categories = {}
+    def category_policy(self, category_name: str):
+        '''
+        Returns the aggregation policy of a category, or None if its grade is the mean of its ratios.
+        If given an invalid category_name, raises KeyError.
+        '''
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.category_policy: Category "{category_name}" not a valid category.')
+        return self._categories[category_name].policy
 
     def __str__(self):
 
-        # Create base string
-        return_str = ''
-        
-        # Loop through all categories
-        for k,v in self.categories.items():
+        # Join one line per category, so the string is built in linear time
+        return ''.join([self.category_str(k) for k in self._categories])
 
-            if len(v[GradeCalculator.ASSIGNMENTS]) == 0:
-                return_str += f'{k}({v[GradeCalculator.PERCENTAGE_OF_GRADE]}%):\n'
+    def category_str(self, category_name: str) -> str:
+        '''
+        Returns the line of str(self) for a single category, including the trailing newline.
+        If given an invalid category_name, raises KeyError.
+        '''
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.category_str: Category "{category_name}" not a valid category.')
+        category = self._categories[category_name]
 
-            elif len(v[GradeCalculator.ASSIGNMENTS]) == 1:
-                return_str += f'{k}({v[GradeCalculator.PERCENTAGE_OF_GRADE]}%): '
-                for k,v in v[GradeCalculator.ASSIGNMENTS].items():
-                    return_str += f'{k}: {v[0]}/{v[1]}\n'
+        if len(category) == 0:
+            return f'{category_name}({category.percentage}%):\n'
 
-            else:
-                return_str += f'{k}({v[GradeCalculator.PERCENTAGE_OF_GRADE]}%): '
-                for k,v in v[GradeCalculator.ASSIGNMENTS].items():
-                    return_str += f'{k}: {v[0]}/{v[1]}, '
-                return_str = return_str[:-2]
-                return_str += '\n'
+        assignments = ', '.join([f'{name}: {earned}/{possible}' for name, earned, possible in category.items()])
+        return f'{category_name}({category.percentage}%): {assignments}\n'
 
-        return return_str
+    def assignment_str(self, category_name: str, assignment_name: str) -> str:
+        '''
+        Returns how a single assignment is shown in str(self), as "assignment name: earned/possible".
+        If given an invalid category_name or assignment_name, raises KeyError.
+        '''
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.assignment_str: Category "{category_name}" not a valid category.')
+        category = self._categories[category_name]
+        if assignment_name not in category.indices:
+            raise KeyError(f'GradeCalculator.assignment_str: Assignment {assignment_name} not a valid assignment.')
+
+        i = category.indices[assignment_name]
+        return f'{assignment_name}: {category.earned[i]}/{category.possible[i]}'
 
-    def add_category(self, category_name: str, percentage_of_grade: str) -> None:
+    def add_category(self, category_name: str, percentage_of_grade: str, policy=None) -> None:
         ''' 
         Adds a new category to self.categories, with a percentage of the overall grade and name.
+        policy is an optional grade_policies.AggregationPolicy, by default the grade is the mean of the earned/possible ratios.
         If adding the category changes the total possible grade to be over 100, raises ValueError.
         If the category name already exists, raises KeyError.
         If category name is of length 0, raises AssertionError.
@@ -60,23 +451,47 @@ class GradeCalculator:
 
         assert percentage_of_grade > 0, f'GradeCalculator.add_category: Category percentage must be greater than 0'
 
-        if category_name in self.categories:
+        if category_name in self._categories:
             raise KeyError(f'GradeCalculator.add_category: Category {category_name} has already been added')
-        self.categories[category_name] = (percentage_of_grade, {})
 
-        if not self._is_possible_grade_less_than_or_equal_100():
-            total_percentage_too_long = self._calculate_total_possible_grade()
-            del self.categories[category_name]
-            raise ValueError(f'GradeCalculator.add_category: Percentage {percentage_of_grade}% of category {category_name} would make the total possible percentage {total_percentage_too_long}%, which exceeds the possible 100%')
+        category = self._category_type(percentage_of_grade)
+        total_percentage = self._total_percentage + category.weight
+        if total_percentage > self._max_percentage:
+            raise ValueError(f'GradeCalculator.add_category: Percentage {percentage_of_grade}% of category {category_name} would make the total possible percentage {float(category.weight_value(total_percentage))}%, which exceeds the possible 100%')
+
+        if policy is not None:
+            category.policy = policy.bound(category)
+
+        self._categories[sys.intern(category_name)] = category
+        self._total_percentage = total_percentage
+        self._invalidate()
+
+        if self.journal is not None:
+            self.journal.log('add_category', category_name, percentage_of_grade, *([policy.spec()] if policy is not None else []))
+
+        if self.check_consistency:
+            self._check_running_totals()
 
     def remove_category(self, category_name: str) -> None:
         '''
         Removes a category from self.categories, given a category name.
         If given an invalid category_name, raises KeyError
         '''
-        if category_name not in self.categories:
+        if category_name not in self._categories:
             raise KeyError(f"GradeCalculator.remove_category: Category '{category_name}' is not a valid key")
-        del self.categories[category_name]
+        del self._categories[category_name]
+        self._shared.discard(category_name)
+        self._invalidate(category_name)
+
+        # Re-sum the remaining weights (one per category) instead of subtracting, so the
+        # total stays bit-for-bit equal to summing the categories from scratch
+        self._total_percentage = sum([v.weight for v in self._categories.values()])
+
+        if self.journal is not None:
+            self.journal.log('remove_category', category_name)
+
+        if self.check_consistency:
+            self._check_running_totals()
 
 
     def add_assignment(self, category_name: str, assignment_name: str, score: str) -> None:
@@ -84,50 +499,407 @@ class GradeCalculator:
         Adds a new assignment to a specified category, with a score and possible score.
         If category name, assignment name, or score are empty strings, raise AssertionError.
         If '/' not in the score string or the string cannot be converted to two floats, raise AssertionError.
+        If the possible score is 0, or either score is not a finite number, raise AssertionError.
         If an unvalid category name is not provided, raises KeyError.
         If specified assignment name exists in specified category, raises KeyError.
         '''
 
         assert len(category_name) > 0, f'GradeCalculator.add_assignment: Chosen category name {category_name} must not be an empty string'
         assert len(assignment_name) > 0, f'GradeCalculator.add_assignment: New assignment name {assignment_name} must not be an empty string'
-        assert len(score) > 0, 'GradeCalculator.add_assignment: Given score must not be an empty string'
-        assert '/' in score, 'GradeCalculator.add_assignment: Given score must be formatted as "score/possible score"'
-        
+        earned_score, possible_score = GradeCalculator._parse_score(score, 'add_assignment')
+
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.add_assignment: Category "{category_name}" not a valid category.')
+
+        if assignment_name in self._categories[category_name].indices:
+            raise KeyError(f'GradeCalculator.add_assignment: Assignment {assignment_name} has already been added')
+
+        category = self._writable_category(category_name)
+        category.add(assignment_name, earned_score, possible_score)
+        if category.policy is not None:
+            category.policy.added(category, (earned_score,), (possible_score,))
+        self._invalidate(category_name)
+
+        if self.journal is not None:
+            self.journal.log('add_assignment', category_name, assignment_name, earned_score, possible_score)
+
+        if self.check_consistency:
+            self._check_running_totals()
+
+    def update_assignment(self, category_name: str, assignment_name: str, score: str) -> None:
+        '''
+        Changes the score of an existing assignment in place, keeping its position in the category.
+        The category's running totals are adjusted in constant time.
+        If the score is an empty string, not formatted as "score/possible score", or has a possible score of 0, raises AssertionError.
+        If the category or assignment does not exist, raises KeyError.
+        '''
+        earned_score, possible_score = GradeCalculator._parse_score(score, 'update_assignment')
+
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.update_assignment: Category "{category_name}" not a valid category.')
+        if assignment_name not in self._categories[category_name].indices:
+            raise KeyError(f'GradeCalculator.update_assignment: Assignment {assignment_name} not a valid assignment.')
+
+        category = self._writable_category(category_name)
+        category.update(assignment_name, earned_score, possible_score)
+        if category.policy is not None:
+            category.policy.changed(category)
+        self._invalidate(category_name)
+
+        if self.journal is not None:
+            self.journal.log('update_assignment', category_name, assignment_name, earned_score, possible_score)
+
+        if self.check_consistency:
+            self._check_running_totals()
+
+    def remove_assignment(self, category_name: str, assignment_name: str) -> None:
+        '''
+        Removes a single assignment from a category.
+        The category's running totals are adjusted in constant time.
+        If the category or assignment does not exist, raises KeyError.
+        '''
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.remove_assignment: Category "{category_name}" not a valid category.')
+        if assignment_name not in self._categories[category_name].indices:
+            raise KeyError(f'GradeCalculator.remove_assignment: Assignment {assignment_name} not a valid assignment.')
+
+        category = self._writable_category(category_name)
+        category.remove(assignment_name)
+        if category.policy is not None:
+            category.policy.changed(category)
+        self._invalidate(category_name)
+
+        if self.journal is not None:
+            self.journal.log('remove_assignment', category_name, assignment_name)
+
+        if self.check_consistency:
+            self._check_running_totals()
+
+    def rename_category(self, category_name: str, new_category_name: str) -> None:
+        '''
+        Renames a category, keeping its position, percentage, assignments and cached grade.
+        If the new category name is an empty string, raises AssertionError.
+        If the category does not exist, or the new name is already a category, raises KeyError.
+        '''
+        assert len(new_category_name) > 0, 'GradeCalculator.rename_category: New category name must not be an empty string'
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.rename_category: Category "{category_name}" not a valid category.')
+        if new_category_name in self._categories:
+            raise KeyError(f'GradeCalculator.rename_category: Category {new_category_name} has already been added')
+
+        # Rebuild the dict of categories (one entry per category) so the renamed category keeps its position
+        new_category_name = sys.intern(new_category_name)
+        self._categories = {new_category_name if k == category_name else k: v for k, v in self._categories.items()}
+        if category_name in self._grade_cache:
+            self._grade_cache[new_category_name] = self._grade_cache.pop(category_name)
+        if category_name in self._shared:
+            self._shared.remove(category_name)
+            self._shared.add(new_category_name)
+
+        if self.journal is not None:
+            self.journal.log('rename_category', category_name, new_category_name)
+
+        if self.check_consistency:
+            self._check_running_totals()
+
+    def add_assignments(self, assignments, row_numbers=None, batch_size: int = 1024) -> list:
+        '''
+        Adds many assignments at once, given an iterable of (category name, assignment name, score) tuples.
+        The score may be a "score/possible score" string or an (earned score, possible score) pair of numbers.
+        Rows are validated a batch at a time with the same checks as add_assignment, and then every valid row of the batch is added.
+        Invalid rows are skipped instead of raising, so one bad row does not stop the rest of the import.
+        Returns a list of RowError tuples, one per invalid row, numbered by row_numbers if given or else from 1.
+        '''
+        errors = []
+        numbered_rows = zip(count(1) if row_numbers is None else row_numbers, assignments)
+        batch = list(islice(numbered_rows, batch_size))
+        while batch:
+            self._add_assignment_batch(batch, errors)
+            batch = list(islice(numbered_rows, batch_size))
+
+        if self.check_consistency:
+            self._check_running_totals()
+
+        return errors
+
+    def _add_assignment_batch(self, batch: list, errors: list) -> None:
+        '''Validates a batch of numbered rows for add_assignments, then adds the valid rows of each category in order'''
+        categories = self._categories
+        valid_rows = {}
+
+        # Validate the whole batch before changing any state
+        for row_number, row in batch:
+            try:
+                assert len(row) == 3, 'GradeCalculator.add_assignments: Each row must be (category name, assignment name, score)'
+                category_name, assignment_name, score = row
+                assert isinstance(category_name, str), f'GradeCalculator.add_assignments: Chosen category name {category_name!r} must be a string'
+                assert isinstance(assignment_name, str), f'GradeCalculator.add_assignments: New assignment name {assignment_name!r} must be a string'
+                assert category_name, f'GradeCalculator.add_assignments: Chosen category name {category_name} must not be an empty string'
+                assert assignment_name, f'GradeCalculator.add_assignments: New assignment name {assignment_name} must not be an empty string'
+
+                if isinstance(score, str):
+                    score_split = score.split('/')
+                    try:
+                        earned_score = float(score_split[0])
+                        possible_score = float(score_split[1])
+                    except:
+                        # Let _parse_score report the exact problem with the score string
+                        GradeCalculator._parse_score(score, 'add_assignments')
+                        raise
+                else:
+                    try:
+                        earned_score, possible_score = float(score[0]), float(score[1])
+                    except:
+                        raise AssertionError('GradeCalculator.add_assignments: Given earned score and possible score must be of type int or float')
+                GradeCalculator._check_scores(earned_score, possible_score, 'add_assignments')
+
+                if category_name not in categories:
+                    raise KeyError(f'GradeCalculator.add_assignments: Category "{category_name}" not a valid category.')
+                if category_name not in valid_rows:
+                    valid_rows[category_name] = ({}, [], [])
+                names, earned_scores, possible_scores = valid_rows[category_name]
+                if assignment_name in categories[category_name].indices or assignment_name in names:
+                    raise KeyError(f'GradeCalculator.add_assignments: Assignment {assignment_name} has already been added')
+
+            except (AssertionError, KeyError, TypeError) as e:
+                message = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+                errors.append(RowError(row_number, message))
+                continue
+
+            names[assignment_name] = None
+            earned_scores.append(earned_score)
+            possible_scores.append(possible_score)
+
+        for category_name, (names, earned_scores, possible_scores) in valid_rows.items():
+            self._extend_category(category_name, list(names), earned_scores, possible_scores)
+
+            # Logged as one mutation, so the journal cannot compact between the records of the rows
+            if self.journal is not None:
+                self.journal.log_many('add_assignment', [(category_name, *row) for row in zip(names, earned_scores, possible_scores)])
+
+    def _extend_category(self, category_name: str, assignment_names: list, earned_scores: list, possible_scores: list) -> None:
+        '''Appends already validated assignments to a category and invalidates its cached grade'''
+        category = self._writable_category(category_name)
+        category.extend(assignment_names, earned_scores, possible_scores)
+        if category.policy is not None:
+            category.policy.added(category, earned_scores, possible_scores)
+        self._invalidate(category_name)
+
+    @staticmethod
+    def _parse_score(score: str, method_name: str) -> tuple:
+        '''
+        Parses a "score/possible score" string into an (earned score, possible score) tuple of floats.
+        If the string is empty, not formatted with '/', or cannot be converted to two floats, raises AssertionError.
+        If the scores are not finite, too large, or the possible score is 0, raises AssertionError, as _check_scores does.
+        '''
+        assert len(score) > 0, f'GradeCalculator.{method_name}: Given score must not be an empty string'
+        assert '/' in score, f'GradeCalculator.{method_name}: Given score must be formatted as "score/possible score"'
+
         try:
             score_split = score.split('/')
             earned_score = float(score_split[0])
             possible_score = float(score_split[1])
         except:
-            raise AssertionError('GradeCalculator.add_assignment: Given earned score and possible score must be of type int or float')
+            raise AssertionError(f'GradeCalculator.{method_name}: Given earned score and possible score must be of type int or float')
 
-        if category_name not in self.categories:
-            raise KeyError(f'GradeCalculator.add_assignment: Category "{category_name}" not a valid category.')
+        GradeCalculator._check_scores(earned_score, possible_score, method_name)
+        return earned_score, possible_score
 
-        if assignment_name in self.categories[category_name][GradeCalculator.ASSIGNMENTS]:
-            raise KeyError(f'GradeCalculator.add_assignment: Assignment {assignment_name} has already been added')
+    @staticmethod
+    def _check_scores(earned_score: float, possible_score: float, method_name: str) -> None:
+        '''
+        If either score is not a finite number of at most MAX_SCORE, raises AssertionError.
+        If the possible score is 0, or the earned/possible ratio is larger than MAX_RATIO, raises AssertionError.
+        '''
+        assert abs(earned_score) <= MAX_SCORE and abs(possible_score) <= MAX_SCORE, f'GradeCalculator.{method_name}: Given scores must be finite numbers of at most {MAX_SCORE:g}'
+        assert possible_score != 0, f'GradeCalculator.{method_name}: Given possible score must not be 0'
+        assert abs(earned_score / possible_score) <= MAX_RATIO, f'GradeCalculator.{method_name}: Given earned/possible ratio must be at most {MAX_RATIO:g}'
+
+    def required_scores(self, target_grade: float, future_assignments: list, lower_bound: float = 0, upper_bound: float = None) -> RequiredScores:
+        '''
+        Solves for the minimum score needed on future assignments to reach a target total grade (on the scale of calculate_total_grade, e.g. .8).
+        future_assignments is a list of (category name, possible score) pairs, and every future assignment is assumed to get the same earned/possible ratio.
+        The ratio is solved in closed form from the category percentages and running totals, without adding any assignments:
+            target * total percentage = sum over categories of percentage * (ratio sum + future count * ratio) / (assignment count + future count)
+        lower_bound and upper_bound limit the ratio, a ratio below lower_bound is raised to it, and upper_bound defaults to no limit.
+        Returns a RequiredScores tuple of the ratio, the earned score needed on each future assignment, and whether the ratio is within upper_bound.
+        If future_assignments is empty or a possible score is not a positive number, raises AssertionError.
+        If a future assignment's category is not valid, raises KeyError.
+        If a category would still have no assignments, or has an aggregation policy, raises ValueError.
+        '''
+        assert len(future_assignments) > 0, 'GradeCalculator.required_scores: At least one future assignment must be given'
+        for category_name, category in self._categories.items():
+            if category.policy is not None:
+                raise ValueError(f'GradeCalculator.required_scores: Category {category_name} has the aggregation policy {category.policy!r}, so the grade has no closed form')
+
+        future_counts = dict.fromkeys(self._categories, 0)
+        possible_scores = []
+        for category_name, possible_score in future_assignments:
+            if category_name not in self._categories:
+                raise KeyError(f'GradeCalculator.required_scores: Category "{category_name}" not a valid category.')
+            try:
+                possible_score = float(possible_score)
+            except:
+                raise AssertionError('GradeCalculator.required_scores: Given possible score must be of type int or float')
+            assert possible_score > 0, 'GradeCalculator.required_scores: Given possible score must be greater than 0'
+            future_counts[category_name] += 1
+            possible_scores.append(possible_score)
+
+        # Split the total into the part already earned and the part that grows with the ratio
+        earned_points = 0
+        points_per_ratio = 0
+        for category_name, category in self._categories.items():
+            assignment_count = len(category) + future_counts[category_name]
+            if assignment_count == 0:
+                raise ValueError(f'GradeCalculator.required_scores: Category {category_name} has no assignments, so a grade cannot be calculated')
+            earned_points += category.ratio_total() / assignment_count * category.percentage
+            points_per_ratio += future_counts[category_name] / assignment_count * category.percentage
 
-        self.categories[category_name][GradeCalculator.ASSIGNMENTS][assignment_name] = (earned_score, possible_score)
+        ratio = max((target_grade * self.total_possible_grade() - earned_points) / points_per_ratio, lower_bound)
+        feasible = upper_bound is None or ratio <= upper_bound
+        return RequiredScores(ratio, [ratio * possible_score for possible_score in possible_scores], feasible)
 
     def calculate_total_grade(self) -> float or int:
-        '''Calculates the total grade for the class'''
+        '''Calculates the total grade for the class, reusing the cached grade of every category that has not changed'''
+        if self.check_consistency:
+            self._check_running_totals()
+
+        if self._total_grade_cache is not None:
+            self._cache_hits += 1
+            return self._total_grade_cache
+        self._cache_misses += 1
+
         total_grade_points = 0
 
-        for category in self.categories:
-            total_grade_points += self._calculate_category_grade(category)
+        for category in self._categories:
+            total_grade_points += self._category_grade(category)
+
+        self._total_grade_cache = self._category_type.total_grade(total_grade_points, self._total_percentage)
+        return self._total_grade_cache
+
+    def category_grade(self, category_name: str) -> float or int:
+        '''
+        Calculates the grade for a single category from its running totals, as a share of the category percentage.
+        The grade is cached until the category changes.
+        If given an invalid category_name, raises KeyError.
+        If the category has no assignments, raises ZeroDivisionError.
+        '''
+        return self._category_type.grade_value(self._category_grade(category_name))
+
+    def _category_grade(self, category_name: str):
+        '''Returns the cached grade of a category in the number type of the numeric mode, calculating it on a miss'''
+        if category_name in self._grade_cache:
+            self._cache_hits += 1
+            return self._grade_cache[category_name]
+        self._cache_misses += 1
+
+        if category_name not in self._categories:
+            raise KeyError(f'GradeCalculator.category_grade: Category "{category_name}" not a valid category.')
+        grade = self._categories[category_name].grade()
+        self._grade_cache[category_name] = grade
+        return grade
 
-        return total_grade_points/self._calculate_total_possible_grade()
-            
-    def _calculate_category_grade(self, category_name: str) -> float or int:
-        '''Calculates the grade for a single category'''
-        total = 0
-        for v in self.categories[category_name][GradeCalculator.ASSIGNMENTS].values():
-            total += v[0]/v[1]
-        return (total / len(self.categories[category_name][GradeCalculator.ASSIGNMENTS])) * self.categories[category_name][GradeCalculator.PERCENTAGE_OF_GRADE]
+    def total_possible_grade(self) -> float or int:
+        '''Returns the total possible percentage of the grade'''
+        return self._category_type.weight_value(self._total_percentage)
+
+    def fork(self) -> 'GradeCalculator':
+        '''
+        Returns a copy-on-write copy of the calculator, for exploring a what-if scenario without changing this one.
+        The fork shares every category with this calculator, and only the categories that either one changes afterwards are copied.
+        It starts with this calculator's cached category grades and total grade, so only the changed categories are recalculated.
+        The fork has no journal, so its changes are never saved.
+        '''
+        fork = GradeCalculator(self.check_consistency, numeric=self.numeric)
+        fork._categories = dict(self._categories)
+        fork._shared = set(self._categories)
+        fork._total_percentage = self._total_percentage
+        fork._grade_cache = dict(self._grade_cache)
+        fork._total_grade_cache = self._total_grade_cache
+
+        # Changes made here after forking must not reach the fork either
+        self._shared.update(self._categories)
+        return fork
+
+    def diff(self, base: 'GradeCalculator') -> GradeDiff:
+        '''
+        Compares the grades of this calculator, usually a fork, against base.
+        Returns a GradeDiff of this total grade minus the base total grade, and a dict of each category whose grade differs
+        to its (base grade, grade) pair, where a category that is missing or has no assignments has a grade of None.
+        Categories still shared with base are not recalculated.
+        If either total grade cannot be calculated, raises ZeroDivisionError.
+        '''
+        categories = {}
+        for category_name in {**base._categories, **self._categories}:
+            category = self._categories.get(category_name)
+            base_category = base._categories.get(category_name)
+            if category is base_category:
+                continue
+
+            grades = []
+            for calculator, v in ((base, base_category), (self, category)):
+                grades.append(calculator.category_grade(category_name) if v is not None and len(v) > 0 else None)
+            if grades[0] != grades[1]:
+                categories[category_name] = tuple(grades)
+
+        return GradeDiff(self.calculate_total_grade() - base.calculate_total_grade(), categories)
+
+    def cache_info(self) -> CacheInfo:
+        '''Returns the hit and miss counters of the grade cache, and the number of cached category grades'''
+        return CacheInfo(self._cache_hits, self._cache_misses, len(self._grade_cache))
+
+    def _writable_category(self, category_name: str) -> Category:
+        '''Returns the Category of category_name to be changed, first replacing it with a clone if it is shared with a fork'''
+        category = self._categories[category_name]
+        if category_name in self._shared:
+            category = category.clone()
+            self._categories[category_name] = category
+            self._shared.remove(category_name)
+        return category
+
+    def _invalidate(self, category_name: str = None) -> None:
+        '''Drops the cached total grade, and the cached grade of category_name if given'''
+        self._total_grade_cache = None
+        if category_name is not None:
+            self._grade_cache.pop(category_name, None)
+
+    # Kept for callers of the original private helpers
+    _calculate_category_grade = category_grade
+    _calculate_total_possible_grade = total_possible_grade
 
     def _is_possible_grade_less_than_or_equal_100(self) -> bool:
         '''Returns a bool to determine if the total percentage exceeds 100'''
-        return sum([v[GradeCalculator.PERCENTAGE_OF_GRADE] for v in self.categories.values()]) <= 100
+        return self._total_percentage <= self._max_percentage
 
-    def _calculate_total_possible_grade(self) -> float or int:
-        '''Returns the total possible percentage of the grade'''
-        return sum([v[GradeCalculator.PERCENTAGE_OF_GRADE] for v in self.categories.values()])
+    def _check_running_totals(self) -> None:
+        '''
+        Recomputes every running total from the stored scores and compares it with the stored value.
+        If any total differs, raises AssertionError.
+        '''
+        for category_name, v in self._categories.items():
+            assert len(v.earned) == len(v.possible) and all([0 <= i < len(v.earned) for i in v.indices.values()]), f'GradeCalculator._check_running_totals: Score buffers of category {category_name} are out of sync with its assignment names'
+
+            total = 0
+            for _, earned, possible in v.items():
+                total += v.ratio(earned, possible)
+
+            # Updates and removals subtract from the ratio sum, so it can only be expected to match to rounding
+            matches = v.ratio_sum == total if v.exact else math.isclose(v.ratio_sum, total, rel_tol=1e-9, abs_tol=1e-9)
+            assert matches, f'GradeCalculator._check_running_totals: Running ratio sum {v.ratio_sum} of category {category_name} does not match the recomputed sum {total}'
+
+            if v.policy is not None and len(v) > 0:
+                totals = v.policy.totals(v)
+                expected = v.policy.bound(v).totals(v)
+                if isinstance(totals[0], float):
+                    # Float policy state is only updated incrementally, so it can only be expected to match to rounding
+                    matches = math.isclose(totals[0], expected[0], rel_tol=1e-9, abs_tol=1e-9) and totals[1] == expected[1]
+                else:
+                    matches = totals == expected
+                assert matches, f'GradeCalculator._check_running_totals: Totals {totals} of the {v.policy!r} policy of category {category_name} do not match the recomputed totals {expected}'
+
+        for category_name, grade in self._grade_cache.items():
+            expected = self._categories[category_name].grade()
+            assert grade == expected, f'GradeCalculator._check_running_totals: Cached grade {grade} of category {category_name} does not match the recomputed grade {expected}'
+
+        expected_percentage = sum([v.weight for v in self._categories.values()])
+        assert self._total_percentage == expected_percentage, f'GradeCalculator._check_running_totals: Running total percentage {self._total_percentage}% does not match the recomputed percentage {expected_percentage}%'
@@ -0,0 +1,151 @@
+'''
+Command Line Module for Grade Calculator
+Grades a whole roster of per-student gradebooks across processes, without the GUI
+Usage: python grade_cli.py INPUT [-o OUTPUT] [--workers N] [--chunk-size N] [--stats STATS.json]
+'''
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from gradebook_loader import load_gradebook, load_rows, iter_students
+from grade_stats import GradeStatistics
+
+GRADEBOOK_EXTENSIONS = ('.csv', '.jsonl', '.ndjson')
+
+def iter_tasks(source: str, format: str = None):
+    '''
+    Yields one task per student.
+    A directory yields (student id, path) for every gradebook file in it, sorted by name, with the file name as the student id.
+    A file yields (student id, rows) for every student of a roster gradebook with a student column.
+    '''
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            student_id, extension = os.path.splitext(name)
+            if extension.lower() in GRADEBOOK_EXTENSIONS:
+                yield student_id, os.path.join(source, name)
+    else:
+        yield from iter_students(source, format)
+
+def grade_student(task: tuple, format: str = None, statistics: GradeStatistics = None) -> tuple:
+    '''
+    Builds a GradeCalculator for one task of iter_tasks and calculates its total grade.
+    Returns (student id, total grade or None, errors), where errors is a list of RowError tuples.
+    If statistics is a grade_stats.GradeStatistics, the student is added to it.
+    '''
+    student_id, gradebook = task
+    if isinstance(gradebook, str):
+        calculator, errors = load_gradebook(gradebook, format=format)
+    else:
+        calculator, errors = load_rows(gradebook)
+
+    try:
+        total_grade = calculator.calculate_total_grade()
+    except ZeroDivisionError:
+        total_grade = None
+    if statistics is not None:
+        statistics.add_calculator(calculator)
+    return student_id, total_grade, errors
+
+def grade_chunk(chunk: list, format: str = None) -> list:
+    '''Grades a chunk of tasks in a worker process'''
+    return [grade_student(task, format) for task in chunk]
+
+def grade_chunk_with_statistics(chunk: list, format: str, statistics: GradeStatistics) -> tuple:
+    '''Grades a chunk of tasks in a worker process, returning the results and the chunk's students added to the empty statistics'''
+    return [grade_student(task, format, statistics) for task in chunk], statistics
+
+def grade_roster(tasks, workers: int = None, chunk_size: int = 64, format: str = None, statistics: GradeStatistics = None):
+    '''
+    Grades every task across a pool of worker processes, returning an iterator of grade_student results in input order.
+    Tasks are sent to the workers in chunks of chunk_size, with at most two chunks in flight per worker,
+    so neither the input nor the results are ever held in memory all at once.
+    If statistics is a grade_stats.GradeStatistics, each worker builds partial statistics of its chunk, which are merged into it.
+    If workers is given and less than 1, or chunk_size is less than 1, raises ValueError.
+    '''
+    if workers is not None and workers < 1:
+        raise ValueError(f'grade_roster: Number of workers must be at least 1, not {workers}')
+    if chunk_size < 1:
+        raise ValueError(f'grade_roster: Chunk size must be at least 1, not {chunk_size}')
+    return _grade_roster(tasks, workers or os.cpu_count() or 1, chunk_size, format, statistics)
+
+def _grade_roster(tasks, workers: int, chunk_size: int, format: str, statistics: GradeStatistics):
+    '''The generator behind grade_roster, so bad arguments raise when grade_roster is called rather than on the first result'''
+    tasks = iter(tasks)
+    if statistics is not None:
+        # Each chunk is sent an empty copy with the same letter cutoffs and resolution
+        empty_statistics = GradeStatistics(statistics.letter_cutoffs, statistics.sketch.resolution)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = list(islice(tasks, chunk_size))
+                if not chunk:
+                    break
+                if statistics is None:
+                    in_flight.append(executor.submit(grade_chunk, chunk, format))
+                else:
+                    in_flight.append(executor.submit(grade_chunk_with_statistics, chunk, format, empty_statistics))
+            if not in_flight:
+                break
+            if statistics is None:
+                yield from in_flight.popleft().result()
+            else:
+                results, chunk_statistics = in_flight.popleft().result()
+                statistics.merge(chunk_statistics)
+                yield from results
+
+def positive_int(value: str) -> int:
+    '''argparse type accepting only ints of at least 1'''
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'invalid int value: {value!r}')
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'must be at least 1, not {number}')
+    return number
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Calculate the total grade of every student in a roster of gradebooks.')
+    parser.add_argument('input', help='directory of per-student gradebooks, or a roster gradebook with a student column')
+    parser.add_argument('-o', '--output', help='CSV file to write the grades to (default: standard output)')
+    parser.add_argument('--workers', type=positive_int, default=None, help='number of worker processes (default: number of CPUs)')
+    parser.add_argument('--chunk-size', type=positive_int, default=64, help='number of students sent to a worker at a time (default: 64)')
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default=None, help='gradebook format (default: from the file extension)')
+    parser.add_argument('--stats', help='JSON file to write class statistics to: mean, percentiles, category averages and letter grades')
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'w', newline='') if args.output else sys.stdout
+    start = time.perf_counter()
+    student_count = 0
+    error_count = 0
+    statistics = GradeStatistics() if args.stats else None
+    try:
+        writer = csv.writer(output)
+        writer.writerow(['student', 'grade', 'errors'])
+        for student_id, total_grade, errors in grade_roster(iter_tasks(args.input, args.format), args.workers, args.chunk_size, args.format, statistics):
+            writer.writerow([student_id, '' if total_grade is None else repr(total_grade), len(errors)])
+            for error in errors:
+                print(f'{student_id}: line {error.row_number}: {error.message}', file=sys.stderr)
+            student_count += 1
+            error_count += len(errors)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if statistics is not None:
+        with open(args.stats, 'w') as file:
+            json.dump(statistics.report(), file, indent=2, allow_nan=False)
+
+    elapsed = time.perf_counter() - start
+    print(f'Graded {student_count} students in {elapsed:.2f}s ({student_count / elapsed if elapsed else 0:,.0f} students/sec), {error_count} bad rows', file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
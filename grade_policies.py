@@ -0,0 +1,185 @@
+'''
+Aggregation Policies for Grade Calculator
+A policy decides how the assignments of one category make up its grade, given to GradeCalculator.add_category.
+Without a policy, a category's grade is the unweighted mean of its earned/possible ratios.
+
+Every policy reduces a category to a (ratio sum, assignment count) pair, which the category turns into its grade as
+    ratio sum / assignment count * percentage
+in the numeric mode of the calculator, so policies work the same in float, fraction and fixed point.
+
+Each category binds its own copy of the policy given to add_category, so one policy object can be given to many categories.
+'''
+
+import copy
+import heapq
+
+class AggregationPolicy:
+    '''
+    Base class of the aggregation policies.
+    A bound policy keeps whatever state lets it update the category grade as assignments are added;
+    after an assignment is changed or removed, the state is rebuilt from every assignment of the category.
+    '''
+
+    # Name of the policy in specs, set by every subclass
+    name = None
+
+    def bound(self, category) -> 'AggregationPolicy':
+        '''Returns a copy of the policy with its state built from the assignments of category'''
+        policy = copy.copy(self)
+        policy.rebuild(category)
+        return policy
+
+    def rebuild(self, category) -> None:
+        '''Rebuilds the state of the policy from every assignment of category'''
+
+    def added(self, category, earned_scores: list, possible_scores: list) -> None:
+        '''Updates the state after assignments were appended to category'''
+        self.rebuild(category)
+
+    def changed(self, category) -> None:
+        '''Updates the state after an assignment of category was changed or removed'''
+        self.rebuild(category)
+
+    def totals(self, category) -> tuple:
+        '''Returns the (ratio sum, assignment count) that the grade of category is calculated from'''
+        raise NotImplementedError
+
+    def spec(self) -> list:
+        '''Returns the policy as a JSON-compatible list, which policy_from_spec turns back into an equal policy'''
+        return [self.name]
+
+    def __eq__(self, other):
+        return type(other) is type(self) and other.spec() == self.spec()
+
+    def __repr__(self):
+        return f'{type(self).__name__}({", ".join(map(repr, self.spec()[1:]))})'
+
+
+class PointsBased(AggregationPolicy):
+    '''Weights assignments by their possible score: the grade is total earned / total possible'''
+
+    name = 'points'
+
+    def rebuild(self, category) -> None:
+        self.earned_total = 0
+        self.possible_total = 0
+        for _, earned_score, possible_score in category.items():
+            self.earned_total += category.score_of(earned_score)
+            self.possible_total += category.score_of(possible_score)
+
+    def added(self, category, earned_scores: list, possible_scores: list) -> None:
+        for earned_score, possible_score in zip(earned_scores, possible_scores):
+            self.earned_total += category.score_of(earned_score)
+            self.possible_total += category.score_of(possible_score)
+
+    def totals(self, category) -> tuple:
+        if len(category) == 0:
+            return 0, 0
+        return category.ratio_of_totals(self.earned_total, self.possible_total), 1
+
+
+class DropLowest(AggregationPolicy):
+    '''
+    Drops the count lowest earned/possible ratios from the mean, always keeping at least one assignment.
+    The dropped ratios are kept in a max-heap of at most count entries, so adding an assignment costs O(log count).
+    '''
+
+    name = 'drop_lowest'
+
+    def __init__(self, count: int):
+        '''If count is not a positive int, raises AssertionError'''
+        assert isinstance(count, int) and count > 0, 'DropLowest: Number of dropped assignments must be a positive int'
+        self.count = count
+
+    def rebuild(self, category) -> None:
+        # heapq is a min-heap, so the dropped ratios are negated to keep the highest of them on top
+        lowest = heapq.nsmallest(self.count, [category.ratio(earned_score, possible_score) for _, earned_score, possible_score in category.items()])
+        self.dropped = [-k for k in lowest]
+        heapq.heapify(self.dropped)
+        self.dropped_sum = sum(lowest)
+
+    def added(self, category, earned_scores: list, possible_scores: list) -> None:
+        dropped = self.dropped
+        for earned_score, possible_score in zip(earned_scores, possible_scores):
+            ratio = category.ratio(earned_score, possible_score)
+            if len(dropped) < self.count:
+                heapq.heappush(dropped, -ratio)
+                self.dropped_sum += ratio
+            elif ratio < -dropped[0]:
+                # The new ratio is dropped instead of the highest dropped ratio, which is kept again
+                self.dropped_sum += ratio + heapq.heapreplace(dropped, -ratio)
+
+    def totals(self, category) -> tuple:
+        assignment_count = len(category)
+        if assignment_count > self.count:
+            return category.ratio_sum - self.dropped_sum, assignment_count - self.count
+        if assignment_count == 0:
+            return 0, 0
+
+        # Every ratio is in the heap, so only the highest one is kept
+        return -self.dropped[0], 1
+
+    def spec(self) -> list:
+        return [self.name, self.count]
+
+
+class Capped(AggregationPolicy):
+    '''
+    Caps the earned/possible ratio of the category, by default at 1 so extra credit cannot take it over 100%.
+    The uncapped ratio comes from another policy, by default the mean of the ratios.
+    '''
+
+    name = 'capped'
+
+    def __init__(self, cap: float = 1.0, policy: AggregationPolicy = None):
+        '''If cap is not a positive number, raises AssertionError'''
+        assert isinstance(cap, (int, float)) and cap > 0, 'Capped: Cap must be a positive number'
+        self.cap = float(cap)
+        self.policy = policy
+
+    def bound(self, category) -> 'Capped':
+        policy = copy.copy(self)
+        if self.policy is not None:
+            policy.policy = self.policy.bound(category)
+        return policy
+
+    def rebuild(self, category) -> None:
+        if self.policy is not None:
+            self.policy.rebuild(category)
+
+    def added(self, category, earned_scores: list, possible_scores: list) -> None:
+        if self.policy is not None:
+            self.policy.added(category, earned_scores, possible_scores)
+
+    def changed(self, category) -> None:
+        if self.policy is not None:
+            self.policy.changed(category)
+
+    def totals(self, category) -> tuple:
+        if self.policy is None:
+            ratio_sum, assignment_count = category.ratio_sum, len(category)
+        else:
+            ratio_sum, assignment_count = self.policy.totals(category)
+        return min(ratio_sum, category.ratio(self.cap, 1.0) * assignment_count), assignment_count
+
+    def spec(self) -> list:
+        return [self.name, self.cap] + ([self.policy.spec()] if self.policy is not None else [])
+
+    def __repr__(self):
+        return f'Capped({self.cap!r}' + (f', {self.policy!r})' if self.policy is not None else ')')
+
+
+# Policy classes by spec name
+POLICIES = {k.name: k for k in (PointsBased, DropLowest, Capped)}
+
+def policy_from_spec(spec: list) -> AggregationPolicy:
+    '''
+    Builds a policy from a list returned by AggregationPolicy.spec.
+    If the spec does not name a policy, raises ValueError.
+    '''
+    if not spec or spec[0] not in POLICIES:
+        raise ValueError(f'policy_from_spec: {spec} is not a valid policy spec')
+    name, *args = spec
+    if name == Capped.name and len(args) > 1:
+        return Capped(args[0], policy_from_spec(args[1]))
+    return POLICIES[name](*args)
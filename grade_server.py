@@ -0,0 +1,207 @@
+'''
+Server Module for Grade Calculator
+An asyncio server holding many named GradeCalculator objects in memory, speaking newline-delimited JSON over TCP
+Usage: python grade_server.py [--host HOST] [--port PORT]
+
+Each request is one JSON object per line, and clients may pipeline many requests without waiting:
+    {"id": 1, "calculator": "alice", "op": "add_category", "args": ["Homework", "20"]}
+Each response is one JSON object per line, in request order for the connection:
+    {"id": 1, "ok": true, "result": null}
+    {"id": 2, "ok": false, "error": "KeyError", "message": "..."}
+'''
+
+import argparse
+import asyncio
+import json
+from grade_calculator import GradeCalculator
+
+# GradeCalculator methods that can be called on a named calculator
+CALCULATOR_OPS = frozenset((
+    'add_category', 'remove_category', 'rename_category',
+    'add_assignment', 'update_assignment', 'remove_assignment',
+    'calculate_total_grade', 'category_grade', 'total_possible_grade', 'category_str',
+))
+
+# Server-level operations, which do not name a calculator
+SERVER_OPS = frozenset(('list_calculators', 'drop_calculator', 'roster_total_grades'))
+
+class GradeServer:
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, executor=None):
+        '''
+        Creates a server on host and port, where port 0 picks a free port.
+        Roster recomputes run in executor, which defaults to the event loop's default executor.
+        '''
+        self.host = host
+        self.port = port
+        self.executor = executor
+        self.calculators = {}
+        self._server = None
+
+        # Operations waiting for the next batch of each calculator, as (op, args, future) tuples
+        self._pending = {}
+
+        # Set while no roster recompute is running, batches wait for it so the executor never sees a calculator change
+        self._writes_allowed = asyncio.Event()
+        self._writes_allowed.set()
+        self._roster_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        '''Starts listening, and sets self.port to the port actually bound'''
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        '''Reads pipelined requests from one connection, and writes their responses back in order'''
+        responses = asyncio.Queue()
+        responder = asyncio.create_task(self._write_responses(responses, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    responses.put_nowait(self._dispatch(line))
+        except ConnectionError:
+            pass
+        finally:
+            responses.put_nowait(None)
+            await responder
+
+    async def _write_responses(self, responses: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        '''Writes each response as soon as it and every earlier response of the connection is ready'''
+        try:
+            while True:
+                response = await responses.get()
+                if response is None:
+                    break
+                writer.write(json.dumps(await response).encode('utf-8') + b'\n')
+                if responses.empty():
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, line: bytes) -> asyncio.Future:
+        '''Parses one request line and returns a future of its response'''
+        loop = asyncio.get_running_loop()
+        request_id = None
+        try:
+            request = json.loads(line)
+            assert isinstance(request, dict), 'GradeServer: Request must be a JSON object'
+            request_id = request.get('id')
+            op = request.get('op')
+            args = request.get('args', [])
+            assert isinstance(args, list), 'GradeServer: Request args must be a list'
+
+            if op in SERVER_OPS:
+                result = asyncio.ensure_future(getattr(self, f'_{op}')(*args))
+            elif op in CALCULATOR_OPS:
+                name = request.get('calculator')
+                assert isinstance(name, str) and len(name) > 0, 'GradeServer: Request must name a calculator'
+                result = loop.create_future()
+                self._enqueue(name, op, args, result)
+            else:
+                raise AssertionError(f'GradeServer: Unknown op {op}')
+        except Exception as e:
+            result = loop.create_future()
+            result.set_exception(e)
+
+        return asyncio.ensure_future(self._respond(request_id, result))
+
+    async def _respond(self, request_id, result: asyncio.Future) -> dict:
+        try:
+            return {'id': request_id, 'ok': True, 'result': await result}
+        except Exception as e:
+            message = e.args[0] if isinstance(e, KeyError) and e.args else str(e)
+            return {'id': request_id, 'ok': False, 'error': type(e).__name__, 'message': message}
+
+    def _enqueue(self, name: str, op: str, args: list, future: asyncio.Future) -> None:
+        '''Queues an operation on a calculator, scheduling a batch if the calculator has none pending'''
+        if name not in self._pending:
+            self._pending[name] = []
+            asyncio.ensure_future(self._run_batch(name))
+        self._pending[name].append((op, args, future))
+
+    async def _run_batch(self, name: str) -> None:
+        '''
+        Applies every operation queued on a calculator since the batch was scheduled, in arrival order.
+        Operations from all connections that arrive within one event loop iteration share one batch.
+        '''
+        await self._writes_allowed.wait()
+        batch = self._pending.pop(name)
+
+        calculator = self.calculators.get(name)
+        if calculator is None:
+            calculator = self.calculators[name] = GradeCalculator()
+
+        for op, args, future in batch:
+            try:
+                result = getattr(calculator, op)(*args)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    async def _list_calculators(self) -> list:
+        return list(self.calculators)
+
+    async def _drop_calculator(self, name: str) -> None:
+        await self._writes_allowed.wait()
+        if name not in self.calculators:
+            raise KeyError(f'GradeServer.drop_calculator: Calculator {name} not a valid calculator.')
+        del self.calculators[name]
+
+    async def _roster_total_grades(self) -> dict:
+        '''
+        Calculates the total grade of every calculator in the executor, so the event loop keeps serving other connections.
+        Batches wait until the recompute is done. A calculator whose grade cannot be calculated gets None.
+        '''
+        async with self._roster_lock:
+            self._writes_allowed.clear()
+            try:
+                calculators = dict(self.calculators)
+                return await asyncio.get_running_loop().run_in_executor(self.executor, _total_grades, calculators)
+            finally:
+                self._writes_allowed.set()
+
+def _total_grades(calculators: dict) -> dict:
+    '''Calculates the total grade of every calculator, with None where it cannot be calculated'''
+    total_grades = {}
+    for name, calculator in calculators.items():
+        try:
+            total_grades[name] = calculator.calculate_total_grade()
+        except ZeroDivisionError:
+            total_grades[name] = None
+    return total_grades
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(description='Serve grade calculators over newline-delimited JSON.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = GradeServer(args.host, args.port)
+        await server.start()
+        print(f'Serving grade calculators on {server.host}:{server.port}')
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
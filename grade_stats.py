@@ -0,0 +1,289 @@
+'''
+Statistics Module for Grade Calculator
+Class-wide statistics of total grades in one streaming pass over GradeCalculator objects or a NumPy RosterGrader:
+count, mean, standard deviation, min and max, median and percentiles, per-category averages and letter grade histograms.
+
+Every statistic is mergeable, so partial results built in separate processes can be combined with GradeStatistics.merge:
+    mean and variance   Welford's running update, merged with Chan's formula
+    percentiles         QuantileSketch, counts of grades rounded to a fixed resolution, merged by adding counts
+    histograms          exact counts per letter grade, compared against the cutoffs without rounding
+'''
+
+import math
+from collections import namedtuple
+from fractions import Fraction
+from grade_calculator import exact_number
+
+# Letter grades and the lowest total grade (on the scale of calculate_total_grade) that earns each, from highest to lowest
+LETTER_CUTOFFS = (('A', .9), ('B', .8), ('C', .7), ('D', .6), ('F', 0.0))
+
+# A summary of the running statistics, as returned by RunningStats.summary
+Summary = namedtuple('Summary', ['count', 'mean', 'stdev', 'min', 'max'])
+
+class RunningStats:
+    '''Count, mean, variance, min and max of a stream of numbers, with Welford's update'''
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @classmethod
+    def from_array(cls, values) -> 'RunningStats':
+        '''Builds the statistics of a non-empty NumPy array in one vectorized pass'''
+        stats = cls()
+        stats.count = len(values)
+        stats.mean = float(values.mean())
+        stats.m2 = float(((values - stats.mean) ** 2).sum())
+        stats.min = float(values.min())
+        stats.max = float(values.max())
+        return stats
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'RunningStats') -> None:
+        '''Adds the values of other to these statistics, as if they had been added one by one'''
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def variance(self) -> float:
+        '''Returns the population variance, or NaN if there are no values'''
+        return self.m2 / self.count if self.count else math.nan
+
+    def summary(self) -> Summary:
+        if self.count == 0:
+            return Summary(0, math.nan, math.nan, math.nan, math.nan)
+        return Summary(self.count, self.mean, math.sqrt(self.variance()), self.min, self.max)
+
+
+class QuantileSketch:
+    '''
+    A mergeable sketch of a stream of numbers that answers quantiles to within half of resolution.
+    Values are counted by their nearest multiple of resolution, so the sketch holds at most one counter per distinct multiple,
+    a few thousand for grades between 0 and 1 at the default resolution, however many values are added.
+    '''
+
+    def __init__(self, resolution: float = 1e-4):
+        '''If resolution is not a positive number, raises AssertionError'''
+        assert resolution > 0, 'QuantileSketch: Resolution must be greater than 0'
+        self.resolution = resolution
+        self.counts = {}
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        bucket = round(value / self.resolution)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += count
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        '''
+        Adds the counts of other to this sketch.
+        If the sketches have different resolutions, raises ValueError.
+        '''
+        if other.resolution != self.resolution:
+            raise ValueError(f'QuantileSketch.merge: Resolution {other.resolution} does not match {self.resolution}')
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+
+    def quantiles(self, fractions: list) -> list:
+        '''
+        Returns the nearest-rank quantile for each fraction between 0 and 1, sorting the buckets once.
+        If the sketch is empty, every quantile is NaN.
+        '''
+        if self.count == 0:
+            return [math.nan for _ in fractions]
+
+        ranks = sorted((max(1, math.ceil(fraction * self.count)), i) for i, fraction in enumerate(fractions))
+        results = [None] * len(fractions)
+        buckets = iter(sorted(self.counts.items()))
+        bucket, seen = None, 0
+        for rank, i in ranks:
+            while seen < rank:
+                bucket, count = next(buckets)
+                seen += count
+            results[i] = bucket * self.resolution
+        return results
+
+    def quantile(self, fraction: float) -> float:
+        return self.quantiles([fraction])[0]
+
+
+class GradeStatistics:
+    '''
+    Statistics of the total grades, category averages and letter grades of many students.
+    A category average is the mean earned share of the category, its category_grade divided by its percentage.
+    Students whose total grade cannot be calculated, because a category is empty, are only counted in skipped.
+    '''
+
+    def __init__(self, letter_cutoffs: tuple = LETTER_CUTOFFS, resolution: float = 1e-4):
+        '''
+        letter_cutoffs is a sequence of (letter, lowest total grade) pairs from highest to lowest,
+        a total grade below every cutoff gets the last letter.
+        resolution is the accuracy of the percentiles, on the scale of the total grade.
+        '''
+        self.letter_cutoffs = tuple((letter, cutoff) for letter, cutoff in letter_cutoffs)
+        self.totals = RunningStats()
+        self.sketch = QuantileSketch(resolution)
+        self.histogram = dict.fromkeys([letter for letter, _ in self.letter_cutoffs], 0)
+        self.categories = {}
+        self.skipped = 0
+
+        # Cutoffs as exact fractions, so a Fraction grade of exactly 9/10 is not compared against the float closest to .9
+        self._exact_cutoffs = [(letter, exact_number(float(cutoff))) for letter, cutoff in self.letter_cutoffs]
+
+    def letter(self, total_grade) -> str:
+        '''Returns the letter grade of a total grade'''
+        cutoffs = self._exact_cutoffs if isinstance(total_grade, Fraction) else self.letter_cutoffs
+        for letter, cutoff in cutoffs:
+            if total_grade >= cutoff:
+                return letter
+        return cutoffs[-1][0]
+
+    def add(self, total_grade, category_averages: dict = None) -> None:
+        '''
+        Adds one student's total grade, and their earned share of each category if given.
+        A total grade of None counts the student as skipped.
+        '''
+        if category_averages:
+            for category_name, average in category_averages.items():
+                if category_name not in self.categories:
+                    self.categories[category_name] = RunningStats()
+                self.categories[category_name].add(float(average))
+
+        if total_grade is None:
+            self.skipped += 1
+            return
+        self.histogram[self.letter(total_grade)] += 1
+        total_grade = float(total_grade)
+        self.totals.add(total_grade)
+        self.sketch.add(total_grade)
+
+    def add_calculator(self, calculator) -> None:
+        '''Adds the total grade and category averages of one GradeCalculator, skipping the empty categories'''
+        category_averages = {}
+        for category_name, category in calculator._categories.items():
+            if len(category) > 0:
+                category_averages[category_name] = calculator.category_grade(category_name) / category.percentage
+
+        try:
+            total_grade = calculator.calculate_total_grade()
+        except ZeroDivisionError:
+            total_grade = None
+        self.add(total_grade, category_averages)
+
+    def add_calculators(self, calculators) -> 'GradeStatistics':
+        '''Adds every GradeCalculator of an iterable, or of the values of a dict, in one pass, and returns self'''
+        if isinstance(calculators, dict):
+            calculators = calculators.values()
+        for calculator in calculators:
+            self.add_calculator(calculator)
+        return self
+
+    def add_roster(self, roster) -> 'GradeStatistics':
+        '''
+        Adds every student of a roster.RosterGrader with vectorized NumPy operations, and returns self.
+        Matches adding each student's GradeCalculator, up to float rounding of the means.
+        '''
+        import numpy as np
+
+        total_grades = roster.total_grades()
+        graded = total_grades[~np.isnan(total_grades)]
+        self.skipped += len(total_grades) - len(graded)
+
+        if len(graded):
+            self.totals.merge(RunningStats.from_array(graded))
+
+            sketch = QuantileSketch(self.sketch.resolution)
+            buckets, counts = np.unique(np.rint(graded / sketch.resolution), return_counts=True)
+            sketch.counts = dict(zip(map(int, buckets.tolist()), counts.tolist()))
+            sketch.count = len(graded)
+            self.sketch.merge(sketch)
+
+            # Each grade gets the first letter whose cutoff it reaches
+            remaining = np.ones(len(graded), dtype=bool)
+            for letter, cutoff in self.letter_cutoffs:
+                earned = remaining & (graded >= cutoff)
+                self.histogram[letter] += int(earned.sum())
+                remaining &= ~earned
+            self.histogram[self.letter_cutoffs[-1][0]] += int(remaining.sum())
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shares = roster.category_grades() / roster.percentages
+        for i, category_name in enumerate(roster.category_names):
+            column = shares[:, i]
+            column = column[~np.isnan(column)]
+            if len(column) == 0:
+                continue
+            if category_name not in self.categories:
+                self.categories[category_name] = RunningStats()
+            self.categories[category_name].merge(RunningStats.from_array(column))
+        return self
+
+    def merge(self, other: 'GradeStatistics') -> 'GradeStatistics':
+        '''
+        Adds the students of other, built for example in another process, and returns self.
+        If the statistics use different letter cutoffs or percentile resolutions, raises ValueError.
+        '''
+        if other.letter_cutoffs != self.letter_cutoffs:
+            raise ValueError('GradeStatistics.merge: Letter cutoffs do not match')
+        self.totals.merge(other.totals)
+        self.sketch.merge(other.sketch)
+        for letter, count in other.histogram.items():
+            self.histogram[letter] += count
+        for category_name, stats in other.categories.items():
+            if category_name not in self.categories:
+                self.categories[category_name] = RunningStats()
+            self.categories[category_name].merge(stats)
+        self.skipped += other.skipped
+        return self
+
+    def percentiles(self, percents: list = (10, 25, 50, 75, 90)) -> dict:
+        '''Returns a dict of each percent (0 to 100) to the total grade at that percentile'''
+        return dict(zip(percents, self.sketch.quantiles([percent / 100 for percent in percents])))
+
+    def median(self) -> float:
+        return self.sketch.quantile(.5)
+
+    def category_averages(self) -> dict:
+        '''Returns a dict of each category name to the mean earned share of the category'''
+        return {k: v.mean for k, v in self.categories.items()}
+
+    def report(self) -> dict:
+        '''
+        Returns every statistic as a dict of plain numbers, ready to be written as JSON.
+        Statistics of no values, NaN elsewhere, are None, since JSON has no NaN.
+        '''
+        return {
+            'students': self.totals.count + self.skipped,
+            'graded': self.totals.count,
+            'skipped': self.skipped,
+            'total_grade': _summary_report(self.totals),
+            'median': _number_or_none(self.median()),
+            'percentiles': {k: _number_or_none(v) for k, v in self.percentiles().items()},
+            'histogram': dict(self.histogram),
+            'categories': {k: _summary_report(v) for k, v in self.categories.items()},
+        }
+
+def _number_or_none(value: float) -> float:
+    return None if math.isnan(value) else value
+
+def _summary_report(stats: RunningStats) -> dict:
+    return {k: _number_or_none(v) for k, v in stats.summary()._asdict().items()}
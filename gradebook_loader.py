@@ -0,0 +1,170 @@
+'''
+Gradebook Loader Module for Grade Calculator
+Streams CSV and JSON lines gradebook exports into a GradeCalculator, row by row
+'''
+
+import csv
+import json
+import os
+from grade_calculator import GradeCalculator, RowError
+
+# Column names of a gradebook row
+CATEGORY = 'category'
+PERCENTAGE = 'percentage'
+ASSIGNMENT = 'assignment'
+SCORE = 'score'
+STUDENT = 'student'
+
+def iter_csv_rows(file):
+    '''
+    Yields (line number, row dict) for every row of a CSV gradebook with a header line.
+    Blank lines are skipped.
+    '''
+    reader = csv.reader(file)
+    header = next(reader, None)
+    if header is None:
+        return
+    header = [k.strip() for k in header]
+    for row in reader:
+        if not any(row):
+            continue
+        yield reader.line_num, dict(zip(header, row))
+
+def iter_jsonl_rows(file):
+    '''
+    Yields (line number, row dict) for every line of a JSON lines gradebook.
+    Lines that are not JSON objects are yielded as a RowError instead of a dict. Blank lines are skipped.
+    '''
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, RowError(line_number, f'gradebook_loader: Line is not valid JSON ({e})')
+            continue
+        if not isinstance(row, dict):
+            yield line_number, RowError(line_number, 'gradebook_loader: Line must be a JSON object')
+            continue
+        yield line_number, row
+
+def iter_rows(source, format: str = None):
+    '''
+    Yields (line number, row dict) for every row of a gradebook, given a path or an open text file.
+    The format is 'csv' or 'jsonl', and defaults to the file extension of the path.
+    If the format cannot be determined, raises ValueError.
+    '''
+    if format is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+        extension = os.path.splitext(str(name))[1].lower()
+        format = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension)
+    if format not in ('csv', 'jsonl'):
+        raise ValueError(f'gradebook_loader.iter_rows: Cannot determine the gradebook format of {source}, expected csv or jsonl')
+
+    iter_format_rows = iter_csv_rows if format == 'csv' else iter_jsonl_rows
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline='', encoding='utf-8') as file:
+            yield from iter_format_rows(file)
+    else:
+        yield from iter_format_rows(source)
+
+def load_gradebook(source, calculator: GradeCalculator = None, format: str = None, batch_size: int = 1024) -> tuple:
+    '''
+    Loads a gradebook into a GradeCalculator without reading the whole file into memory.
+    Every row has a category, and may have a percentage, an assignment and a score.
+    The first row naming a category with a percentage adds that category, and rows with an assignment add it to their category.
+    Assignments are validated and added in batches with GradeCalculator.add_assignments.
+    Bad rows are skipped and reported, rather than stopping the load.
+    Returns a (calculator, errors) tuple, where errors is a list of RowError tuples numbered by line, in line order.
+    '''
+    return load_rows(iter_rows(source, format), calculator, batch_size)
+
+def load_rows(rows, calculator: GradeCalculator = None, batch_size: int = 1024) -> tuple:
+    '''
+    Loads (line number, row dict) pairs, as yielded by iter_rows, into a GradeCalculator.
+    Returns a (calculator, errors) tuple, as load_gradebook does.
+    '''
+    if calculator is None:
+        calculator = GradeCalculator()
+    errors = []
+    # Percentage of every category defined so far, to check rows that repeat it
+    defined_categories = {}
+    batch = []
+    line_numbers = []
+
+    def flush():
+        errors.extend(calculator.add_assignments(batch, line_numbers, batch_size))
+        batch.clear()
+        line_numbers.clear()
+
+    for line_number, row in rows:
+        if isinstance(row, RowError):
+            errors.append(row)
+            continue
+
+        category_name = _field(row, CATEGORY)
+        percentage = _field(row, PERCENTAGE)
+        assignment_name = _field(row, ASSIGNMENT)
+
+        if percentage and category_name not in defined_categories:
+            # Add pending assignments first, so rows are applied in file order
+            flush()
+            try:
+                calculator.add_category(category_name, percentage)
+            except KeyError:
+                # Already in the calculator that was given, so its percentage is checked like a repeated row
+                defined_categories[category_name] = calculator.categories[category_name][GradeCalculator.PERCENTAGE_OF_GRADE]
+            except (AssertionError, ValueError) as e:
+                errors.append(RowError(line_number, str(e)))
+                continue
+            else:
+                defined_categories[category_name] = float(percentage)
+
+        if percentage and category_name in defined_categories:
+            try:
+                same_percentage = float(percentage) == defined_categories[category_name]
+            except ValueError:
+                same_percentage = False
+            if not same_percentage:
+                errors.append(RowError(line_number, f'gradebook_loader: Percentage {percentage} of category {category_name} does not match its earlier percentage {defined_categories[category_name]}'))
+                continue
+
+        if assignment_name:
+            batch.append((category_name, assignment_name, _field(row, SCORE)))
+            line_numbers.append(line_number)
+            if len(batch) >= batch_size:
+                flush()
+        elif not percentage:
+            errors.append(RowError(line_number, 'gradebook_loader: Row must have a percentage or an assignment'))
+
+    flush()
+    errors.sort(key=lambda e: e.row_number)
+    return calculator, errors
+
+def iter_students(source, format: str = None):
+    '''
+    Yields (student id, rows) for a roster gradebook with a student column, where rows is a list of (line number, row dict) pairs.
+    Rows of one student must be contiguous, only one student's rows are held in memory at a time.
+    If a student's rows appear again after another student's, raises ValueError.
+    '''
+    finished_students = set()
+    student_id = None
+    rows = []
+    for line_number, row in iter_rows(source, format):
+        row_student_id = student_id if isinstance(row, RowError) else _field(row, STUDENT)
+        if row_student_id != student_id:
+            if rows:
+                yield student_id, rows
+            finished_students.add(student_id)
+            if row_student_id in finished_students:
+                raise ValueError(f'gradebook_loader.iter_students: Rows of student {row_student_id} on line {line_number} are not contiguous')
+            student_id = row_student_id
+            rows = []
+        rows.append((line_number, row))
+    if rows:
+        yield student_id, rows
+
+def _field(row: dict, key: str) -> str:
+    '''Returns a field of a row as a stripped string, or an empty string if it is missing'''
+    value = row.get(key)
+    return '' if value is None else str(value).strip()
@@ -0,0 +1,225 @@
+'''
+Instrumentation Module for Grade Calculator
+Opt-in profiling of GradeCalculator operations: call counts, cumulative and max latency,
+and how many categories and assignments each call touched.
+
+    instrumentation = instrument(calculator, JsonLinesSink('calls.jsonl'))
+    ...
+    print(instrumentation.report())
+    uninstrument(calculator)
+
+instrument swaps the class of one calculator for an instrumented subclass, so a calculator that is not
+instrumented runs the plain GradeCalculator methods, with no checks or timers on the way.
+'''
+
+import json
+import time
+from collections import deque, namedtuple
+
+# The GradeCalculator methods that are timed
+OPERATIONS = ('add_category', 'add_assignment', 'remove_category', 'calculate_total_grade', '__str__')
+
+# One timed call, as sent to the sinks. seconds is the latency, error is whether the call raised
+Event = namedtuple('Event', ['operation', 'seconds', 'categories', 'assignments', 'error'])
+
+class OperationStats:
+    '''Running totals of the calls of one operation'''
+
+    __slots__ = ('count', 'errors', 'total', 'max', 'categories', 'assignments')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.categories = 0
+        self.assignments = 0
+
+    def add(self, event: Event) -> None:
+        self.count += 1
+        self.errors += event.error
+        self.total += event.seconds
+        if event.seconds > self.max:
+            self.max = event.seconds
+        self.categories += event.categories
+        self.assignments += event.assignments
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class MemorySink:
+    '''Keeps the latest events in memory, all of them if maxlen is None'''
+
+    def __init__(self, maxlen: int = 10000):
+        self.events = deque(maxlen=maxlen)
+
+    def record(self, event: Event) -> None:
+        self.events.append(event)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesSink:
+    '''
+    Writes every event as one line of JSON to a file, given a path or an open text file.
+    Lines are buffered and written every flush_every events, and on flush and close.
+    '''
+
+    def __init__(self, file, flush_every: int = 256):
+        self._owns_file = isinstance(file, str)
+        self.file = open(file, 'a') if self._owns_file else file
+        self.flush_every = flush_every
+        self._lines = []
+
+    def record(self, event: Event) -> None:
+        self._lines.append(json.dumps(event._asdict()))
+        if len(self._lines) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self.file.write('\n'.join(self._lines) + '\n')
+            self._lines = []
+        self.file.flush()
+
+    def close(self) -> None:
+        self.flush()
+        if self._owns_file:
+            self.file.close()
+
+
+class Instrumentation:
+    '''The per-operation statistics of an instrumented calculator, and the sinks every event is sent to'''
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+        self.operations = {k: OperationStats() for k in OPERATIONS}
+
+    def record(self, operation: str, seconds: float, categories: int, assignments: int, error: bool = False) -> None:
+        event = Event(operation, seconds, categories, assignments, error)
+        self.operations[operation].add(event)
+        for sink in self.sinks:
+            sink.record(event)
+
+    def stats(self) -> dict:
+        '''Returns a dict of each operation name to its OperationStats'''
+        return self.operations
+
+    def reset(self) -> None:
+        '''Zeroes the statistics, the events already sent to the sinks are kept'''
+        self.operations = {k: OperationStats() for k in OPERATIONS}
+
+    def report(self) -> str:
+        '''Returns a table of the statistics, one line per operation, with latencies in microseconds'''
+        lines = [f'{"operation":<22} {"calls":>7} {"errors":>6} {"mean us":>9} {"max us":>9} {"total ms":>9} {"categories":>10} {"assignments":>11}']
+        for name, stats in self.operations.items():
+            lines.append(f'{name:<22} {stats.count:>7} {stats.errors:>6} {stats.mean * 1e6:>9.1f} {stats.max * 1e6:>9.1f} {stats.total * 1e3:>9.2f} {stats.categories:>10} {stats.assignments:>11}')
+        return '\n'.join(lines)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+class InstrumentedCalculator:
+    '''
+    Mixin placed in front of the class of an instrumented calculator, timing each method of OPERATIONS.
+    Categories and assignments touched are counted as:
+        add_category            the new category
+        add_assignment          its category and the new assignment
+        remove_category         the category and every assignment it held
+        calculate_total_grade   the categories whose grades were recalculated rather than read from the cache
+        __str__                 every category and assignment
+    '''
+
+    def add_category(self, category_name, percentage_of_grade, policy=None):
+        start = time.perf_counter()
+        try:
+            super().add_category(category_name, percentage_of_grade, policy)
+        except BaseException:
+            self.instrumentation.record('add_category', time.perf_counter() - start, 0, 0, True)
+            raise
+        self.instrumentation.record('add_category', time.perf_counter() - start, 1, 0)
+
+    def add_assignment(self, category_name, assignment_name, score):
+        start = time.perf_counter()
+        try:
+            super().add_assignment(category_name, assignment_name, score)
+        except BaseException:
+            self.instrumentation.record('add_assignment', time.perf_counter() - start, 0, 0, True)
+            raise
+        self.instrumentation.record('add_assignment', time.perf_counter() - start, 1, 1)
+
+    def remove_category(self, category_name):
+        category = self._categories.get(category_name)
+        start = time.perf_counter()
+        try:
+            super().remove_category(category_name)
+        except BaseException:
+            self.instrumentation.record('remove_category', time.perf_counter() - start, 0, 0, True)
+            raise
+        self.instrumentation.record('remove_category', time.perf_counter() - start, 1, len(category))
+
+    def calculate_total_grade(self):
+        cached = len(self._grade_cache)
+        start = time.perf_counter()
+        try:
+            total_grade = super().calculate_total_grade()
+        except BaseException:
+            self.instrumentation.record('calculate_total_grade', time.perf_counter() - start, len(self._grade_cache) - cached, 0, True)
+            raise
+        self.instrumentation.record('calculate_total_grade', time.perf_counter() - start, len(self._grade_cache) - cached, 0)
+        return total_grade
+
+    def __str__(self):
+        start = time.perf_counter()
+        string = super().__str__()
+        self.instrumentation.record('__str__', time.perf_counter() - start, len(self._categories), sum([len(v) for v in self._categories.values()]))
+        return string
+
+
+# Instrumented subclass of each calculator class, created on first use
+_instrumented_classes = {}
+
+def instrument(calculator, *sinks) -> Instrumentation:
+    '''
+    Starts timing the operations of calculator, sending every call to each sink, and returns its Instrumentation.
+    A sink is any object with record(event), flush() and close() methods, such as MemorySink or JsonLinesSink.
+    If calculator is already instrumented, the sinks are added to its Instrumentation.
+    '''
+    if isinstance(calculator, InstrumentedCalculator):
+        calculator.instrumentation.sinks.extend(sinks)
+        return calculator.instrumentation
+
+    cls = type(calculator)
+    if cls not in _instrumented_classes:
+        _instrumented_classes[cls] = type(f'Instrumented{cls.__name__}', (InstrumentedCalculator, cls), {})
+    calculator.instrumentation = Instrumentation(*sinks)
+    calculator.__class__ = _instrumented_classes[cls]
+    return calculator.instrumentation
+
+def uninstrument(calculator) -> Instrumentation:
+    '''
+    Stops timing the operations of calculator, flushing its sinks, and returns its Instrumentation, or None if it was not instrumented.
+    The sinks are not closed, so they can still be read or shared.
+    '''
+    if not isinstance(calculator, InstrumentedCalculator):
+        return None
+    instrumentation = calculator.instrumentation
+    instrumentation.flush()
+    calculator.__class__ = type(calculator).__mro__[2]
+    del calculator.instrumentation
+    return instrumentation
@@ -0,0 +1,251 @@
+'''
+Journal Module for Grade Calculator
+An append-only write-ahead journal of GradeCalculator mutations, with replay on startup and compaction into snapshots
+
+Files, for a journal at PATH:
+    PATH               the active segment, whose first record is its generation number and the numeric mode of the calculator
+    PATH.N             a sealed segment of generation N, waiting to be folded into a snapshot
+    PATH.G.snapshot    a snapshot of the state before generation G
+Recovery loads the newest snapshot G, then replays every segment of generation G or later in order,
+so a crash at any point of a compaction never loses or repeats a record.
+'''
+
+import glob
+import json
+import os
+import threading
+from grade_calculator import GradeCalculator
+from grade_policies import policy_from_spec
+from snapshot import Snapshot, write_snapshot
+
+# Short record codes for every journaled GradeCalculator method
+RECORD_CODES = {
+    'add_category': 'c',
+    'remove_category': 'x',
+    'rename_category': 'n',
+    'add_assignment': 'a',
+    'update_assignment': 'u',
+    'remove_assignment': 'd',
+}
+GENERATION = 'g'
+
+class Journal:
+
+    def __init__(self, path: str, fsync_every: int = 64, compact_bytes: int = 1 << 20):
+        '''
+        Creates a journal at path, which is not opened until recover is called.
+        Records are buffered and the file is flushed and fsynced once every fsync_every records, and by flush and close.
+        Once the active segment grows past compact_bytes, it is folded into a snapshot in a background thread.
+        '''
+        self.path = path
+        self.fsync_every = fsync_every
+        self.compact_bytes = compact_bytes
+        self.calculator = None
+        self._file = None
+        self._generation = 0
+        self._unsynced = 0
+        self._compaction = None
+
+    def recover(self, check_consistency: bool = False, numeric: str = None) -> GradeCalculator:
+        '''
+        Rebuilds the calculator from the newest snapshot and the journal segments after it, and attaches this journal to it.
+        The calculator uses the given numeric mode of GradeCalculator, by default the mode it was saved in, or float for a new journal.
+        A torn record at the end of the active segment, left by a crash mid-write, is dropped.
+        '''
+        snapshots = self._snapshot_generations()
+        generation = max(snapshots, default=0)
+        sealed = [self._sealed_path(k) for k in self._sealed_generations() if k >= generation]
+        segments = sealed + [self.path] if os.path.exists(self.path) else sealed
+
+        if generation:
+            with Snapshot(self._snapshot_path(generation)) as snapshot:
+                calculator = snapshot.load(numeric=numeric)
+        else:
+            if numeric is None:
+                numeric = self._saved_numeric(segments[0]) if segments else 'float'
+            calculator = GradeCalculator(numeric=numeric)
+        calculator.check_consistency = check_consistency
+
+        for path in sealed:
+            self._replay(path, calculator)
+        if os.path.exists(self.path):
+            # Seal the old active segment rather than appending to it, since it may end with a torn record
+            active_generation = self._replay(self.path, calculator)
+            os.replace(self.path, self._sealed_path(active_generation))
+
+        self._open_segment(max([generation] + self._sealed_generations()) + 1, calculator.numeric)
+        self.attach(calculator)
+        self._remove_obsolete_files()
+        return calculator
+
+    def attach(self, calculator: GradeCalculator) -> None:
+        '''
+        Makes calculator the one this journal logs and compacts.
+        If the journal has not been opened by recover, or has been closed, raises ValueError.
+        '''
+        if self._file is None or self._file.closed:
+            raise ValueError(f'Journal.attach: Journal {self.path} must be opened with recover before a calculator is attached')
+        if self.calculator is not None:
+            self.calculator.journal = None
+        self.calculator = calculator
+        calculator.journal = self
+
+    def log(self, op: str, *args) -> None:
+        '''Appends one record for a GradeCalculator mutation'''
+        self.log_many(op, [args])
+
+    def log_many(self, op: str, records: list) -> None:
+        '''
+        Appends one record per tuple of arguments in records, all for one GradeCalculator mutation.
+        Compaction only starts once every record of the mutation is written, so a snapshot never holds
+        changes whose records are still to be logged to the next segment.
+        '''
+        code = RECORD_CODES[op]
+        self._file.write(''.join([json.dumps([code, *args], separators=(',', ':')) + '\n' for args in records]))
+        self._unsynced += len(records)
+        if self._unsynced >= self.fsync_every:
+            self.flush()
+            if self._file.tell() >= self.compact_bytes:
+                self.compact()
+
+    def flush(self) -> None:
+        '''Writes buffered records to disk and fsyncs the active segment'''
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def compact(self, background: bool = True) -> None:
+        '''
+        Seals the active segment and starts a new one, then writes a snapshot of the current state,
+        in a background thread unless background is False. Sealed segments and older snapshots are deleted once the snapshot is written.
+        Does nothing if a compaction is already running.
+        '''
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+
+        # Seal the active segment, and copy the state it leads to before any new record is logged
+        self.flush()
+        self._file.close()
+        os.replace(self.path, self._sealed_path(self._generation))
+        generation = self._generation + 1
+        self._open_segment(generation, self.calculator.numeric)
+
+        # A fork shares the categories, so only the ones changed while the snapshot is written get copied
+        state = self.calculator.fork()
+
+        self._compaction = threading.Thread(target=self._write_compacted_snapshot, args=(state, generation), daemon=True)
+        self._compaction.start()
+        if not background:
+            self._compaction.join()
+
+    def reset(self, calculator: GradeCalculator) -> None:
+        '''Deletes every segment and snapshot, and starts an empty journal for a calculator that has been reset'''
+        self.wait_for_compaction()
+        self._file.close()
+        os.remove(self.path)
+        for k in self._snapshot_generations():
+            os.remove(self._snapshot_path(k))
+        for k in self._sealed_generations():
+            os.remove(self._sealed_path(k))
+        self._open_segment(self._generation + 1, calculator.numeric)
+        self.attach(calculator)
+
+    def wait_for_compaction(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+
+    def close(self) -> None:
+        '''Flushes the journal, waits for a running compaction and closes the active segment'''
+        if self._file is not None and not self._file.closed:
+            self.flush()
+            self._file.close()
+        self.wait_for_compaction()
+        if self.calculator is not None:
+            self.calculator.journal = None
+
+    def _open_segment(self, generation: int, numeric: str) -> None:
+        self._generation = generation
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(json.dumps([GENERATION, generation, numeric], separators=(',', ':')) + '\n')
+        self.flush()
+
+    @staticmethod
+    def _saved_numeric(path: str) -> str:
+        '''Returns the numeric mode in the generation record of a segment, float for segments written without one'''
+        with open(path, encoding='utf-8') as file:
+            try:
+                code, *args = json.loads(file.readline())
+            except ValueError:
+                return 'float'
+        return args[1] if code == GENERATION and len(args) > 1 else 'float'
+
+    def _replay(self, path: str, calculator: GradeCalculator) -> int:
+        '''Applies every record of a segment to the calculator and returns the generation of the segment'''
+        generation = 0
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    code, *args = json.loads(line)
+                except ValueError:
+                    # Only the last record can be torn by a crash
+                    break
+                if code == GENERATION:
+                    generation = args[0]
+                elif code == 'c':
+                    calculator.add_category(args[0], repr(args[1]), policy_from_spec(args[2]) if len(args) > 2 else None)
+                elif code == 'x':
+                    calculator.remove_category(*args)
+                elif code == 'n':
+                    calculator.rename_category(*args)
+                elif code == 'a':
+                    errors = calculator.add_assignments([(args[0], args[1], (args[2], args[3]))])
+                    if errors:
+                        raise ValueError(f'Journal: Record {line.strip()} of {path} could not be replayed: {errors[0].message}')
+                elif code == 'u':
+                    calculator.update_assignment(args[0], args[1], f'{args[2]!r}/{args[3]!r}')
+                elif code == 'd':
+                    calculator.remove_assignment(*args)
+        return generation
+
+    def _write_compacted_snapshot(self, state: GradeCalculator, generation: int) -> None:
+        temporary_path = self._snapshot_path(generation) + '.tmp'
+        write_snapshot(temporary_path, state)
+        with open(temporary_path, 'rb') as file:
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self._snapshot_path(generation))
+        self._remove_obsolete_files()
+
+    def _remove_obsolete_files(self) -> None:
+        '''Deletes the snapshots and sealed segments that are older than the newest snapshot'''
+        newest_snapshot = max(self._snapshot_generations(), default=0)
+        for k in self._snapshot_generations():
+            if k < newest_snapshot:
+                os.remove(self._snapshot_path(k))
+        for k in self._sealed_generations():
+            if k < newest_snapshot:
+                os.remove(self._sealed_path(k))
+
+    def _snapshot_path(self, generation: int) -> str:
+        return f'{self.path}.{generation}.snapshot'
+
+    def _sealed_path(self, generation: int) -> str:
+        return f'{self.path}.{generation}'
+
+    def _snapshot_generations(self) -> list:
+        return self._generations('.snapshot')
+
+    def _sealed_generations(self) -> list:
+        return self._generations('')
+
+    def _generations(self, suffix: str) -> list:
+        '''Returns the sorted generation numbers N of the files named PATH.N followed by suffix'''
+        generations = []
+        for name in glob.glob(glob.escape(self.path) + '.*' + suffix):
+            number = name[len(self.path) + 1:len(name) - len(suffix)]
+            if number.isdigit():
+                generations.append(int(number))
+        return sorted(generations)
+
+def open_journaled_calculator(path: str, **kwargs) -> GradeCalculator:
+    '''Recovers a GradeCalculator from the journal at path, with the journal attached so later mutations are logged'''
+    return Journal(path, **kwargs).recover()
@@ -0,0 +1,176 @@
+'''
+Roster Module for Grade Calculator
+Grades a whole roster of students against one shared category scheme using NumPy
+'''
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError('roster.py requires NumPy, install it with "pip install numpy"')
+
+from grade_calculator import GradeCalculator
+
+class RosterGrader:
+
+    def __init__(self, categories: dict, assignments: dict, student_ids: list):
+        '''
+        Creates a roster sharing one category scheme across every student.
+        categories maps each category name to its percentage of the grade, assignments maps each category name to its assignment names.
+        Scores are stored as dense float64 arrays (students x assignments), with NaN marking assignments a student has not completed.
+        Ratios are summed in column order, the order of assignments, so grades equal GradeCalculator's for a student who added them in that order.
+        If a category in assignments is not in categories, raises KeyError.
+        If the category percentages add up to more than 100, raises ValueError.
+        If a student id is repeated, raises KeyError.
+        '''
+        for category_name in assignments:
+            if category_name not in categories:
+                raise KeyError(f'RosterGrader: Category "{category_name}" not a valid category.')
+
+        self.category_names = list(categories)
+        self.percentages = np.array([float(categories[k]) for k in self.category_names], dtype=np.float64)
+        # Summed one category at a time, in the order GradeCalculator adds up its running total percentage
+        self.total_percentage = 0.0
+        for percentage in self.percentages:
+            self.total_percentage += float(percentage)
+        if self.total_percentage > 100:
+            raise ValueError(f'RosterGrader: Category percentages add up to {self.total_percentage}%, which exceeds the possible 100%')
+
+        # Columns are grouped by category so each category is one contiguous slice of the score arrays
+        self.columns = {}
+        self._category_starts = []
+        for category_name in self.category_names:
+            self._category_starts.append(len(self.columns))
+            for assignment_name in assignments.get(category_name, ()):
+                self.columns[(category_name, assignment_name)] = len(self.columns)
+        self._category_starts = np.array(self._category_starts, dtype=np.intp)
+
+        self.student_ids = list(student_ids)
+        self.rows = {}
+        for row, student_id in enumerate(self.student_ids):
+            if student_id in self.rows:
+                raise KeyError(f'RosterGrader: Student {student_id} has already been added')
+            self.rows[student_id] = row
+
+        shape = (len(self.student_ids), len(self.columns))
+        self.earned = np.full(shape, np.nan, dtype=np.float64)
+        self.possible = np.full(shape, np.nan, dtype=np.float64)
+
+    @classmethod
+    def from_calculators(cls, calculators: dict) -> 'RosterGrader':
+        '''
+        Builds a roster from a dict of student ids to GradeCalculator objects.
+        Every calculator must use the same category names and percentages, assignments may differ per student.
+        The columns of a category follow the union of its assignment names, in the order they are first seen across the students, not each student's own insertion order.
+        So a student whose assignments were added in another order, or were updated or removed, can differ from calculate_total_grade in the last bits.
+        If the category schemes differ, or a category has an aggregation policy, raises ValueError.
+        '''
+        categories = None
+        assignments = {}
+        for student_id, calculator in calculators.items():
+            scheme = {k: v[GradeCalculator.PERCENTAGE_OF_GRADE] for k, v in calculator.categories.items()}
+            for category_name in scheme:
+                if calculator.category_policy(category_name) is not None:
+                    raise ValueError(f'RosterGrader.from_calculators: Category {category_name} of student {student_id} has an aggregation policy, which the roster does not support')
+            if categories is None:
+                categories = scheme
+                assignments = {k: {} for k in scheme}
+            elif scheme != categories:
+                raise ValueError(f'RosterGrader.from_calculators: Student {student_id} does not share the category scheme of the roster')
+
+            for category_name, v in calculator.categories.items():
+                assignments[category_name].update(dict.fromkeys(v[GradeCalculator.ASSIGNMENTS]))
+
+        roster = cls(categories or {}, assignments, list(calculators))
+        for row, calculator in enumerate(calculators.values()):
+            for category_name, v in calculator.categories.items():
+                for assignment_name, score in v[GradeCalculator.ASSIGNMENTS].items():
+                    column = roster.columns[(category_name, assignment_name)]
+                    roster.earned[row, column] = score[0]
+                    roster.possible[row, column] = score[1]
+        return roster
+
+    def set_score(self, student_id, category_name: str, assignment_name: str, earned_score: float, possible_score: float) -> None:
+        '''
+        Sets the score of one assignment for one student.
+        If the student or the assignment is not part of the roster, raises KeyError.
+        If the possible score is 0, raises AssertionError.
+        '''
+        if student_id not in self.rows:
+            raise KeyError(f'RosterGrader.set_score: Student {student_id} not a valid student.')
+        if (category_name, assignment_name) not in self.columns:
+            raise KeyError(f'RosterGrader.set_score: Assignment {assignment_name} of category "{category_name}" not a valid assignment.')
+        assert possible_score != 0, 'RosterGrader.set_score: Given possible score must not be 0'
+
+        row = self.rows[student_id]
+        column = self.columns[(category_name, assignment_name)]
+        self.earned[row, column] = earned_score
+        self.possible[row, column] = possible_score
+
+    def category_grades(self) -> np.ndarray:
+        '''
+        Calculates the grade of every category for every student, as a (students x categories) array.
+        A student with no assignments in a category gets NaN for that category.
+        '''
+        ratio_sums, counts = self._category_totals()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (ratio_sums / counts) * self.percentages
+
+    def _category_totals(self) -> tuple:
+        '''Returns the (students x categories) arrays of earned/possible ratio sums and completed assignment counts'''
+        shape = (len(self.student_ids), len(self.category_names))
+        if len(self.columns) == 0:
+            return np.zeros(shape), np.zeros(shape, dtype=np.intp)
+
+        completed = ~np.isnan(self.possible)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratios = np.where(completed, self.earned / self.possible, 0.0)
+
+        # Columns are added one at a time, vectorized across students, so every ratio sum is rounded the way
+        # Category.add rounds its running sum. A pairwise sum such as reduceat can differ in the last bit
+        ratios = np.ascontiguousarray(ratios.T)
+        completed = np.ascontiguousarray(completed.T)
+        ratio_sums = np.zeros(shape)
+        counts = np.zeros(shape, dtype=np.intp)
+        ends = np.append(self._category_starts[1:], len(self.columns))
+        for k, (start, end) in enumerate(zip(self._category_starts, ends)):
+            for column in range(start, end):
+                ratio_sums[:, k] += ratios[column]
+                counts[:, k] += completed[column]
+        return ratio_sums, counts
+
+    def total_grades(self) -> np.ndarray:
+        '''
+        Calculates the total grade of every student, matching GradeCalculator.calculate_total_grade.
+        A student with an empty category gets NaN instead of raising ZeroDivisionError.
+        '''
+        # Category grades are added in category order, as calculate_total_grade does
+        total_grade_points = np.zeros(len(self.student_ids))
+        for category_grade in self.category_grades().T:
+            total_grade_points += category_grade
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return total_grade_points / self.total_percentage
+
+    def required_ratios(self, target_grade: float, future_assignments: list, lower_bound: float = 0) -> np.ndarray:
+        '''
+        Vectorized GradeCalculator.required_scores for every student of the roster at once.
+        future_assignments is a list of (category name, possible score) pairs shared by every student.
+        Returns the earned/possible ratio each student needs on every future assignment, multiply by a possible score to get the earned score.
+        A student who would still have an empty category gets NaN.
+        If future_assignments is empty, raises AssertionError.
+        If a future assignment's category is not valid, raises KeyError.
+        '''
+        assert len(future_assignments) > 0, 'RosterGrader.required_ratios: At least one future assignment must be given'
+
+        future_counts = np.zeros(len(self.category_names), dtype=np.intp)
+        for category_name, _ in future_assignments:
+            if category_name not in self.category_names:
+                raise KeyError(f'RosterGrader.required_ratios: Category "{category_name}" not a valid category.')
+            future_counts[self.category_names.index(category_name)] += 1
+
+        ratio_sums, counts = self._category_totals()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            assignment_counts = np.where(counts + future_counts > 0, counts + future_counts, np.nan)
+            earned_points = (ratio_sums / assignment_counts * self.percentages).sum(axis=1)
+            points_per_ratio = (future_counts / assignment_counts * self.percentages).sum(axis=1)
+            ratios = (target_grade * self.total_percentage - earned_points) / points_per_ratio
+        return np.where(np.isnan(ratios), ratios, np.maximum(ratios, lower_bound))
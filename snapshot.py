@@ -0,0 +1,296 @@
+'''
+Snapshot Module for Grade Calculator
+Saves one GradeCalculator or a whole roster to a compact binary file, and reads it back through mmap
+
+File layout (little-endian):
+    header          magic, version, student count, student table offset, string table offset
+    score data      per category: earned scores then possible scores as float64, then assignment name indices as uint32
+    category table  per category: name index, assignment count, percentage, ratio sum, names offset, scores offset,
+                    and since version 2 the index of the JSON aggregation policy spec, or NO_POLICY
+    student table   per student: id index, category count, category table offset,
+                    and since version 3 the index of the numeric mode of its GradeCalculator
+    string table    string count, uint32 end offsets, then the UTF-8 bytes of every distinct string
+'''
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from grade_calculator import GradeCalculator
+from grade_policies import policy_from_spec
+
+MAGIC = b'GRADECS\x00'
+VERSION = 3
+
+HEADER = struct.Struct('<8sIIQQ')
+
+# Category records of each version that can be read, version 1 having no policy
+CATEGORY_RECORDS = {
+    1: struct.Struct('<IIddQQ'),
+    2: struct.Struct('<IIddQQI'),
+}
+CATEGORY_RECORDS[3] = CATEGORY_RECORDS[2]
+CATEGORY_RECORD = CATEGORY_RECORDS[VERSION]
+
+# Student records of each version that can be read, versions before 3 having no numeric mode
+STUDENT_RECORDS = {
+    1: struct.Struct('<IIQ'),
+    2: struct.Struct('<IIQ'),
+    3: struct.Struct('<IIQI'),
+}
+STUDENT_RECORD = STUDENT_RECORDS[VERSION]
+
+# Policy index of a category without an aggregation policy
+NO_POLICY = 0xFFFFFFFF
+
+# Student id used when a single GradeCalculator is saved
+DEFAULT_STUDENT = ''
+
+def write_snapshot(path: str, calculators) -> None:
+    '''
+    Writes a snapshot of a GradeCalculator, or of a dict of student ids to GradeCalculator objects.
+    Every distinct category name, assignment name and student id is stored once in the string table.
+    '''
+    if isinstance(calculators, GradeCalculator):
+        calculators = {DEFAULT_STUDENT: calculators}
+
+    strings = {}
+    def string_index(value: str) -> int:
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    with open(path, 'wb') as file:
+        file.write(b'\x00' * HEADER.size)
+
+        # Score data, keeping every float64 array 8-byte aligned
+        category_tables = []
+        for student_id, calculator in calculators.items():
+            records = []
+            for category_name, category in calculator._categories.items():
+                earned, possible = category.scores()
+                scores_offset = file.tell()
+                _write_array(file, earned)
+                _write_array(file, possible)
+                names_offset = file.tell()
+                _write_array(file, array('I', [string_index(k) for k in category.indices]))
+                file.write(b'\x00' * (-file.tell() % 8))
+                policy_index = NO_POLICY if category.policy is None else string_index(json.dumps(category.policy.spec()))
+                records.append(CATEGORY_RECORD.pack(string_index(category_name), len(category), category.percentage, float(category.ratio_total()), names_offset, scores_offset, policy_index))
+            category_tables.append((string_index(str(student_id)), records, string_index(calculator.numeric)))
+
+        student_records = []
+        for student_index, records, numeric_index in category_tables:
+            student_records.append(STUDENT_RECORD.pack(student_index, len(records), file.tell(), numeric_index))
+            file.write(b''.join(records))
+
+        student_table_offset = file.tell()
+        file.write(b''.join(student_records))
+
+        string_table_offset = file.tell()
+        encoded = [k.encode('utf-8') for k in strings]
+        ends = array('I')
+        end = 0
+        for value in encoded:
+            end += len(value)
+            ends.append(end)
+        file.write(struct.pack('<I', len(encoded)))
+        _write_array(file, ends)
+        file.write(b''.join(encoded))
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, len(category_tables), student_table_offset, string_table_offset))
+
+def _write_array(file, values: array) -> None:
+    '''Writes an array in little-endian byte order'''
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    values.tofile(file)
+
+
+class Snapshot:
+
+    def __init__(self, path: str):
+        '''
+        Opens a snapshot file with mmap. Only the header, student table and string table are read up front,
+        category tables and scores are read from the mapping when a student is asked for.
+        If the file is not a snapshot, is truncated, or was written by a version that cannot be read, raises ValueError.
+        '''
+        self._string_ends = None
+        self._mmap = None
+        self._buffer = None
+        self._file = open(path, 'rb')
+        try:
+            self._read_tables(path)
+        except (struct.error, IndexError, TypeError):
+            # Offsets or indices past the end of the file
+            self.close()
+            raise ValueError(f'Snapshot: {path} is truncated or corrupt')
+        except BaseException:
+            self.close()
+            raise
+
+    def _read_tables(self, path: str) -> None:
+        '''Maps the file and reads the header, student table and string table'''
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            raise ValueError(f'Snapshot: {path} is not a grade calculator snapshot')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+
+        magic, version, student_count, student_table_offset, string_table_offset = HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f'Snapshot: {path} is not a grade calculator snapshot')
+        if version not in CATEGORY_RECORDS:
+            raise ValueError(f'Snapshot: {path} has version {version}, expected a version up to {VERSION}')
+        self._category_record = CATEGORY_RECORDS[version]
+        student_record = STUDENT_RECORDS[version]
+
+        # String table
+        string_count, = struct.unpack_from('<I', self._buffer, string_table_offset)
+        if string_table_offset + 4 + 4 * string_count > len(self._buffer):
+            raise struct.error('string table past the end of the file')
+        self._string_ends = self._array('I', string_table_offset + 4, string_count)
+        self._strings_offset = string_table_offset + 4 + 4 * string_count
+        self._string_cache = {}
+        if string_count and self._strings_offset + self._string_ends[-1] > len(self._buffer):
+            raise struct.error('strings past the end of the file')
+
+        # Student table, students of versions before 3 being in float mode
+        self._students = {}
+        for i in range(student_count):
+            student_index, category_count, categories_offset, *numeric_index = student_record.unpack_from(self._buffer, student_table_offset + i * student_record.size)
+            numeric = self._string(numeric_index[0]) if numeric_index else 'float'
+            self._students[self._string(student_index)] = (category_count, categories_offset, numeric)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._students)
+
+    def __contains__(self, student_id):
+        return student_id in self._students
+
+    @property
+    def student_ids(self) -> list:
+        '''Returns the student ids of the snapshot, in the order they were written'''
+        return list(self._students)
+
+    def numeric(self, student_id=DEFAULT_STUDENT) -> str:
+        '''
+        Returns the numeric mode of the GradeCalculator one student was saved from.
+        If the student is not in the snapshot, raises KeyError.
+        '''
+        if student_id not in self._students:
+            raise KeyError(f'Snapshot: Student {student_id} not a valid student.')
+        return self._students[student_id][2]
+
+    def close(self) -> None:
+        '''Releases the mapping and closes the file'''
+        if self._string_ends is not None:
+            self._string_ends.release()
+            self._string_ends = None
+        if self._buffer is not None:
+            self._buffer.release()
+            self._buffer = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def total_grade(self, student_id=DEFAULT_STUDENT) -> float or int:
+        '''
+        Calculates the total grade of one student from the stored running totals, without reading any scores.
+        A student with an aggregation policy on any category, or saved in a numeric mode other than float, is loaded instead,
+        since policies need the scores and the stored running totals are floats.
+        Matches GradeCalculator.calculate_total_grade, including raising ZeroDivisionError for empty categories.
+        '''
+        records = self._category_records(student_id)
+        if self.numeric(student_id) != 'float' or any(policy_index != NO_POLICY for *_, policy_index in records):
+            return self.load(student_id).calculate_total_grade()
+
+        total_grade_points = 0
+        total_percentage = 0
+        for _, assignment_count, percentage, ratio_sum, _, _, _ in records:
+            total_grade_points += (ratio_sum / assignment_count) * percentage
+            total_percentage += percentage
+        return total_grade_points/total_percentage
+
+    def category_scores(self, student_id, category_name: str) -> tuple:
+        '''
+        Returns the (earned scores, possible scores) of one category as float64 memoryviews into the mapping, without copying.
+        The views must be released before the snapshot is closed.
+        If the student or category is not in the snapshot, raises KeyError.
+        '''
+        for name_index, assignment_count, _, _, _, scores_offset, _ in self._category_records(student_id):
+            if self._string(name_index) == category_name:
+                return self._array('d', scores_offset, assignment_count), self._array('d', scores_offset + 8 * assignment_count, assignment_count)
+        raise KeyError(f'Snapshot.category_scores: Category "{category_name}" not a valid category.')
+
+    def load(self, student_id=DEFAULT_STUDENT, numeric: str = None) -> GradeCalculator:
+        '''
+        Builds a GradeCalculator from one student of the snapshot, in the given numeric mode, by default the one it was saved in.
+        The stored running sums are floats, so the other modes recompute theirs from the scores.
+        '''
+        if numeric is None:
+            numeric = self.numeric(student_id)
+        calculator = GradeCalculator(numeric=numeric)
+        for name_index, assignment_count, percentage, ratio_sum, names_offset, scores_offset, policy_index in self._category_records(student_id):
+            category_name = self._string(name_index)
+            policy = None if policy_index == NO_POLICY else policy_from_spec(json.loads(self._string(policy_index)))
+            calculator.add_category(category_name, repr(percentage), policy)
+            name_indices = self._array('I', names_offset, assignment_count)
+            names = [self._string(i) for i in name_indices]
+            name_indices.release()
+            earned = self._array('d', scores_offset, assignment_count)
+            possible = self._array('d', scores_offset + 8 * assignment_count, assignment_count)
+            calculator._extend_category(category_name, names, earned.tolist(), possible.tolist())
+            earned.release()
+            possible.release()
+
+            # Keep the stored running sum of a category that was edited, so its grade matches the original bit for bit
+            category = calculator._categories[category_name]
+            if numeric == 'float' and category.ratio_sum != ratio_sum:
+                category.ratio_sum = ratio_sum
+                category.exact = False
+        return calculator
+
+    def _category_records(self, student_id) -> list:
+        '''Returns the unpacked category records of one student, with NO_POLICY added to records of version 1'''
+        if student_id not in self._students:
+            raise KeyError(f'Snapshot: Student {student_id} not a valid student.')
+        category_count, categories_offset, _ = self._students[student_id]
+        record = self._category_record
+        records = [record.unpack_from(self._buffer, categories_offset + i * record.size) for i in range(category_count)]
+        if record is not CATEGORY_RECORD:
+            records = [k + (NO_POLICY,) for k in records]
+        return records
+
+    def _array(self, typecode: str, offset: int, length: int):
+        '''Returns a typed view of part of the mapping, or a byte-swapped copy on big-endian machines'''
+        itemsize = struct.calcsize(typecode)
+        view = self._buffer[offset:offset + itemsize * length].cast(typecode)
+        if sys.byteorder != 'little':
+            values = array(typecode, view)
+            view.release()
+            values.byteswap()
+            return memoryview(values)
+        return view
+
+    def _string(self, index: int) -> str:
+        '''Decodes one string of the string table'''
+        if index not in self._string_cache:
+            start = self._string_ends[index - 1] if index > 0 else 0
+            self._string_cache[index] = self._mmap[self._strings_offset + start:self._strings_offset + self._string_ends[index]].decode('utf-8')
+        return self._string_cache[index]
+
+def load_snapshot(path: str, student_id=DEFAULT_STUDENT, numeric: str = None) -> GradeCalculator:
+    '''Loads one GradeCalculator from a snapshot file, by default in the numeric mode it was saved in'''
+    with Snapshot(path) as snapshot:
+        return snapshot.load(student_id, numeric)
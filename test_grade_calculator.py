@@ -5,7 +5,9 @@ Created: 3/15/19
 '''
 
 import unittest
+from fractions import Fraction
 from grade_calculator import GradeCalculator
+from grade_policies import DropLowest
 
 class Test_Calculator(unittest.TestCase):
     def setUp(self):
@@ -67,4 +69,275 @@ class Test_Calculator(unittest.TestCase):
         self.assertEqual(self.calculator.categories, {'Homework': (20, {})})
         self.calculator.remove_category('Homework')
         self.assertEqual(self.calculator.categories, {})
-        
+
+    def test_running_totals_match_full_recompute(self):
+        calculator = GradeCalculator(check_consistency=True)
+        calculator.add_category('Homework', '20')
+        calculator.add_category('Tests', '80')
+        for i in range(50):
+            calculator.add_assignment('Homework', f'Homework #{i}', f'{i % 20}/20')
+            calculator.add_assignment('Tests', f'Test #{i}', f'{(i * 7) % 100}/100')
+        calculator.remove_category('Homework')
+        calculator.add_category('Quizzes', '20')
+        calculator.add_assignment('Quizzes', 'Quiz #1', '9/10')
+        self.assertEqual(calculator._calculate_total_possible_grade(), 100)
+        calculator.calculate_total_grade()
+
+    def test_running_totals_detect_out_of_sync_state(self):
+        calculator = GradeCalculator(check_consistency=True)
+        calculator.add_category('Homework', '20')
+        calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        calculator._categories['Homework'].ratio_sum += 1
+        self.assertRaises(AssertionError, calculator.calculate_total_grade)
+
+    def test_add_assignment_zero_possible_score(self):
+        self.calculator.add_category('Homework', '20')
+        self.assertRaises(AssertionError, self.calculator.add_assignment, 'Homework', 'Homework #1', '15/0')
+        self.assertEqual(self.calculator.categories, {'Homework': (20, {})})
+
+    def test_categories_view_is_read_only(self):
+        self.calculator.add_category('Homework', '20')
+        self.calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        self.calculator.categories['Homework'][GradeCalculator.ASSIGNMENTS]['Homework #2'] = (20, 20)
+        self.assertEqual(self.calculator.categories, {'Homework': (20, {'Homework #1': (15, 20)})})
+
+    def test_str(self):
+        self.calculator.add_category('Homework', '20')
+        self.calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        self.calculator.add_assignment('Homework', 'Homework #2', '20/20')
+        self.calculator.add_category('Tests', '70')
+        self.calculator.add_assignment('Tests', 'Test #1', '97/100')
+        self.calculator.add_category('Quizzes', '10')
+        self.assertEqual(str(self.calculator), 'Homework(20.0%): Homework #1: 15.0/20.0, Homework #2: 20.0/20.0\nTests(70.0%): Test #1: 97.0/100.0\nQuizzes(10.0%):\n')
+
+    def test_add_assignments(self):
+        self.calculator.add_category('Homework', '20')
+        self.calculator.add_category('Tests', '80')
+        errors = self.calculator.add_assignments([
+            ('Homework', 'Homework #1', '15/20'),
+            ('Tests', 'Test #1', (97, 100)),
+            ('Quizzes', 'Quiz #1', '9/10'),
+            ('Homework', 'Homework #1', '18/20'),
+            ('Homework', 'Homework #2', '20'),
+            ('Tests', 'Test #2', '87/100'),
+        ], batch_size=2)
+        self.assertEqual([e.row_number for e in errors], [3, 4, 5])
+        self.assertEqual(self.calculator.categories, {'Homework': (20, {'Homework #1': (15, 20)}), 'Tests': (80, {'Test #1': (97, 100), 'Test #2': (87, 100)})})
+
+    def test_add_assignments_rejects_names_that_are_not_strings(self):
+        self.calculator.add_category('Homework', '100')
+        errors = self.calculator.add_assignments([('Homework', 'Homework #1', '3/4'), ('Homework', 5, '1/2'), (None, 'Homework #2', '1/2')])
+        self.assertEqual([e.row_number for e in errors], [2, 3])
+        self.assertEqual(self.calculator.categories, {'Homework': (100, {'Homework #1': (3, 4)})})
+        self.assertEqual(self.calculator.calculate_total_grade(), .75)
+
+        # A bad name reaching the category directly leaves it unchanged
+        category = self.calculator._categories['Homework']
+        self.assertRaises(TypeError, category.extend, ['Homework #2', 5], [1.0, 1.0], [2.0, 2.0])
+        self.assertEqual((len(category), len(category.earned)), (1, 1))
+
+    def test_add_assignments_matches_add_assignment(self):
+        rows = [('Homework', f'Homework #{i}', f'{i % 17}/20') for i in range(100)]
+        calculator = GradeCalculator(check_consistency=True)
+        calculator.add_category('Homework', '20')
+        self.assertEqual(calculator.add_assignments(rows, batch_size=7), [])
+        self.calculator.add_category('Homework', '20')
+        for row in rows:
+            self.calculator.add_assignment(*row)
+        self.assertEqual(calculator.calculate_total_grade(), self.calculator.calculate_total_grade())
+
+    def test_category_str(self):
+        self.calculator.add_category('Homework', '20')
+        self.assertEqual(self.calculator.category_str('Homework'), 'Homework(20.0%):\n')
+        self.calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        self.assertEqual(self.calculator.category_str('Homework'), 'Homework(20.0%): Homework #1: 15.0/20.0\n')
+        self.assertEqual(self.calculator.assignment_str('Homework', 'Homework #1'), 'Homework #1: 15.0/20.0')
+        self.assertRaises(KeyError, self.calculator.category_str, 'Tests')
+        self.assertRaises(KeyError, self.calculator.assignment_str, 'Homework', 'Homework #2')
+
+    def test_required_scores(self):
+        self.calculator.add_category('Homework', '20')
+        self.calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        self.calculator.add_assignment('Homework', 'Homework #2', '20/20')
+        self.calculator.add_category('Tests', '80')
+        self.calculator.add_assignment('Tests', 'Test #1', '97/100')
+        required = self.calculator.required_scores(.9, [('Tests', 50)])
+        self.assertTrue(required.feasible)
+        self.calculator.add_assignment('Tests', 'Final', f'{required.scores[0]}/50')
+        self.assertAlmostEqual(self.calculator.calculate_total_grade(), .9)
+
+    def test_required_scores_bounds(self):
+        self.calculator.add_category('Homework', '20')
+        self.calculator.add_assignment('Homework', 'Homework #1', '20/20')
+        self.calculator.add_category('Tests', '80')
+        required = self.calculator.required_scores(.5, [('Tests', 100), ('Tests', 50)], upper_bound=1)
+        self.assertAlmostEqual(required.ratio, .375)
+        self.assertEqual(required.scores, [37.5, 18.75])
+        self.assertFalse(self.calculator.required_scores(1.1, [('Tests', 100)], upper_bound=1).feasible)
+        self.assertEqual(self.calculator.required_scores(.1, [('Tests', 100)]).ratio, 0)
+        self.assertRaises(KeyError, self.calculator.required_scores, .9, [('Quizzes', 10)])
+        self.assertRaises(ValueError, self.calculator.required_scores, .9, [('Homework', 10)])
+        self.assertRaises(AssertionError, self.calculator.required_scores, .9, [])
+
+    def test_grade_cache(self):
+        self.calculator.add_category('Homework', '20')
+        self.calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        self.calculator.add_category('Tests', '80')
+        self.calculator.add_assignment('Tests', 'Test #1', '97/100')
+        self.assertEqual(self.calculator.cache_info(), (0, 0, 0))
+        total = self.calculator.calculate_total_grade()
+        self.assertEqual(self.calculator.cache_info(), (0, 3, 2))
+        self.assertEqual(self.calculator.calculate_total_grade(), total)
+        self.assertEqual(self.calculator.category_grade('Homework'), 15)
+        self.assertEqual(self.calculator.cache_info(), (2, 3, 2))
+
+        # Only the touched category is recalculated
+        self.calculator.add_assignment('Tests', 'Test #2', '87/100')
+        self.assertEqual(self.calculator.cache_info().size, 1)
+        self.assertAlmostEqual(self.calculator.calculate_total_grade(), (15 + 73.6) / 100)
+        self.assertEqual(self.calculator.cache_info(), (3, 5, 2))
+
+        self.calculator.remove_category('Homework')
+        self.assertEqual(self.calculator.cache_info().size, 1)
+        self.assertAlmostEqual(self.calculator.calculate_total_grade(), .92)
+        self.assertEqual(self.calculator.total_possible_grade(), 80)
+        self.assertRaises(KeyError, self.calculator.category_grade, 'Homework')
+
+    def test_update_assignment(self):
+        calculator = GradeCalculator(check_consistency=True)
+        calculator.add_category('Homework', '20')
+        calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        calculator.add_assignment('Homework', 'Homework #2', '20/20')
+        self.assertEqual(calculator.category_grade('Homework'), 17.5)
+        calculator.update_assignment('Homework', 'Homework #1', '18/20')
+        self.assertEqual(calculator.categories, {'Homework': (20, {'Homework #1': (18, 20), 'Homework #2': (20, 20)})})
+        self.assertAlmostEqual(calculator.category_grade('Homework'), 19)
+        self.assertRaises(KeyError, calculator.update_assignment, 'Homework', 'Homework #3', '18/20')
+        self.assertRaises(KeyError, calculator.update_assignment, 'Tests', 'Homework #1', '18/20')
+        self.assertRaises(AssertionError, calculator.update_assignment, 'Homework', 'Homework #1', '18')
+
+    def test_remove_assignment(self):
+        calculator = GradeCalculator(check_consistency=True)
+        calculator.add_category('Homework', '100')
+        for i in range(10):
+            calculator.add_assignment('Homework', f'Homework #{i}', f'{i}/10')
+        for i in range(0, 10, 2):
+            calculator.remove_assignment('Homework', f'Homework #{i}')
+        self.assertEqual(list(calculator.categories['Homework'][GradeCalculator.ASSIGNMENTS]), [f'Homework #{i}' for i in range(1, 10, 2)])
+        self.assertAlmostEqual(calculator.calculate_total_grade(), .5)
+        calculator.add_assignment('Homework', 'Homework #0', '10/10')
+        self.assertTrue(str(calculator).endswith('Homework #9: 9.0/10.0, Homework #0: 10.0/10.0\n'))
+        self.assertRaises(KeyError, calculator.remove_assignment, 'Homework', 'Homework #2')
+        for name in list(calculator.categories['Homework'][GradeCalculator.ASSIGNMENTS]):
+            calculator.remove_assignment('Homework', name)
+        self.assertEqual(calculator.categories, {'Homework': (100, {})})
+        self.assertRaises(ZeroDivisionError, calculator.calculate_total_grade)
+
+    def test_rename_category(self):
+        self.calculator.add_category('Homework', '20')
+        self.calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        self.calculator.add_category('Tests', '80')
+        self.calculator.add_assignment('Tests', 'Test #1', '90/100')
+        total = self.calculator.calculate_total_grade()
+        self.calculator.rename_category('Homework', 'Labs')
+        self.assertEqual(list(self.calculator.categories), ['Labs', 'Tests'])
+        self.assertEqual(self.calculator.calculate_total_grade(), total)
+        self.assertEqual(self.calculator.category_grade('Labs'), 15)
+        self.assertRaises(KeyError, self.calculator.rename_category, 'Labs', 'Tests')
+        self.assertRaises(KeyError, self.calculator.rename_category, 'Homework', 'Quizzes')
+
+    def fill_numeric(self, calculator):
+        calculator.add_category('Homework', '20')
+        calculator.add_assignment('Homework', 'Homework #1', '15/20')
+        calculator.add_assignment('Homework', 'Homework #2', '20/20')
+        calculator.add_category('Tests', '80')
+        calculator.add_assignments([('Tests', 'Test #1', '97/100'), ('Tests', 'Test #2', (87, 100))])
+
+    def test_fraction_mode(self):
+        calculator = GradeCalculator(check_consistency=True, numeric='fraction')
+        self.fill_numeric(calculator)
+        self.assertEqual(calculator.category_grade('Tests'), Fraction('73.6'))
+        self.assertEqual(calculator.calculate_total_grade(), Fraction(911, 1000))
+
+        # Edits leave no rounding behind
+        calculator.add_assignment('Tests', 'Test #3', '0.1/0.3')
+        calculator.update_assignment('Tests', 'Test #1', '0.1/0.3')
+        calculator.update_assignment('Tests', 'Test #1', '97/100')
+        calculator.remove_assignment('Tests', 'Test #3')
+        self.assertEqual(calculator.calculate_total_grade(), Fraction(911, 1000))
+
+    def test_fixed_mode(self):
+        calculator = GradeCalculator(check_consistency=True, numeric='fixed')
+        self.fill_numeric(calculator)
+        self.assertEqual(calculator.category_grade('Tests'), 73.6)
+        self.assertEqual(calculator.calculate_total_grade(), .911)
+        self.assertEqual(calculator.total_possible_grade(), 100)
+
+        # The total does not depend on the order of the changes that led to it
+        for i in range(10):
+            calculator.add_assignment('Homework', f'Extra #{i}', f'{i * .1}/3')
+        for i in range(10):
+            calculator.remove_assignment('Homework', f'Extra #{i}')
+        self.assertEqual(calculator.calculate_total_grade(), .911)
+
+    def test_scores_that_cannot_be_converted(self):
+        for numeric in ('float', 'fraction', 'fixed'):
+            calculator = GradeCalculator(check_consistency=True, numeric=numeric)
+            calculator.add_category('Homework', '100')
+            calculator.add_assignment('Homework', 'Homework #1', '1/2')
+            for score in ('inf/10', 'nan/1', '1/1e-320', '1e300/1'):
+                self.assertRaises(AssertionError, calculator.add_assignment, 'Homework', 'Homework #2', score)
+                self.assertRaises(AssertionError, calculator.update_assignment, 'Homework', 'Homework #1', score)
+            errors = calculator.add_assignments([('Homework', 'Homework #2', (float('inf'), 10)), ('Homework', 'Homework #3', (1, 1e-320))])
+            self.assertEqual([e.row_number for e in errors], [1, 2])
+            self.assertEqual(calculator.categories, {'Homework': (100, {'Homework #1': (1, 2)})})
+            self.assertEqual(calculator.calculate_total_grade(), .5)
+
+    def test_invalid_numeric_mode(self):
+        self.assertRaises(ValueError, GradeCalculator, numeric='decimal')
+
+    def test_fork(self):
+        calculator = GradeCalculator(check_consistency=True)
+        calculator.add_category('Homework', '20', DropLowest(1))
+        calculator.add_assignments([('Homework', f'Homework #{i}', f'{10 + i}/20') for i in range(5)])
+        calculator.add_category('Tests', '70')
+        calculator.add_assignment('Tests', 'Test #1', '97/100')
+        calculator.add_assignment('Tests', 'Test #2', '87/100')
+        base_categories = calculator.categories
+        base_grade = calculator.calculate_total_grade()
+
+        fork = calculator.fork()
+        self.assertEqual(fork.calculate_total_grade(), base_grade)
+        self.assertEqual(fork.cache_info().misses, 0)
+
+        # Only the changed category is copied, and the other keeps its cached grade
+        fork.add_assignment('Tests', 'Test #3', '100/100')
+        fork.remove_assignment('Homework', 'Homework #4')
+        fork.update_assignment('Homework', 'Homework #0', '20/20')
+        fork.add_category('Labs', '10')
+        self.assertIsNot(fork._categories['Tests'], calculator._categories['Tests'])
+        self.assertEqual(calculator.categories, base_categories)
+        self.assertEqual(calculator.calculate_total_grade(), base_grade)
+
+        expected = GradeCalculator()
+        expected.add_category('Homework', '20', DropLowest(1))
+        expected.add_assignments([('Homework', f'Homework #{i}', f'{10 + i}/20') for i in range(1, 4)] + [('Homework', 'Homework #0', '20/20')])
+        expected.add_category('Tests', '70')
+        expected.add_assignments([('Tests', 'Test #1', '97/100'), ('Tests', 'Test #2', '87/100'), ('Tests', 'Test #3', '100/100')])
+        expected.add_category('Labs', '10')
+        expected.add_assignment('Labs', 'Lab #1', '1/2')
+        fork.add_assignment('Labs', 'Lab #1', '1/2')
+        self.assertAlmostEqual(fork.calculate_total_grade(), expected.calculate_total_grade())
+
+        diff = fork.diff(calculator)
+        self.assertAlmostEqual(diff.total, expected.calculate_total_grade() - base_grade)
+        self.assertEqual(set(diff.categories), {'Homework', 'Tests', 'Labs'})
+        self.assertEqual(diff.categories['Labs'], (None, 5.0))
+
+        # Changes to the base after forking do not reach the fork, and renaming keeps a shared category shared
+        fork = calculator.fork()
+        calculator.rename_category('Tests', 'Exams')
+        calculator.add_assignment('Exams', 'Test #3', '0/100')
+        self.assertEqual(fork.categories['Tests'], base_categories['Tests'])
+        self.assertEqual(fork.calculate_total_grade(), base_grade)
+        self.assertEqual(fork.diff(fork.fork()).categories, {})
@@ -0,0 +1,86 @@
+'''
+Unittest Module for Grade Calculator Command Line
+'''
+
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from grade_cli import main, grade_roster, iter_tasks
+
+ROSTER = '''student,category,percentage,assignment,score
+alice,Homework,20,Homework #1,15/20
+alice,Homework,,Homework #2,20/20
+alice,Tests,80,Test #1,97/100
+alice,Tests,,Test #2,87/100
+bob,Homework,50,Homework #1,10/20
+bob,Tests,50,Test #1,bad
+bob,Tests,,Test #2,80/100
+carol,Homework,100,,
+'''
+
+class Test_GradeCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.roster_path = os.path.join(self.directory.name, 'roster.csv')
+        with open(self.roster_path, 'w') as file:
+            file.write(ROSTER)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roster_file(self):
+        output_path = os.path.join(self.directory.name, 'grades.csv')
+        with redirect_stderr(io.StringIO()) as stderr:
+            main([self.roster_path, '-o', output_path, '--workers', '2', '--chunk-size', '1'])
+        with open(output_path) as file:
+            rows = list(csv.reader(file))
+        self.assertEqual([row[0] for row in rows], ['student', 'alice', 'bob', 'carol'])
+        self.assertAlmostEqual(float(rows[1][1]), .911)
+        self.assertAlmostEqual(float(rows[2][1]), .65)
+        self.assertEqual(rows[2][2], '1')
+        self.assertEqual(rows[3][1], '')
+        self.assertIn('students/sec', stderr.getvalue())
+
+    def test_stats(self):
+        output_path = os.path.join(self.directory.name, 'grades.csv')
+        stats_path = os.path.join(self.directory.name, 'stats.json')
+        with redirect_stderr(io.StringIO()):
+            main([self.roster_path, '-o', output_path, '--workers', '2', '--chunk-size', '1', '--stats', stats_path])
+        with open(stats_path) as file:
+            report = json.load(file)
+        self.assertEqual((report['graded'], report['skipped']), (2, 1))
+        self.assertAlmostEqual(report['total_grade']['mean'], (.911 + .65) / 2)
+        self.assertEqual(report['histogram']['A'], 1)
+        self.assertEqual(report['histogram']['D'], 1)
+
+        # Nobody graded writes null rather than NaN, which is not JSON
+        with open(self.roster_path, 'w') as file:
+            file.write('student,category,percentage,assignment,score\ncarol,Homework,100,,\n')
+        with redirect_stderr(io.StringIO()):
+            main([self.roster_path, '-o', output_path, '--workers', '1', '--stats', stats_path])
+        with open(stats_path) as file:
+            report = json.loads(file.read(), parse_constant=self.fail)
+        self.assertEqual((report['graded'], report['skipped']), (0, 1))
+        self.assertIsNone(report['total_grade']['mean'])
+
+    def test_non_positive_sizes_rejected(self):
+        for option in ('--workers', '--chunk-size'):
+            for value in ('0', '-1', 'two'):
+                with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                    main([self.roster_path, option, value])
+        self.assertRaises(ValueError, grade_roster, iter_tasks(self.roster_path), chunk_size=0)
+        self.assertRaises(ValueError, grade_roster, iter_tasks(self.roster_path), workers=0)
+
+    def test_directory_keeps_input_order(self):
+        gradebooks = os.path.join(self.directory.name, 'gradebooks')
+        os.mkdir(gradebooks)
+        for i in range(30):
+            with open(os.path.join(gradebooks, f'student{i:02}.csv'), 'w') as file:
+                file.write(f'category,percentage,assignment,score\nHomework,100,Homework #1,{i}/30\n')
+        results = list(grade_roster(iter_tasks(gradebooks), workers=2, chunk_size=4))
+        self.assertEqual([r[0] for r in results], [f'student{i:02}' for i in range(30)])
+        self.assertEqual([r[1] for r in results], [(i / 30) * 100 / 100 for i in range(30)])
@@ -0,0 +1,135 @@
+'''
+Unittest Module for Grade Calculator Aggregation Policies
+'''
+
+import os
+import random
+import tempfile
+import unittest
+from fractions import Fraction
+from grade_calculator import GradeCalculator, NUMERIC_MODES
+from grade_policies import PointsBased, DropLowest, Capped, policy_from_spec
+from journal import open_journaled_calculator
+from snapshot import write_snapshot, load_snapshot, Snapshot
+
+def mean(values: list) -> float:
+    return sum(values) / len(values)
+
+def drop_lowest(ratios: list, count: int) -> float:
+    '''Sorts every ratio, the naive way to drop the lowest'''
+    return mean(sorted(ratios)[min(count, len(ratios) - 1):])
+
+class Test_Policies(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.scores = [(rng.randint(0, 20), rng.choice((10, 20))) for _ in range(30)]
+
+    def build(self, numeric: str = 'float') -> GradeCalculator:
+        calculator = GradeCalculator(check_consistency=True, numeric=numeric)
+        calculator.add_category('Homework', '30', DropLowest(3))
+        calculator.add_category('Labs', '30', PointsBased())
+        calculator.add_category('Quizzes', '20', Capped())
+        calculator.add_category('Tests', '20', Capped(1.0, DropLowest(1)))
+        return calculator
+
+    def test_drop_lowest(self):
+        calculator = self.build()
+        ratios = []
+        for i, (earned, possible) in enumerate(self.scores):
+            calculator.add_assignment('Homework', f'Homework #{i}', f'{earned}/{possible}')
+            ratios.append(earned / possible)
+            self.assertAlmostEqual(calculator.category_grade('Homework'), drop_lowest(ratios, 3) * 30)
+
+        # Only the highest ratio is kept while there are no more assignments than dropped ones
+        calculator = self.build()
+        calculator.add_assignment('Homework', 'Homework #1', '5/10')
+        calculator.add_assignment('Homework', 'Homework #2', '8/10')
+        self.assertAlmostEqual(calculator.category_grade('Homework'), 24)
+
+    def test_points_based(self):
+        calculator = self.build()
+        calculator.add_assignments([('Labs', f'Lab #{i}', (earned, possible)) for i, (earned, possible) in enumerate(self.scores)])
+        self.assertAlmostEqual(calculator.category_grade('Labs'), sum(k[0] for k in self.scores) / sum(k[1] for k in self.scores) * 30)
+
+    def test_points_based_small_scores(self):
+        for numeric in NUMERIC_MODES:
+            calculator = self.build(numeric)
+            calculator.add_assignment('Labs', 'Lab #1', '0/0.0000001')
+            calculator.add_assignment('Labs', 'Lab #2', '0.00000000003/0.0000000001')
+            self.assertAlmostEqual(float(calculator.category_grade('Labs')), 0.0003 / 1.001 * 30)
+
+    def test_capped(self):
+        calculator = self.build()
+        calculator.add_assignment('Quizzes', 'Quiz #1', '12/10')
+        calculator.add_assignment('Quizzes', 'Quiz #2', '9/10')
+        self.assertEqual(calculator.category_grade('Quizzes'), 20)
+        calculator.update_assignment('Quizzes', 'Quiz #1', '7/10')
+        self.assertAlmostEqual(calculator.category_grade('Quizzes'), 16)
+
+        calculator.add_assignment('Tests', 'Test #1', '30/100')
+        calculator.add_assignment('Tests', 'Test #2', '110/100')
+        self.assertEqual(calculator.category_grade('Tests'), 20)
+
+    def test_changes_rebuild_state(self):
+        calculator = self.build()
+        scores = {f'Homework #{i}': score for i, score in enumerate(self.scores)}
+        calculator.add_assignments([('Homework', k, v) for k, v in scores.items()])
+        rng = random.Random(1)
+        for name in rng.sample(list(scores), 10):
+            calculator.remove_assignment('Homework', name)
+            del scores[name]
+        for name in rng.sample(list(scores), 10):
+            scores[name] = (rng.randint(0, 10), 10)
+            calculator.update_assignment('Homework', name, f'{scores[name][0]}/10')
+        self.assertAlmostEqual(calculator.category_grade('Homework'), drop_lowest([e / p for e, p in scores.values()], 3) * 30)
+
+    def test_numeric_modes(self):
+        grades = {}
+        for numeric in NUMERIC_MODES:
+            calculator = self.build(numeric)
+            for category_name in ('Homework', 'Labs', 'Quizzes', 'Tests'):
+                calculator.add_assignments([(category_name, f'#{i}', f'{earned}/{possible}') for i, (earned, possible) in enumerate(self.scores)])
+            calculator.remove_assignment('Homework', '#0')
+            grades[numeric] = calculator.calculate_total_grade()
+        self.assertIsInstance(grades['fraction'], Fraction)
+        self.assertAlmostEqual(grades['float'], float(grades['fraction']))
+        self.assertAlmostEqual(grades['fixed'], float(grades['fraction']), places=9)
+
+    def test_specs(self):
+        for policy in (PointsBased(), DropLowest(2), Capped(), Capped(1.5, DropLowest(1))):
+            self.assertEqual(policy_from_spec(policy.spec()), policy)
+        self.assertRaises(ValueError, policy_from_spec, ['median'])
+        self.assertRaises(AssertionError, DropLowest, 0)
+
+    def test_required_scores_rejected(self):
+        calculator = self.build()
+        for category_name in ('Homework', 'Labs', 'Quizzes', 'Tests'):
+            calculator.add_assignment(category_name, '#1', '5/10')
+        self.assertRaises(ValueError, calculator.required_scores, .9, [('Homework', 10)])
+
+    def test_persistence(self):
+        calculator = self.build()
+        for category_name in ('Homework', 'Labs', 'Quizzes', 'Tests'):
+            calculator.add_assignments([(category_name, f'#{i}', f'{earned}/{possible}') for i, (earned, possible) in enumerate(self.scores)])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'grades.snapshot')
+            write_snapshot(path, calculator)
+            loaded = load_snapshot(path)
+            self.assertEqual(loaded.category_policy('Tests'), Capped(1.0, DropLowest(1)))
+            self.assertEqual(loaded.calculate_total_grade(), calculator.calculate_total_grade())
+            with Snapshot(path) as snapshot:
+                self.assertEqual(snapshot.total_grade(), calculator.calculate_total_grade())
+
+            path = os.path.join(directory, 'grades.journal')
+            journaled = open_journaled_calculator(path)
+            journaled.add_category('Homework', '100', DropLowest(2))
+            journaled.add_assignments([('Homework', f'#{i}', f'{earned}/{possible}') for i, (earned, possible) in enumerate(self.scores)])
+            journaled.journal.close()
+            recovered = open_journaled_calculator(path)
+            self.assertEqual(recovered.category_policy('Homework'), DropLowest(2))
+            self.assertEqual(recovered.calculate_total_grade(), journaled.calculate_total_grade())
+            recovered.journal.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+'''
+Unittest Module for Grade Calculator Server
+'''
+
+import asyncio
+import json
+import unittest
+from grade_server import GradeServer
+
+class Test_GradeServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GradeServer()
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self.server.close()
+
+    async def pipeline(self, requests: list, writer=None, reader=None) -> list:
+        writer = writer or self.writer
+        reader = reader or self.reader
+        writer.write(b''.join(json.dumps(dict(request, id=i)).encode() + b'\n' for i, request in enumerate(requests)))
+        await writer.drain()
+        return [json.loads(await reader.readline()) for _ in requests]
+
+    async def test_pipelined_commands(self):
+        responses = await self.pipeline([
+            {'calculator': 'alice', 'op': 'add_category', 'args': ['Homework', '20']},
+            {'calculator': 'alice', 'op': 'add_assignment', 'args': ['Homework', 'Homework #1', '15/20']},
+            {'calculator': 'alice', 'op': 'add_assignment', 'args': ['Homework', 'Homework #2', '20/20']},
+            {'calculator': 'alice', 'op': 'add_category', 'args': ['Tests', '80']},
+            {'calculator': 'alice', 'op': 'add_assignment', 'args': ['Tests', 'Test #1', '97/100']},
+            {'calculator': 'alice', 'op': 'add_assignment', 'args': ['Tests', 'Test #2', '87/100']},
+            {'calculator': 'alice', 'op': 'calculate_total_grade'},
+            {'calculator': 'alice', 'op': 'add_assignment', 'args': ['Quizzes', 'Quiz #1', '9/10']},
+            {'calculator': 'alice', 'op': 'remove_category', 'args': ['Homework']},
+            {'calculator': 'alice', 'op': 'calculate_total_grade'},
+        ])
+        self.assertEqual([r['id'] for r in responses], list(range(10)))
+        self.assertAlmostEqual(responses[6]['result'], .911)
+        self.assertEqual(responses[7]['error'], 'KeyError')
+        self.assertAlmostEqual(responses[9]['result'], .92)
+
+    async def test_bad_requests(self):
+        self.writer.write(b'not json\n')
+        self.writer.write(json.dumps({'id': 1, 'calculator': 'alice', 'op': 'delete_everything'}).encode() + b'\n')
+        self.writer.write(json.dumps({'id': 2, 'op': 'add_category', 'args': ['Homework', '20']}).encode() + b'\n')
+        await self.writer.drain()
+        responses = [json.loads(await self.reader.readline()) for _ in range(3)]
+        self.assertEqual([r['ok'] for r in responses], [False, False, False])
+        self.assertEqual(responses[0]['error'], 'JSONDecodeError')
+        self.assertEqual([r['id'] for r in responses[1:]], [1, 2])
+
+    async def test_concurrent_connections_and_roster(self):
+        other_reader, other_writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+        setup = [{'calculator': name, 'op': 'add_category', 'args': ['Tests', '100']} for name in ('alice', 'bob', 'carol')]
+        await self.pipeline(setup)
+        responses = await asyncio.gather(
+            self.pipeline([{'calculator': 'alice', 'op': 'add_assignment', 'args': ['Tests', f'Test #{i}', '50/100']} for i in range(50)]),
+            self.pipeline([{'calculator': 'bob', 'op': 'add_assignment', 'args': ['Tests', f'Test #{i}', '100/100']} for i in range(50)], other_writer, other_reader),
+        )
+        self.assertTrue(all(r['ok'] for batch in responses for r in batch))
+        roster = await self.pipeline([{'op': 'roster_total_grades'}, {'op': 'list_calculators'}])
+        self.assertEqual(roster[0]['result'], {'alice': .5, 'bob': 1.0, 'carol': None})
+        self.assertEqual(roster[1]['result'], ['alice', 'bob', 'carol'])
+        other_writer.close()
+        await other_writer.wait_closed()
@@ -0,0 +1,114 @@
+'''
+Unittest Module for Grade Calculator Statistics
+'''
+
+import json
+import math
+import random
+import statistics
+import unittest
+from grade_calculator import GradeCalculator
+from grade_stats import GradeStatistics, QuantileSketch
+
+CATEGORIES = {'Homework': '30', 'Quizzes': '20', 'Tests': '50'}
+
+def make_calculators(count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    calculators = {}
+    for student in range(count):
+        calculator = GradeCalculator()
+        for category_name, percentage in CATEGORIES.items():
+            calculator.add_category(category_name, percentage)
+            for i in range(rng.randint(0, 5) if student % 50 == 0 else 5):
+                calculator.add_assignment(category_name, f'{category_name} #{i}', f'{rng.randint(8, 20)}/20')
+        calculators[f'student{student}'] = calculator
+    return calculators
+
+def total_grades(calculators: dict) -> list:
+    grades = []
+    for calculator in calculators.values():
+        try:
+            grades.append(calculator.calculate_total_grade())
+        except ZeroDivisionError:
+            pass
+    return grades
+
+class Test_GradeStatistics(unittest.TestCase):
+    def setUp(self):
+        self.calculators = make_calculators(300)
+        self.grades = total_grades(self.calculators)
+
+    def test_single_pass(self):
+        stats = GradeStatistics().add_calculators(self.calculators)
+        self.assertEqual(stats.totals.count, len(self.grades))
+        self.assertEqual(stats.skipped, len(self.calculators) - len(self.grades))
+        self.assertAlmostEqual(stats.totals.mean, statistics.mean(self.grades))
+        self.assertAlmostEqual(stats.totals.summary().stdev, statistics.pstdev(self.grades))
+        self.assertEqual(stats.totals.min, min(self.grades))
+        self.assertEqual(stats.totals.max, max(self.grades))
+
+        sorted_grades = sorted(self.grades)
+        for percent, grade in stats.percentiles().items():
+            expected = sorted_grades[max(1, math.ceil(percent / 100 * len(sorted_grades))) - 1]
+            self.assertLessEqual(abs(grade - expected), stats.sketch.resolution / 2 + 1e-12)
+
+        letters = [next((letter for letter, cutoff in stats.letter_cutoffs if grade >= cutoff), 'F') for grade in self.grades]
+        self.assertEqual(stats.histogram, {letter: letters.count(letter) for letter in stats.histogram})
+
+        homework = [c.category_grade('Homework') / 30 for c in self.calculators.values() if len(c._categories['Homework'])]
+        self.assertAlmostEqual(stats.category_averages()['Homework'], statistics.mean(homework))
+
+    def test_merge(self):
+        whole = GradeStatistics().add_calculators(self.calculators)
+        calculators = list(self.calculators.values())
+        merged = GradeStatistics()
+        for start in range(0, len(calculators), 70):
+            merged.merge(GradeStatistics().add_calculators(calculators[start:start + 70]))
+        self.assertEqual(merged.report()['histogram'], whole.report()['histogram'])
+        self.assertEqual(merged.sketch.counts, whole.sketch.counts)
+        self.assertEqual(merged.skipped, whole.skipped)
+        self.assertAlmostEqual(merged.totals.mean, whole.totals.mean)
+        self.assertAlmostEqual(merged.totals.variance(), whole.totals.variance())
+
+        self.assertRaises(ValueError, merged.merge, GradeStatistics(resolution=1e-3))
+        self.assertRaises(ValueError, merged.merge, GradeStatistics((('Pass', .5), ('Fail', 0))))
+
+    def test_exact_histogram(self):
+        # 9/10 is exactly the A cutoff as a Fraction, but below it as the float sum .3 * 3
+        calculator = GradeCalculator(numeric='fraction')
+        calculator.add_category('Homework', '100')
+        calculator.add_assignment('Homework', 'Homework #1', '9/10')
+        stats = GradeStatistics()
+        stats.add_calculator(calculator)
+        stats.add(.3 + .3 + .3)
+        self.assertEqual(stats.histogram['A'], 1)
+        self.assertEqual(stats.histogram['B'], 1)
+
+    def test_roster(self):
+        try:
+            from roster import RosterGrader
+        except ImportError:
+            self.skipTest('NumPy is not installed')
+        roster = RosterGrader.from_calculators(self.calculators)
+        vectorized = GradeStatistics().add_roster(roster)
+        streamed = GradeStatistics().add_calculators(self.calculators)
+        self.assertEqual(vectorized.histogram, streamed.histogram)
+        self.assertEqual(vectorized.sketch.counts, streamed.sketch.counts)
+        self.assertEqual(vectorized.skipped, streamed.skipped)
+        self.assertAlmostEqual(vectorized.totals.mean, streamed.totals.mean)
+        for category_name, average in streamed.category_averages().items():
+            self.assertAlmostEqual(vectorized.category_averages()[category_name], average)
+
+    def test_empty(self):
+        stats = GradeStatistics()
+        self.assertTrue(math.isnan(stats.median()))
+        report = stats.report()
+        self.assertEqual(report['graded'], 0)
+        self.assertIsNone(report['median'])
+        self.assertIsNone(report['total_grade']['mean'])
+        self.assertEqual(report['total_grade']['count'], 0)
+        json.dumps(report, allow_nan=False)
+        self.assertRaises(AssertionError, QuantileSketch, 0)
+
+if __name__ == '__main__':
+    unittest.main()
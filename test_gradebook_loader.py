@@ -0,0 +1,60 @@
+'''
+Unittest Module for Gradebook Loader
+'''
+
+import io
+import os
+import tempfile
+import unittest
+from gradebook_loader import load_gradebook, iter_rows
+
+CSV_GRADEBOOK = '''category,percentage,assignment,score
+Homework,20,,
+Homework,,Homework #1,15/20
+Homework,,Homework #2,20/20
+
+Tests,80,Test #1,97/100
+Tests,,Test #2,87/100
+Quizzes,,Quiz #1,9/10
+Tests,,Test #3,ninety/100
+Labs,150,,
+'''
+
+JSONL_GRADEBOOK = '''{"category": "Homework", "percentage": 20, "assignment": "Homework #1", "score": "15/20"}
+{"category": "Homework", "assignment": "Homework #2", "score": "20/20"}
+not json
+{"category": "Tests", "percentage": 80, "assignment": "Test #1", "score": "97/100"}
+{"category": "Tests", "assignment": "Test #2", "score": "87/100"}
+{"category": "Tests"}
+'''
+
+class Test_GradebookLoader(unittest.TestCase):
+    def test_load_csv(self):
+        calculator, errors = load_gradebook(io.StringIO(CSV_GRADEBOOK), format='csv', batch_size=2)
+        self.assertEqual([e.row_number for e in errors], [8, 9, 10])
+        self.assertAlmostEqual(calculator.calculate_total_grade(), .911)
+
+    def test_load_jsonl(self):
+        calculator, errors = load_gradebook(io.StringIO(JSONL_GRADEBOOK), format='jsonl')
+        self.assertEqual([e.row_number for e in errors], [3, 6])
+        self.assertAlmostEqual(calculator.calculate_total_grade(), .911)
+
+    def test_format_from_extension(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'gradebook.csv')
+            with open(path, 'w') as file:
+                file.write(CSV_GRADEBOOK)
+            calculator, errors = load_gradebook(path)
+            self.assertEqual(len(errors), 3)
+            self.assertRaises(ValueError, list, iter_rows(os.path.join(directory, 'gradebook.txt')))
+
+    def test_repeated_percentage_must_match(self):
+        gradebook = 'category,percentage,assignment,score\nHomework,20,Homework #1,15/20\nHomework,50,Homework #2,1/20\nHomework,20.0,Homework #3,20/20\nTests,80,Test #1,90/100\n'
+        calculator, errors = load_gradebook(io.StringIO(gradebook), format='csv')
+        self.assertEqual([e.row_number for e in errors], [3])
+        self.assertEqual(list(calculator.categories['Homework'][1]), ['Homework #1', 'Homework #3'])
+        self.assertEqual(calculator.categories['Homework'][0], 20)
+
+        # A category already in the given calculator is checked the same way
+        calculator, errors = load_gradebook(io.StringIO('category,percentage,assignment,score\nHomework,30,Homework #4,1/2\n'), format='csv', calculator=calculator)
+        self.assertEqual([e.row_number for e in errors], [2])
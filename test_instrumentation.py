@@ -0,0 +1,69 @@
+'''
+Unittest Module for Grade Calculator Instrumentation
+'''
+
+import io
+import json
+import unittest
+from grade_calculator import GradeCalculator
+from instrumentation import instrument, uninstrument, MemorySink, JsonLinesSink, InstrumentedCalculator
+
+class Test_Instrumentation(unittest.TestCase):
+    def setUp(self):
+        self.calculator = GradeCalculator()
+        self.sink = MemorySink()
+        self.instrumentation = instrument(self.calculator, self.sink)
+
+    def test_counts(self):
+        self.calculator.add_category('Homework', '40')
+        self.calculator.add_category('Tests', '60')
+        for i in range(3):
+            self.calculator.add_assignment('Homework', f'Homework #{i}', '8/10')
+        self.calculator.add_assignment('Tests', 'Test #1', '45/50')
+        self.assertRaises(KeyError, self.calculator.add_assignment, 'Labs', 'Lab #1', '1/1')
+        self.assertAlmostEqual(self.calculator.calculate_total_grade(), .86)
+        self.calculator.calculate_total_grade()
+        str(self.calculator)
+        self.calculator.remove_category('Homework')
+
+        stats = self.instrumentation.stats()
+        self.assertEqual((stats['add_category'].count, stats['add_category'].categories), (2, 2))
+        self.assertEqual((stats['add_assignment'].count, stats['add_assignment'].errors, stats['add_assignment'].assignments), (5, 1, 4))
+        self.assertEqual((stats['calculate_total_grade'].count, stats['calculate_total_grade'].categories), (2, 2))
+        self.assertEqual((stats['__str__'].categories, stats['__str__'].assignments), (2, 4))
+        self.assertEqual((stats['remove_category'].categories, stats['remove_category'].assignments), (1, 3))
+        for v in stats.values():
+            self.assertGreaterEqual(v.total, v.max)
+            self.assertGreaterEqual(v.max, 0)
+
+        self.assertEqual(len(self.sink.events), 11)
+        self.assertEqual(self.sink.events[4].operation, 'add_assignment')
+        self.assertIn('calculate_total_grade', self.instrumentation.report())
+
+    def test_uninstrument(self):
+        self.assertIsInstance(self.calculator, InstrumentedCalculator)
+        self.calculator.add_category('Homework', '100')
+        self.assertIs(uninstrument(self.calculator), self.instrumentation)
+        self.assertIs(type(self.calculator), GradeCalculator)
+        self.calculator.add_assignment('Homework', 'Homework #1', '8/10')
+        self.assertEqual(len(self.sink.events), 1)
+        self.assertIsNone(uninstrument(self.calculator))
+
+        # Instrumenting again keeps the running grades
+        instrument(self.calculator)
+        self.assertAlmostEqual(self.calculator.calculate_total_grade(), .8)
+
+    def test_json_lines_sink(self):
+        file = io.StringIO()
+        instrument(self.calculator, JsonLinesSink(file, flush_every=2))
+        self.calculator.add_category('Homework', '100')
+        self.assertEqual(file.getvalue(), '')
+        self.calculator.add_assignment('Homework', 'Homework #1', '8/10')
+        self.calculator.add_assignment('Homework', 'Homework #2', '9/10')
+        self.instrumentation.close()
+        events = [json.loads(line) for line in file.getvalue().splitlines()]
+        self.assertEqual([k['operation'] for k in events], ['add_category', 'add_assignment', 'add_assignment'])
+        self.assertEqual(events[1]['assignments'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
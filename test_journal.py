@@ -0,0 +1,198 @@
+'''
+Unittest Module for the Grade Calculator Journal
+'''
+
+import os
+import tempfile
+import unittest
+from grade_calculator import GradeCalculator
+from journal import Journal, open_journaled_calculator
+
+class Test_Journal(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'grades.journal')
+        # Cleanups run last in first out, so the journals a test closes with addCleanup are closed before the directory is removed
+        self.addCleanup(self.directory.cleanup)
+
+    def fill(self, calculator: GradeCalculator) -> None:
+        calculator.add_category('Homework', '20')
+        calculator.add_category('Tests', '70.5')
+        calculator.add_category('Quizzes', '9.5')
+        for i in range(10):
+            calculator.add_assignment('Homework', f'Homework #{i}', f'{i + 7}/17')
+            calculator.add_assignment('Quizzes', f'Quiz #{i}', f'{i * 1.1}/10')
+        calculator.add_assignments([('Tests', f'Test #{i}', f'{80 + i}/100') for i in range(3)])
+        calculator.update_assignment('Homework', 'Homework #3', '16.5/17')
+        calculator.remove_assignment('Quizzes', 'Quiz #0')
+        calculator.rename_category('Tests', 'Exams')
+        calculator.remove_category('Quizzes')
+        calculator.add_category('Project', '9.5')
+        calculator.add_assignment('Project', 'Final project', '47/50')
+
+    def assertSameCalculator(self, recovered: GradeCalculator, calculator: GradeCalculator):
+        self.assertEqual(recovered.categories, calculator.categories)
+        self.assertEqual(str(recovered), str(calculator))
+        self.assertEqual(recovered.calculate_total_grade(), calculator.calculate_total_grade())
+
+    def test_replay(self):
+        calculator = open_journaled_calculator(self.path)
+        self.fill(calculator)
+        calculator.journal.close()
+
+        recovered = open_journaled_calculator(self.path)
+        self.addCleanup(recovered.journal.close)
+        self.assertSameCalculator(recovered, calculator)
+
+    def test_failed_mutations_not_logged(self):
+        calculator = open_journaled_calculator(self.path)
+        calculator.add_category('Homework', '20')
+        calculator.add_assignment('Homework', 'Homework #1', '1/2')
+        with self.assertRaises(ValueError):
+            calculator.add_category('Tests', '90')
+        with self.assertRaises(KeyError):
+            calculator.add_assignment('Tests', 'Test #1', '1/2')
+        with self.assertRaises(AssertionError):
+            calculator.add_assignment('Homework', 'Homework #2', '1/0')
+        calculator.journal.close()
+
+        recovered = open_journaled_calculator(self.path)
+        self.addCleanup(recovered.journal.close)
+        self.assertSameCalculator(recovered, calculator)
+
+    def test_torn_record_dropped(self):
+        calculator = open_journaled_calculator(self.path)
+        self.fill(calculator)
+        calculator.journal.close()
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('["a","Homework","Homework #10",1')
+
+        recovered = open_journaled_calculator(self.path)
+        self.assertSameCalculator(recovered, calculator)
+
+        # Records logged after recovery must not be lost behind the torn one
+        recovered.add_assignment('Homework', 'Homework #10', '1/2')
+        recovered.journal.close()
+        recovered_again = open_journaled_calculator(self.path)
+        self.addCleanup(recovered_again.journal.close)
+        self.assertSameCalculator(recovered_again, recovered)
+
+    def test_compaction(self):
+        calculator = open_journaled_calculator(self.path)
+        self.fill(calculator)
+        calculator.journal.compact(background=False)
+        calculator.add_assignment('Homework', 'Homework #10', '3/17')
+        calculator.journal.close()
+
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['grades.journal', 'grades.journal.2.snapshot'])
+        recovered = open_journaled_calculator(self.path)
+        self.assertSameCalculator(recovered, calculator)
+
+        # A second compaction replaces the first snapshot
+        recovered.journal.compact(background=False)
+        recovered.journal.close()
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ['grades.journal', 'grades.journal.4.snapshot'])
+        recovered = open_journaled_calculator(self.path)
+        self.addCleanup(recovered.journal.close)
+        self.assertSameCalculator(recovered, calculator)
+
+    def test_numeric_mode_saved(self):
+        calculator = Journal(self.path).recover(numeric='fraction')
+        self.fill(calculator)
+        calculator.journal.close()
+
+        # Replayed segments and compacted snapshots both keep the numeric mode
+        recovered = open_journaled_calculator(self.path)
+        self.assertEqual(recovered.numeric, 'fraction')
+        self.assertSameCalculator(recovered, calculator)
+        recovered.journal.compact(background=False)
+        recovered.journal.close()
+        recovered = open_journaled_calculator(self.path)
+        self.assertEqual(recovered.numeric, 'fraction')
+        self.assertSameCalculator(recovered, calculator)
+        recovered.journal.close()
+
+        # The mode can still be chosen when recovering
+        recovered = Journal(self.path).recover(numeric='fixed')
+        self.assertEqual(recovered.numeric, 'fixed')
+        recovered.journal.close()
+
+    def test_compaction_during_bulk_add(self):
+        for compact_bytes in (500, 1000, 2000):
+            journal = Journal(self.path, fsync_every=8, compact_bytes=compact_bytes)
+            calculator = journal.recover()
+            calculator.add_category('Homework', '100')
+            calculator.add_assignments([('Homework', f'Homework #{i}', (i, 100)) for i in range(100)])
+            journal.wait_for_compaction()
+            journal.close()
+
+            # Replay raises if a record of the rows was already in the snapshot
+            recovered = open_journaled_calculator(self.path)
+            self.assertSameCalculator(recovered, calculator)
+            journal = recovered.journal
+            journal.reset(GradeCalculator())
+            journal.close()
+
+    def test_journal_argument(self):
+        self.assertRaises(ValueError, GradeCalculator, journal=Journal(self.path))
+
+        journal = Journal(self.path)
+        journal.recover()
+        calculator = GradeCalculator(journal=journal)
+        self.assertIs(journal.calculator, calculator)
+        self.fill(calculator)
+        journal.close()
+        self.assertRaises(ValueError, journal.attach, GradeCalculator())
+
+        # Every mutation of the attached calculator was logged
+        recovered = open_journaled_calculator(self.path)
+        self.addCleanup(recovered.journal.close)
+        self.assertSameCalculator(recovered, calculator)
+
+    def test_crash_before_snapshot_written(self):
+        calculator = open_journaled_calculator(self.path)
+        self.fill(calculator)
+        journal = calculator.journal
+
+        # Seal the segment as compaction does, but never write the snapshot
+        journal._write_compacted_snapshot = lambda state, generation: None
+        journal.compact(background=False)
+        calculator.add_assignment('Homework', 'Homework #10', '3/17')
+        journal.close()
+
+        recovered = open_journaled_calculator(self.path)
+        self.addCleanup(recovered.journal.close)
+        self.assertSameCalculator(recovered, calculator)
+
+    def test_automatic_compaction(self):
+        journal = Journal(self.path, fsync_every=8, compact_bytes=512)
+        calculator = journal.recover()
+        calculator.add_category('Homework', '100')
+        for i in range(200):
+            calculator.add_assignment('Homework', f'Homework #{i}', f'{i % 17}/17')
+        journal.close()
+
+        self.assertTrue(any(name.endswith('.snapshot') for name in os.listdir(self.directory.name)))
+        recovered = open_journaled_calculator(self.path)
+        self.addCleanup(recovered.journal.close)
+        self.assertSameCalculator(recovered, calculator)
+
+    def test_reset(self):
+        calculator = open_journaled_calculator(self.path)
+        self.fill(calculator)
+        calculator.journal.compact(background=False)
+        journal = calculator.journal
+
+        calculator = GradeCalculator()
+        journal.reset(calculator)
+        calculator.add_category('Homework', '100')
+        calculator.add_assignment('Homework', 'Homework #1', '1/2')
+        journal.close()
+
+        self.assertEqual(os.listdir(self.directory.name), ['grades.journal'])
+        recovered = open_journaled_calculator(self.path)
+        self.addCleanup(recovered.journal.close)
+        self.assertSameCalculator(recovered, calculator)
+
+if __name__ == '__main__':
+    unittest.main()
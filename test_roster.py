@@ -0,0 +1,68 @@
+'''
+Unittest Module for Roster Grader
+'''
+
+import random
+import unittest
+from grade_calculator import GradeCalculator
+
+try:
+    import numpy
+    from roster import RosterGrader
+except ImportError:
+    numpy = None
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class Test_RosterGrader(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.calculators = {}
+        for student in range(25):
+            calculator = GradeCalculator()
+            calculator.add_category('Homework', '20')
+            calculator.add_category('Quizzes', '15')
+            calculator.add_category('Tests', '65')
+            for category_name, count in (('Homework', 8), ('Quizzes', 5), ('Tests', 3)):
+                for i in range(count):
+                    # The first student completes every assignment, so the roster columns follow every student's insertion order
+                    if student > 0 and i > 0 and rng.random() < .2:
+                        continue
+                    calculator.add_assignment(category_name, f'{category_name} #{i}', f'{rng.randint(0, 20)}/20')
+            self.calculators[f'student{student}'] = calculator
+
+    def test_total_grades_match_calculator(self):
+        roster = RosterGrader.from_calculators(self.calculators)
+        expected = [c.calculate_total_grade() for c in self.calculators.values()]
+        numpy.testing.assert_array_equal(roster.total_grades(), expected)
+
+    def test_category_grades_match_calculator(self):
+        roster = RosterGrader.from_calculators(self.calculators)
+        grades = roster.category_grades()
+        for row, calculator in enumerate(self.calculators.values()):
+            for column, category_name in enumerate(roster.category_names):
+                self.assertEqual(grades[row, column], calculator._calculate_category_grade(category_name))
+
+    def test_set_score(self):
+        roster = RosterGrader({'Homework': 20, 'Tests': 79.5, 'Quizzes': 0.5}, {'Homework': ['Homework #1'], 'Tests': ['Test #1', 'Test #2']}, ['a', 'b'])
+        roster.set_score('a', 'Homework', 'Homework #1', 15, 20)
+        roster.set_score('a', 'Tests', 'Test #1', 97, 100)
+        self.assertRaises(KeyError, roster.set_score, 'c', 'Tests', 'Test #1', 97, 100)
+        self.assertRaises(KeyError, roster.set_score, 'a', 'Tests', 'Test #3', 97, 100)
+        grades = roster.category_grades()
+        self.assertEqual(grades[0, 0], 15)
+        self.assertAlmostEqual(grades[0, 1], 77.115)
+        self.assertTrue(numpy.isnan(grades[0, 2]))
+        self.assertTrue(numpy.isnan(grades[1, 0]))
+
+    def test_mismatched_schemes(self):
+        other = GradeCalculator()
+        other.add_category('Homework', '50')
+        self.calculators['other'] = other
+        self.assertRaises(ValueError, RosterGrader.from_calculators, self.calculators)
+
+    def test_required_ratios_match_calculator(self):
+        roster = RosterGrader.from_calculators(self.calculators)
+        future = [('Tests', 100), ('Quizzes', 20)]
+        ratios = roster.required_ratios(.8, future)
+        for ratio, calculator in zip(ratios, self.calculators.values()):
+            self.assertAlmostEqual(ratio, calculator.required_scores(.8, future).ratio)
@@ -0,0 +1,98 @@
+'''
+Unittest Module for Grade Calculator Snapshots
+'''
+
+import gc
+import os
+import random
+import tempfile
+import unittest
+import warnings
+from grade_calculator import GradeCalculator
+from snapshot import Snapshot, write_snapshot, load_snapshot
+
+class Test_Snapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'grades.snapshot')
+
+        rng = random.Random(0)
+        self.calculators = {}
+        for student in range(20):
+            calculator = GradeCalculator()
+            calculator.add_category('Homework', '20')
+            calculator.add_category('Tests', '70.5')
+            calculator.add_category('Quizzes', '9.5')
+            for i in range(rng.randint(1, 30)):
+                for category_name in ('Homework', 'Tests', 'Quizzes'):
+                    calculator.add_assignment(category_name, f'{category_name} #{i}', f'{rng.uniform(0, 20)}/{rng.randint(10, 20)}')
+            self.calculators[f'student{student}'] = calculator
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_single_calculator(self):
+        calculator = self.calculators['student0']
+        write_snapshot(self.path, calculator)
+        loaded = load_snapshot(self.path)
+        self.assertEqual(loaded.categories, calculator.categories)
+        self.assertEqual(str(loaded), str(calculator))
+        self.assertEqual(loaded.calculate_total_grade(), calculator.calculate_total_grade())
+
+    def test_round_trip_roster(self):
+        write_snapshot(self.path, self.calculators)
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.student_ids, list(self.calculators))
+            for student_id, calculator in self.calculators.items():
+                self.assertEqual(snapshot.total_grade(student_id), calculator.calculate_total_grade())
+                self.assertEqual(snapshot.load(student_id).calculate_total_grade(), calculator.calculate_total_grade())
+            earned, possible = snapshot.category_scores('student3', 'Tests')
+            self.assertEqual([(e, p) for e, p in zip(earned, possible)], list(self.calculators['student3'].categories['Tests'][GradeCalculator.ASSIGNMENTS].values()))
+            earned.release()
+            possible.release()
+            self.assertRaises(KeyError, snapshot.total_grade, 'student99')
+
+    def test_empty_category(self):
+        calculator = GradeCalculator()
+        calculator.add_category('Homework', '20')
+        write_snapshot(self.path, calculator)
+        with Snapshot(self.path) as snapshot:
+            self.assertRaises(ZeroDivisionError, snapshot.total_grade)
+            self.assertEqual(snapshot.load().categories, {'Homework': (20, {})})
+
+    def test_numeric_mode_saved(self):
+        calculators = {}
+        for numeric in ('float', 'fraction', 'fixed'):
+            calculator = GradeCalculator(numeric=numeric)
+            calculator.add_category('Homework', '100')
+            calculator.add_assignments([('Homework', f'Homework #{i}', f'{i}/10') for i in range(1, 4)])
+            calculator.update_assignment('Homework', 'Homework #1', '0.7/10')
+            calculators[numeric] = calculator
+        write_snapshot(self.path, calculators)
+
+        with Snapshot(self.path) as snapshot:
+            for numeric, calculator in calculators.items():
+                self.assertEqual(snapshot.numeric(numeric), numeric)
+                self.assertEqual(snapshot.load(numeric).numeric, numeric)
+                self.assertEqual(snapshot.total_grade(numeric), calculator.calculate_total_grade())
+                self.assertEqual(type(snapshot.total_grade(numeric)), type(calculator.calculate_total_grade()))
+            self.assertEqual(snapshot.load('fraction', numeric='float').numeric, 'float')
+        self.assertEqual(load_snapshot(self.path, 'fixed').numeric, 'fixed')
+
+    def test_not_a_snapshot(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'\x00' * 64)
+        self.assertRaises(ValueError, Snapshot, self.path)
+
+    def test_empty_or_truncated_file(self):
+        write_snapshot(self.path, self.calculators)
+        with open(self.path, 'rb') as file:
+            data = file.read()
+        for size in (0, 10, len(data) // 2, len(data) - 1):
+            with open(self.path, 'wb') as file:
+                file.write(data[:size])
+            with warnings.catch_warnings():
+                warnings.simplefilter('error', ResourceWarning)
+                self.assertRaises(ValueError, Snapshot, self.path)
+                gc.collect()
+
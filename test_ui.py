@@ -0,0 +1,40 @@
+'''
+Unittest Module for the headless part of the Grade Calculator UI
+'''
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import ui
+from journal import open_journaled_calculator
+
+class Test_UI(unittest.TestCase):
+    def test_import_without_tkinter(self):
+        code = 'import sys, ui; assert "tkinter" not in sys.modules and "ui_tk" not in sys.modules'
+        subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+
+    def test_open_calculator(self):
+        calculator, journal = ui.open_calculator()
+        self.assertIsNone(journal)
+        self.assertEqual(calculator.categories, {})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'grades.journal')
+            saved = open_journaled_calculator(path)
+            saved.add_category('Homework', '100')
+            saved.add_assignment('Homework', 'Homework #1', '3/4')
+            saved.journal.close()
+
+            calculator, journal = ui.open_calculator(path)
+            self.assertIs(calculator.journal, journal)
+            self.assertEqual(calculator.categories, saved.categories)
+            journal.close()
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            ui.NotAPage
+
+if __name__ == '__main__':
+    unittest.main()
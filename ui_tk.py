@@ -0,0 +1,419 @@
+'''
+Tk Pages for Grade Calculator
+Author: Joshua Costa
+Created: 3/15/19
+The tkinter windows of the UI, imported by the ui module only when a window is created
+'''
+
+import tkinter as tk 
+from grade_calculator import GradeCalculator
+from ui import TITLE_FONT, HEADER_FONT, DEFAULT_FONT, open_calculator
+from instrumentation import instrument, InstrumentedCalculator
+import tkinter.messagebox
+
+class AppGUI(tk.Tk):
+
+    def __init__(self, *args, **kwargs):
+
+        # Initialize the window
+        tk.Tk.__init__(self, *args, **kwargs)
+        self.title('Grade Calculator')
+        self.geometry("600x650")
+        self.resizable(0,0)
+
+        # Create the Frame
+        container = tk.Frame(self)
+        container.pack(side="top", fill="both", expand=True)
+        container.grid_rowconfigure(0, weight=1)
+        container.grid_columnconfigure(0, weight=1)
+
+        # Allow for different pages, each built the first time it is shown
+        self.container = container
+        self.frames = {}
+
+        # Start the application on the main menu
+        self.show_frame(MainMenuPage)
+
+
+    def show_frame(self, container):
+        '''Changes the current page, building it first if it has not been shown yet'''
+        if container not in self.frames:
+            frame = container(self.container, self)
+            self.frames[container] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+        frame = self.frames[container]
+        frame.tkraise()
+
+
+class MainMenuPage(tk.Frame):
+
+    def __init__(self, parent, controller):
+
+        # Initialize the Frame
+        tk.Frame.__init__(self, parent, bg='light grey')
+
+        # Label for the title
+        self.title = tk.Label(self, text='Grade Calculator', font=TITLE_FONT, bg='light grey')
+        self.title.place(relx=.25, rely=.2)
+
+        # Label for the author
+        self.author = tk.Label(self, text='by Joshua Costa', font=HEADER_FONT, bg='light grey')
+        self.author.place(relx=.39, rely=.3)
+
+        # Start button
+        self.calc_button = tk.Button(self, text='Start', font=DEFAULT_FONT, command=(lambda: self._change_frame_and_start_button_text(controller)))
+        self.calc_button.place(relx=.46, rely=.4)
+
+        # Exit button
+        self.exit_button = tk.Button(self, text='Exit', font=DEFAULT_FONT, command=controller.destroy)
+        self.exit_button.place(relx=.47, rely=.47)
+
+    def _change_frame_and_start_button_text(self, controller):
+        controller.show_frame(CalculatorPage)
+        self.calc_button.config(text='Resume')
+
+
+class CalculatorPage(tk.Frame):
+
+    def __init__(self, parent, controller, journal_path=None):
+
+        # Initialize the Frame
+        tk.Frame.__init__(self, parent, bg='light grey')
+
+        # Create new GradeCalculator class, recovered from the journal if there is one
+        self.calculator, self.journal = open_calculator(journal_path)
+
+        # Create boolean variables
+        self.can_add_assignments = False
+        self.can_calculate_grade = False
+
+        # Create the field that adds new categories
+        self.category_name_label = tk.Label(self, text='Category Name', font=HEADER_FONT, bg='light grey')
+        self.category_name_label.grid(row=0,column=0)
+
+        self.new_category = tk.StringVar()
+        self.category_name_entry = tk.Entry(self, textvariable=self.new_category, font=DEFAULT_FONT)
+        self.category_name_entry.grid(row=1,column=0)
+
+        self.category_percentage_label = tk.Label(self, text='Percentage of Category', font=HEADER_FONT, bg='light grey')
+        self.category_percentage_label.grid(row=2,column=0)
+
+        self.new_category_percentage = tk.StringVar()
+        self.category_percentage_entry = tk.Entry(self, textvariable=self.new_category_percentage, font=DEFAULT_FONT)
+        self.category_percentage_entry.grid(row=3, column=0)
+
+        self.category_button = tk.Button(self, text= "Add new grade category", font=DEFAULT_FONT, command=(lambda: self._create_new_category(self.new_category.get(), self.new_category_percentage.get())))
+        self.category_button.grid(row=4, column=0, pady=5)
+
+        # Create category removal capabilities
+        self.remove_category_button = tk.Button(self, text="Remove grade category", font=DEFAULT_FONT, command=(lambda: self._remove_category(self.chosen_category.get())))
+        self.remove_category_button.grid(row=5, column=0, pady=5)
+
+        # Create the field that adds new assignments
+        self.assignment_name_label = tk.Label(self, text='Assignment Name', font=HEADER_FONT, bg='light grey')
+        self.assignment_name_label.grid(row=0,column=1)
+
+        self.new_assignment = tk.StringVar()
+        self.assignment_name_entry = tk.Entry(self, textvariable=self.new_assignment, font=DEFAULT_FONT)
+        self.assignment_name_entry.grid(row=1,column=1)
+
+        self.assignment_score_label = tk.Label(self, text='Assignment Score (Score/Possible Score)', font=HEADER_FONT, bg='light grey')
+        self.assignment_score_label.grid(row=2,column=1)
+
+        self.new_assignment_score = tk.StringVar()
+        self.assignment_score_entry = tk.Entry(self, textvariable=self.new_assignment_score, font=DEFAULT_FONT)
+        self.assignment_score_entry.grid(row=3,column=1)
+
+        self.chosen_category = tk.StringVar()
+        self.chosen_category.set('Choose a Category')
+        self.category_chooser = tk.OptionMenu(self, self.chosen_category, 'Choose a Category')
+        self.category_chooser.config(font=DEFAULT_FONT)
+        self.category_chooser.grid(row=4,column=1, pady = 10)
+
+        self.assignment_button = tk.Button(self, text="Add new assignment", font=DEFAULT_FONT, command=(lambda: self._create_new_assignment(self.chosen_category.get(), self.new_assignment.get(), self.new_assignment_score.get())))
+        self.assignment_button.grid(row=5,column=1)
+
+        # Create category renaming capabilities, using the category name entry as the new name
+        self.rename_category_button = tk.Button(self, text="Rename grade category", font=DEFAULT_FONT, command=(lambda: self._rename_category(self.chosen_category.get(), self.new_category.get())))
+        self.rename_category_button.grid(row=6, column=0, pady=5)
+
+        # Create assignment correction capabilities
+        self.assignment_edit_buttons = tk.Frame(self, bg='light grey')
+        self.assignment_edit_buttons.grid(row=6, column=1, pady=5)
+
+        self.update_assignment_button = tk.Button(self.assignment_edit_buttons, text="Update assignment", font=DEFAULT_FONT, command=(lambda: self._update_assignment(self.chosen_category.get(), self.new_assignment.get(), self.new_assignment_score.get())))
+        self.update_assignment_button.grid(row=0, column=0, padx=2)
+
+        self.remove_assignment_button = tk.Button(self.assignment_edit_buttons, text="Remove assignment", font=DEFAULT_FONT, command=(lambda: self._remove_assignment(self.chosen_category.get(), self.new_assignment.get())))
+        self.remove_assignment_button.grid(row=0, column=1, padx=2)
+            
+        # Create the text box that shows all categories and assignments
+        self.class_info = tk.Text(self, height=20)
+        self.class_info.grid(row=7, column=0, columnspan=2, padx=15, pady=15)
+        self.class_info.config(state='disabled', font=DEFAULT_FONT)
+
+        # Category names in the order of their lines in the text field, so a change only redraws its own line
+        self.category_lines = []
+
+        # Create a button that allows the user to go back to the main menu
+        self.back_button = tk.Button(self, text='Back', font=DEFAULT_FONT, command=(lambda: controller.show_frame(MainMenuPage)))
+        self.back_button.grid(row=9,column=0, sticky='w', padx=10)
+
+        # Create a button that allows the user to reset the calculator
+        self.reset_button = tk.Button(self, text='Reset', font=DEFAULT_FONT, command=self._reset_calculator)
+        self.reset_button.grid(row=9, column=1, sticky='e', padx=10)
+
+        # Create a button that calculates the grade and creates a pop up
+        self.calculate_grade_button = tk.Button(self, text='Calculate grade', font=DEFAULT_FONT, command=self._calculate_current_grade)
+        self.calculate_grade_button.grid(row=8, column=1, stick='e', pady=10, padx=10)
+
+        # Create a button that opens a debug panel of the calculator's operation statistics, instrumenting the calculator from then on
+        self.debug_panel = None
+        self.debug_button = tk.Button(self, text='Debug', font=DEFAULT_FONT, command=self._show_debug_panel)
+        self.debug_button.grid(row=8, column=0, sticky='w', pady=10, padx=10)
+
+        # Show the categories and assignments recovered from the journal
+        for category_name in self.calculator.categories:
+            self.can_add_assignments = True
+            self._insert_category_line(category_name)
+            self._add_category_to_chooser(category_name)
+
+    def _create_new_category(self, category_name, category_percentage):
+        '''Adds a new category to the GradeCalculator object'''
+        try:
+            # Set boolean value to True
+            self.can_add_assignments = True
+
+            # Add the category to the GradeCalculator object
+            self.calculator.add_category(category_name, category_percentage)
+
+            # Clear the entries
+            for entry in (self.category_name_entry, self.category_percentage_entry):
+                entry.delete(0, 'end')
+
+            # Add a line for the new category to the text field
+            self._insert_category_line(category_name)
+
+            # Add the new category to the drop down menu used to add assignments
+            self._add_category_to_chooser(category_name)
+
+        # Catch exceptions raised by the GradeCalculator, show the explanation of the error and clear the entries
+        except Exception as e:
+            tkinter.messagebox.showerror(title='Error', message=str(e))
+            for entry in (self.category_percentage_entry, self.category_name_entry):
+                entry.delete(0,'end')
+
+    def _remove_category(self, category_name):
+        '''Removes a category from the GradeCalculator object'''
+        try:
+            # Remove the category from the GradeCalculator object
+            self.calculator.remove_category(category_name)
+
+            # Remove the line of the category from the text field
+            self._delete_category_line(category_name)
+
+            # Remove category from the drop down menu
+            self.category_chooser['menu'].delete(category_name)
+
+            # Default the drop down to be "Choose a Category"
+            self.chosen_category.set('Choose a Category')
+
+        # Catch exceptions raised by the GradeCalculator, show the explanation of the error and clear the entries
+        except Exception as e:
+            tkinter.messagebox.showerror(title='Error', message=str(e))
+
+
+
+    def _create_new_assignment(self, category_name, assignment_name, score):
+        '''Add a new assignment to the chosen category'''
+        # If there are no categories, prevent user from adding assignments
+        if not self.can_add_assignments:
+            tkinter.messagebox.showerror(title='Cannot add assignment', message= 'There are no categories added, so assignments cannot be added yet')
+            for entry in (self.assignment_name_entry, self.assignment_score_entry):
+                entry.delete(0,'end')
+            return
+
+        try:
+            # Add the assignment to the GradeCalculator object
+            self.calculator.add_assignment(category_name, assignment_name, score)
+
+            # Clear the entries
+            for entry in (self.assignment_name_entry, self.assignment_score_entry):
+                entry.delete(0, 'end')
+
+            # Add the assignment to the line of its category in the text field
+            self._append_assignment_to_line(category_name, assignment_name)
+
+        # Catch exceptions raised by the GradeCalculator, show the explanation of the error and clear the entries
+        except Exception as e:
+            tkinter.messagebox.showerror(title='Error', message=str(e))
+            for entry in (self.assignment_name_entry, self.assignment_score_entry):
+                entry.delete(0,'end')
+
+
+    def _update_assignment(self, category_name, assignment_name, score):
+        '''Changes the score of an existing assignment of the chosen category'''
+        try:
+            # Update the assignment in the GradeCalculator object
+            self.calculator.update_assignment(category_name, assignment_name, score)
+
+            # Clear the entries
+            for entry in (self.assignment_name_entry, self.assignment_score_entry):
+                entry.delete(0, 'end')
+
+            # Redraw the line of the category in the text field
+            self._update_category_line(category_name)
+
+        # Catch exceptions raised by the GradeCalculator and show the explanation of the error
+        except Exception as e:
+            tkinter.messagebox.showerror(title='Error', message=str(e))
+
+    def _remove_assignment(self, category_name, assignment_name):
+        '''Removes an assignment from the chosen category'''
+        try:
+            # Remove the assignment from the GradeCalculator object
+            self.calculator.remove_assignment(category_name, assignment_name)
+
+            # Clear the entries
+            for entry in (self.assignment_name_entry, self.assignment_score_entry):
+                entry.delete(0, 'end')
+
+            # Redraw the line of the category in the text field
+            self._update_category_line(category_name)
+
+        # Catch exceptions raised by the GradeCalculator and show the explanation of the error
+        except Exception as e:
+            tkinter.messagebox.showerror(title='Error', message=str(e))
+
+    def _rename_category(self, category_name, new_category_name):
+        '''Renames the chosen category to the name in the category name entry'''
+        try:
+            # Rename the category in the GradeCalculator object
+            self.calculator.rename_category(category_name, new_category_name)
+
+            # Clear the entries
+            self.category_name_entry.delete(0, 'end')
+
+            # Redraw the line of the category in the text field
+            self.category_lines[self.category_lines.index(category_name)] = new_category_name
+            self._update_category_line(new_category_name)
+
+            # Rename the category in the drop down menu
+            menu = self.category_chooser['menu']
+            menu.entryconfigure(menu.index(category_name), label=new_category_name, command=(lambda: self.chosen_category.set(new_category_name)))
+            self.chosen_category.set(new_category_name)
+
+        # Catch exceptions raised by the GradeCalculator and show the explanation of the error
+        except Exception as e:
+            tkinter.messagebox.showerror(title='Error', message=str(e))
+
+    def _reset_calculator(self):
+        '''Reinstantiates the GradeCalculator object, clears all entries, resets the boolean values, text field, and assignment chooser'''
+        # Reinstantiate a GradeCalculator object, and empty the journal
+        instrumented = isinstance(self.calculator, InstrumentedCalculator)
+        self.calculator = GradeCalculator()
+        if self.journal is not None:
+            self.journal.reset(self.calculator)
+        if instrumented:
+            instrument(self.calculator)
+
+        # Clear the entries
+        for entry in (self.assignment_name_entry, self.assignment_score_entry, self.category_name_entry, self.category_percentage_entry):
+            entry.delete(0, 'end')
+
+        # Reset the boolean variables
+        self.can_add_assignments = False
+        self.can_calculate_grade = False
+
+        # Clear the text field
+        self.category_lines = []
+        self.class_info.config(state='normal')
+        self.class_info.delete(1.0,tk.END)
+        self.class_info.config(state='disabled')
+
+        # Reset the assignment chooser
+        self.category_chooser.destroy()
+        self.chosen_category = tk.StringVar()
+        self.chosen_category.set('Choose a Category')
+        self.category_chooser = tk.OptionMenu(self, self.chosen_category, 'Choose a Category')
+        self.category_chooser.config(font=DEFAULT_FONT)
+        self.category_chooser.grid(row=4,column=1, pady = 10)
+
+    def _add_category_to_chooser(self, category_name):
+        '''Adds a category to the drop down menu used to add assignments'''
+        self.category_chooser['menu'].add_command(label=category_name, command=(lambda: self.chosen_category.set(category_name)))
+
+    def _insert_category_line(self, category_name):
+        '''Appends the line of a new category to the text field'''
+        self.category_lines.append(category_name)
+        self.class_info.config(state='normal')
+        self.class_info.insert('end-1c', self.calculator.category_str(category_name))
+        self.class_info.config(state='disabled')
+
+    def _update_category_line(self, category_name):
+        '''Redraws the line of a single category in the text field'''
+        line = self.category_lines.index(category_name) + 1
+        self.class_info.config(state='normal')
+        self.class_info.delete(f'{line}.0', f'{line}.end')
+        self.class_info.insert(f'{line}.0', self.calculator.category_str(category_name)[:-1])
+        self.class_info.config(state='disabled')
+
+    def _append_assignment_to_line(self, category_name, assignment_name):
+        '''Adds a new assignment to the end of the line of its category in the text field'''
+        line = self.category_lines.index(category_name) + 1
+
+        # A category without assignments ends with its percentage, otherwise assignments are separated by commas
+        separator = ' ' if self.class_info.get(f'{line}.end-3c', f'{line}.end') == '%):' else ', '
+
+        self.class_info.config(state='normal')
+        self.class_info.insert(f'{line}.end', separator + self.calculator.assignment_str(category_name, assignment_name))
+        self.class_info.config(state='disabled')
+
+    def _delete_category_line(self, category_name):
+        '''Removes the line of a category from the text field'''
+        line = self.category_lines.index(category_name) + 1
+        del self.category_lines[line - 1]
+        self.class_info.config(state='normal')
+        self.class_info.delete(f'{line}.0', f'{line + 1}.0')
+        self.class_info.config(state='disabled')
+
+    def _calculate_current_grade(self):
+        '''Calculates the current grade if possible, else raises an error window to the user'''
+        # Determine if a grade can be calculated
+        if len(self.calculator.categories) > 0:
+            self.can_calculate_grade = all([len(v[GradeCalculator.ASSIGNMENTS]) > 0 for v in self.calculator.categories.values()])
+
+        if not self.can_calculate_grade:
+            tkinter.messagebox.showerror(title='Cannot calculate grade yet', message='A category must exist before a grade can be calculated. All categories must have at least one assignment before a grade can be calculated.')
+            return
+
+        tkinter.messagebox.showinfo(title='Grade Calculator - Calculated Grade', message=f'Calculated grade for class: {self.calculator.calculate_total_grade() * 100}%')
+
+    def _show_debug_panel(self):
+        '''Opens the debug panel, or raises it if it is already open, and instruments the calculator if it is not yet'''
+        instrument(self.calculator)
+        if self.debug_panel is not None and self.debug_panel.winfo_exists():
+            self.debug_panel.lift()
+            return
+
+        self.debug_panel = tk.Toplevel(self)
+        self.debug_panel.title('Grade Calculator - Debug')
+
+        self.debug_info = tk.Text(self.debug_panel, height=8, width=100)
+        self.debug_info.pack(padx=10, pady=10)
+        self.debug_info.config(state='disabled', font=('Courier', 10))
+
+        self.reset_stats_button = tk.Button(self.debug_panel, text='Reset statistics', font=DEFAULT_FONT, command=(lambda: self.calculator.instrumentation.reset()))
+        self.reset_stats_button.pack(pady=5)
+
+        self._refresh_debug_panel()
+
+    def _refresh_debug_panel(self):
+        '''Shows the latest operation statistics in the debug panel, every half second while it is open'''
+        if self.debug_panel is None or not self.debug_panel.winfo_exists():
+            return
+        self.debug_info.config(state='normal')
+        self.debug_info.delete(1.0, tk.END)
+        self.debug_info.insert(tk.END, self.calculator.instrumentation.report())
+        self.debug_info.config(state='disabled')
+        self.after(500, self._refresh_debug_panel)